@@ -0,0 +1,11 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""benchmarks for configmanners.  These are not part of the installed
+package.  Run them from the root of the source tree:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --output new.json --baseline results.json
+
+see 'python -m benchmarks.run --help' for the available scales."""
@@ -0,0 +1,48 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""compare direct reads with acquired reads in a DotDictWithAcquisition
+nested 10 levels deep.  A 'cold' acquired read has its acquisition cache
+cleared first, the cost of resolving through every parent.
+
+    python -m benchmarks.bench_acquisition
+"""
+
+import timeit
+
+from configmanners.dotdict import DotDictWithAcquisition
+
+
+# ------------------------------------------------------------------------------
+def build(depth):
+    root = DotDictWithAcquisition()
+    root.shared = "acquired"
+    current = root
+    for i in range(depth):
+        current["n%d" % i] = DotDictWithAcquisition()
+        current = current["n%d" % i]
+    current.own = "direct"
+    return root, current
+
+
+# ------------------------------------------------------------------------------
+def main(depth=10, number=200000):
+    root, leaf = build(depth)
+
+    def cold():
+        root._clear_acquisition_cache()
+        return leaf.shared
+
+    print("depth %d, ns per read" % depth)
+    for label, fn in (
+        ("direct", lambda: leaf.own),
+        ("acquired", lambda: leaf.shared),
+        ("acquired, cold", cold),
+    ):
+        seconds = timeit.timeit(fn, number=number)
+        print("%-20s %10.1f" % (label, seconds * 1e9 / number))
+
+
+if __name__ == "__main__":
+    main()
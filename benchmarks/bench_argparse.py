@@ -0,0 +1,78 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""time parsing a command line with the configmanners ArgumentParser when it
+has thousands of options and subcommands, and a class option that brings in
+more options during the overlay passes.  The argparse value source keeps its
+parser from one pass to the next.  That is compared with building a new
+parser for every pass, as it used to.  The ArgumentParser is also timed
+after 'compile', which keeps its ConfigurationManager from one parse to the
+next.  Each parse then overlays the values for its command line without
+setting up or expanding the definitions again.
+
+    python -m benchmarks.bench_argparse
+"""
+
+import contextlib
+import timeit
+
+from configmanners.converters import class_converter
+from configmanners.def_sources.for_argparse import ArgumentParser
+from configmanners.value_sources import for_argparse
+from benchmarks import synthetic
+
+
+# ------------------------------------------------------------------------------
+def build_parser(number_of_options, fan_out=3, levels=3):
+    """an ArgumentParser with 'number_of_options' options, two subcommands
+    and a class option that expands to a tree of classes"""
+    parser = ArgumentParser(prog="bench")
+    for i in range(number_of_options):
+        parser.add_argument("--option%d" % i, default=str(i), help="option %d" % i)
+    subparsers = parser.add_subparsers(dest="command")
+    for a_command in ("run", "check"):
+        a_subparser = subparsers.add_parser(a_command, help="%s it" % a_command)
+        a_subparser.add_argument("--%s-level" % a_command, type=int, default=0)
+        a_subparser.add_argument("target")
+    root = synthetic.class_expansion(fan_out, levels)
+    parser.add_argument(
+        "--root",
+        default=root.cls.default,
+        type=class_converter,
+        help="the root of a tree of classes",
+    )
+    return parser
+
+
+# ------------------------------------------------------------------------------
+@contextlib.contextmanager
+def rebuilding_every_pass():
+    """make the argparse value source build a new parser for every pass"""
+    value_source = for_argparse.ValueSource
+    original = value_source._get_intermediate_parser
+    value_source._get_intermediate_parser = value_source._build_intermediate_parser
+    try:
+        yield
+    finally:
+        value_source._get_intermediate_parser = original
+
+
+# ------------------------------------------------------------------------------
+def main(number_of_options=2000, number=5):
+    parser = build_parser(number_of_options)
+    compiled_parser = build_parser(number_of_options).compile()
+    argv = ["--option7=seven", "--option1999=last", "run", "--run-level=2", "x"]
+    print("%d options and 2 subcommands, ms per parse" % number_of_options)
+    for label, context, a_parser in (
+        ("compiled parser", contextlib.nullcontext, compiled_parser),
+        ("reused parser", contextlib.nullcontext, parser),
+        ("parser every pass", rebuilding_every_pass, parser),
+    ):
+        with context():
+            seconds = timeit.timeit(lambda: a_parser.parse_args(argv), number=number)
+        print("%-20s %10.2f" % (label, seconds * 1e3 / number))
+
+
+if __name__ == "__main__":
+    main()
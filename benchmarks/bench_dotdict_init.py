@@ -0,0 +1,55 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""compare eager and lazy construction of a DotDictWithAcquisition from a
+large nested dict, like those read from JSON or YAML files.  Each is timed
+both with one value looked up and with all of its keys listed.
+
+    python -m benchmarks.bench_dotdict_init
+"""
+
+import timeit
+
+from configmanners.dotdict import DotDictWithAcquisition
+
+
+# ------------------------------------------------------------------------------
+def build(number_of_values, depth, values_per_mapping=10):
+    """a nested dict in the shape of benchmarks.synthetic.nested_options,
+    returns the dict and the dotted key of one of its values"""
+    a_dict = {}
+    for i in range(number_of_values):
+        path = ["g%d" % (i // values_per_mapping)]
+        path.extend("d%d" % level for level in range(1, depth))
+        current = a_dict
+        for a_name in path:
+            current = current.setdefault(a_name, {})
+        current["o%d" % i] = i
+    return a_dict, ".".join(path + ["o%d" % i])
+
+
+# ------------------------------------------------------------------------------
+def main(number_of_values=10000, depth=10, number=5):
+    a_dict, a_key = build(number_of_values, depth)
+    print("%d values %d deep, ms per construction" % (number_of_values, depth))
+    for label, fn in (
+        ("eager", lambda: DotDictWithAcquisition(a_dict)),
+        (
+            "eager, all keys",
+            lambda: list(DotDictWithAcquisition(a_dict).keys_breadth_first()),
+        ),
+        ("lazy, one key", lambda: DotDictWithAcquisition(a_dict, lazy=True)[a_key]),
+        (
+            "lazy, all keys",
+            lambda: list(
+                DotDictWithAcquisition(a_dict, lazy=True).keys_breadth_first()
+            ),
+        ),
+    ):
+        seconds = timeit.timeit(fn, number=number)
+        print("%-20s %10.2f" % (label, seconds * 1e3 / number))
+
+
+if __name__ == "__main__":
+    main()
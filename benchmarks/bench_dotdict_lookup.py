@@ -0,0 +1,53 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""measure the cost of a dotted key lookup in a DotDict as the nesting depth
+grows.  The 'walk' column is the attribute by attribute walk that every
+lookup used to make, the 'indexed' column is a repeated lookup through the
+flat dotted key index.
+
+    python benchmarks/bench_dotdict_lookup.py
+"""
+
+import timeit
+
+from configmanners.dotdict import DotDict
+
+
+# ------------------------------------------------------------------------------
+def build(depth):
+    root = DotDict()
+    current = root
+    for i in range(depth - 1):
+        current["n%d" % i] = DotDict()
+        current = current["n%d" % i]
+    current.leaf = depth
+    key = ".".join(["n%d" % i for i in range(depth - 1)] + ["leaf"])
+    return root, key
+
+
+# ------------------------------------------------------------------------------
+def walk(a_dot_dict, key):
+    current = a_dot_dict
+    for k in key.split("."):
+        current = getattr(current, k)
+    return current
+
+
+# ------------------------------------------------------------------------------
+def main(depths=(1, 2, 4, 8, 16, 32), number=100000):
+    print("%6s %14s %14s" % ("depth", "walk (us)", "indexed (us)"))
+    for depth in depths:
+        root, key = build(depth)
+        assert root[key] == walk(root, key) == depth
+        walk_time = timeit.timeit(lambda: walk(root, key), number=number)
+        indexed_time = timeit.timeit(lambda: root[key], number=number)
+        print(
+            "%6d %14.3f %14.3f"
+            % (depth, walk_time * 1e6 / number, indexed_time * 1e6 / number)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""time a cold 'import configmanners' in fresh interpreters using python's
+'-X importtime' report.  The exit code is 1 if the best of the runs takes
+longer than the budget.
+
+    python -m benchmarks.bench_import --budget 40
+"""
+
+import argparse
+import subprocess
+import sys
+
+
+# ------------------------------------------------------------------------------
+def import_times(module_name):
+    """import the module in a fresh interpreter, return a dict of the
+    cumulative import time in microseconds of each module imported"""
+    report = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % module_name],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+    times = {}
+    for a_line in report.splitlines():
+        if not a_line.startswith("import time:"):
+            continue
+        # import time: self [us] | cumulative | imported package
+        self_time, cumulative, name = a_line.split(":", 1)[1].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=40.0,
+        help="the most milliseconds the import may take",
+    )
+    parser.add_argument("--module", default="configmanners")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="the number of the slowest imports to list",
+    )
+    args = parser.parse_args(argv)
+
+    best = None
+    for i in range(args.repeat):
+        times = import_times(args.module)
+        if best is None or times[args.module] < best[args.module]:
+            best = times
+
+    slowest = sorted(best.items(), key=lambda x: -x[1])[: args.top]
+    for name, microseconds in slowest:
+        print("%-50s %8.2f ms" % (name, microseconds / 1000.0))
+    milliseconds = best[args.module] / 1000.0
+    print(
+        "import %s: %.2f ms, budget %.2f ms" % (args.module, milliseconds, args.budget)
+    )
+    if milliseconds > args.budget:
+        print("OVER BUDGET")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
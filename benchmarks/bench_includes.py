@@ -0,0 +1,97 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""time the expansion of '+include' lines in ini files with a fan-in of 200
+includes of the same file, both from 200 sections of one file and from 200
+files matched by a glob include.  The include graph, which reads each file
+once, is compared with reading every include again where it appears, as
+ConfigObjWithIncludes used to.
+
+    python -m benchmarks.bench_includes
+"""
+
+import os
+import shutil
+import tempfile
+import timeit
+
+from configmanners.value_sources.for_configobj import (
+    ConfigObjWithIncludes,
+    IncludeGraph,
+)
+
+
+# ------------------------------------------------------------------------------
+def expand_every_time(file_name, indent=""):
+    """expand the includes, reading each include wherever it appears"""
+    lines = []
+    with open(file_name) as f:
+        for a_line in f:
+            match = IncludeGraph._include_re.match(a_line)
+            if match:
+                include_file = os.path.join(
+                    os.path.dirname(file_name), match.group(2)
+                )
+                lines.extend(expand_every_time(include_file, indent + match.group(1)))
+            else:
+                lines.append(indent + a_line.rstrip())
+    return lines
+
+
+# ------------------------------------------------------------------------------
+def write_files(directory, fan_in, shared_depth=4, values_per_file=20):
+    """write 'sections.ini', 'globbed.ini' and the files they include.  Each
+    includes 'shared0.ini' fan_in times, which includes a chain of
+    shared_depth files.  Returns the names of the two ini files."""
+
+    def write(a_name, lines):
+        with open(os.path.join(directory, a_name), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    for level in range(shared_depth):
+        lines = ["value%d_%d = %d" % (level, i, i) for i in range(values_per_file)]
+        if level + 1 < shared_depth:
+            lines.append("+include shared%d.ini" % (level + 1))
+        write("shared%d.ini" % level, lines)
+
+    sections = []
+    os.mkdir(os.path.join(directory, "conf.d"))
+    for i in range(fan_in):
+        sections.extend(["[section%d]" % i, "  +include shared0.ini"])
+        with open(os.path.join(directory, "conf.d", "%04d.ini" % i), "w") as f:
+            f.write("[section%d]\n  +include ../shared0.ini\n" % i)
+    write("sections.ini", sections)
+    write("globbed.ini", ["+include conf.d/*.ini"])
+    return (
+        os.path.join(directory, "sections.ini"),
+        os.path.join(directory, "globbed.ini"),
+    )
+
+
+# ------------------------------------------------------------------------------
+def main(fan_in=200, number=20):
+    directory = tempfile.mkdtemp()
+    try:
+        sections_ini, globbed_ini = write_files(directory, fan_in)
+        graph = IncludeGraph()
+        graph.expand(globbed_ini)
+        print(
+            "fan-in of %d includes, %d files, ms per load"
+            % (fan_in, len(graph.expanded))
+        )
+        for label, fn in (
+            ("sections, every time", lambda: expand_every_time(sections_ini)),
+            ("sections, graph", lambda: IncludeGraph().expand(sections_ini)),
+            ("glob, graph", lambda: IncludeGraph().expand(globbed_ini)),
+            ("sections, configobj", lambda: ConfigObjWithIncludes(sections_ini)),
+            ("glob, configobj", lambda: ConfigObjWithIncludes(globbed_ini)),
+        ):
+            seconds = timeit.timeit(fn, number=number)
+            print("%-25s %10.2f" % (label, seconds * 1e3 / number))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
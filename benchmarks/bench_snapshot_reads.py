@@ -0,0 +1,41 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""compare reading values from the DotDictWithAcquisition returned by
+get_config with reading them from a frozen snapshot, for both values that
+belong to a namespace and values acquired from an enclosing namespace.
+
+    python -m benchmarks.bench_snapshot_reads
+"""
+
+import timeit
+
+from configmanners import Namespace
+from configmanners.config_manager import ConfigurationManager
+
+
+# ------------------------------------------------------------------------------
+def main(number=1000000):
+    n = Namespace()
+    n.add_option("timeout", default=30)
+    n.namespace("database")
+    n.database.namespace("pool")
+    n.database.pool.add_option("size", default=10)
+    cm = ConfigurationManager((n,), [], use_admin_controls=False, argv_source=[])
+    config = cm.get_config()
+    snapshot = cm.get_snapshot()
+
+    print("%-50s %14s" % ("read", "ns per read"))
+    for label, statement in (
+        ("config.database.pool.size", "c.database.pool.size"),
+        ("config.database.pool.timeout (acquired)", "c.database.pool.timeout"),
+        ("config['database.pool.size']", "c['database.pool.size']"),
+    ):
+        for kind, mapping in (("dotdict", config), ("snapshot", snapshot)):
+            seconds = timeit.timeit(statement, globals={"c": mapping}, number=number)
+            print("%-50s %14.1f" % ("%s %s" % (kind, label), seconds * 1e9 / number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""time ConfigurationManager construction, get_config, write_conf for each
+registered file type and the loading of each of those files as a value source,
+parsed and from the cache of parsed files, over synthetic definitions of
+various sizes and shapes.  The results are
+written as JSON and may be compared against a saved baseline:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --output new.json --baseline results.json
+
+The exit code is 1 if anything is slower than the baseline by more than the
+tolerance."""
+
+import argparse
+import functools
+import importlib.util
+import json
+import os.path
+import platform
+import sys
+import tempfile
+import time
+
+import configmanners
+from configmanners.config_manager import ConfigurationManager
+from configmanners.value_sources import file_extension_dispatch
+from configmanners.value_sources.file_cache import parsed_file_cache
+
+from benchmarks import synthetic
+
+
+# ------------------------------------------------------------------------------
+def best_of(repeat, fn, setup=None):
+    """run 'fn' 'repeat' times, return the shortest elapsed time and the
+    result of the last run.  If given, 'setup' is called before each run,
+    outside of the time taken."""
+    best = None
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+# ------------------------------------------------------------------------------
+def manager(definitions, values_source_list, timings=None):
+    return ConfigurationManager(
+        (definitions,),
+        values_source_list,
+        argv_source=[],
+        use_auto_help=False,
+        timings=timings,
+    )
+
+
+# the 'env' writer produces a file for the shell, there is no value source
+# that reads it back
+_not_loadable = ("env",)
+
+
+# ------------------------------------------------------------------------------
+def _as_value_source(pathname, extension):
+    """the python module value source takes a module rather than a pathname,
+    so a fresh module is executed from the file each time"""
+    if extension != "py":
+        return pathname
+    spec = importlib.util.spec_from_file_location("synthetic_config", pathname)
+    a_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(a_module)
+    return a_module
+
+
+# ------------------------------------------------------------------------------
+def bench_definitions(name, definitions, overrides, repeat, results, with_files):
+    """run the suite of timings for one set of definitions
+
+    parameters:
+        name - the prefix of the names of the results
+        definitions - a Namespace of option definitions
+        overrides - a mapping used as a value source
+        repeat - the number of times to run each timing
+        results - the dict that collects the results
+        with_files - True if each registered file type is to be written and
+                     read back
+    """
+    seconds, cm = best_of(repeat, lambda: manager(definitions, [overrides]))
+    # a separate instrumented run supplies the breakdown by phase
+    phases = manager(definitions, [overrides], timings=True).get_timings()["totals"]
+    results["%s.construct" % name] = {"seconds": seconds, "phases": phases}
+
+    seconds, config = best_of(repeat, cm.get_config)
+    results["%s.get_config" % name] = {"seconds": seconds}
+
+    if not with_files:
+        return
+    with tempfile.TemporaryDirectory() as a_directory:
+        for an_extension in sorted(file_extension_dispatch):
+            pathname = os.path.join(a_directory, "synthetic.%s" % an_extension)
+            opener = functools.partial(open, pathname, "w")
+            try:
+                seconds, _ = best_of(
+                    repeat, lambda: cm.write_conf(an_extension, opener)
+                )
+                results["%s.write_conf.%s" % (name, an_extension)] = {
+                    "seconds": seconds
+                }
+            except Exception as x:
+                results["%s.write_conf.%s" % (name, an_extension)] = {
+                    "error": repr(x)
+                }
+                continue
+            if an_extension in _not_loadable:
+                continue
+            # the parsed files are cached from one ConfigurationManager to the
+            # next.  'load' parses the file every time, 'load_cached' finds it
+            # in the cache.  A file changed in the last few seconds is never
+            # cached, so the file is made to look older than that
+            an_hour_ago = time.time_ns() - 3600 * 10**9
+            os.utime(pathname, ns=(an_hour_ago, an_hour_ago))
+            def load():
+                return manager(definitions, [_as_value_source(pathname, an_extension)])
+
+            for a_metric, setup in (
+                ("load", parsed_file_cache.invalidate),
+                ("load_cached", None),
+            ):
+                a_result = "%s.%s.%s" % (name, a_metric, an_extension)
+                try:
+                    seconds, _ = best_of(repeat, load, setup)
+                    results[a_result] = {"seconds": seconds}
+                except Exception as x:
+                    results[a_result] = {"error": repr(x)}
+
+
+# ------------------------------------------------------------------------------
+def run(sizes, depths, fan_out, levels, chain_length, repeat, with_files):
+    results = {}
+    for a_size in sizes:
+        for a_depth in depths:
+            definitions = synthetic.nested_options(a_size, depth=a_depth)
+            # replace the value of every tenth option
+            overrides = {
+                key: "17"
+                for i, key in enumerate(synthetic.option_keys(definitions))
+                if not i % 10
+            }
+            print("options=%d depth=%d" % (a_size, a_depth), file=sys.stderr)
+            bench_definitions(
+                "options=%d.depth=%d" % (a_size, a_depth),
+                definitions,
+                overrides,
+                repeat,
+                results,
+                with_files,
+            )
+
+    print("fan_out=%d levels=%d" % (fan_out, levels), file=sys.stderr)
+    bench_definitions(
+        "classes.fan_out=%d.levels=%d" % (fan_out, levels),
+        synthetic.class_expansion(fan_out, levels),
+        {"o0": "42", "c0": {"o1": "a new string"}},
+        repeat,
+        results,
+        with_files,
+    )
+
+    print("reference chain=%d" % chain_length, file=sys.stderr)
+    bench_definitions(
+        "references.length=%d" % chain_length,
+        synthetic.reference_chain(chain_length),
+        {"r0": {"o0": "42"}},
+        repeat,
+        results,
+        with_files,
+    )
+    return {
+        "meta": {
+            "configmanners": configmanners.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+# ------------------------------------------------------------------------------
+def compare(current, baseline, tolerance, noise_floor=0.001):
+    """return a list of (name, baseline seconds, current seconds) for each
+    result that has become slower by more than the fractional 'tolerance'.
+    Differences smaller than 'noise_floor' seconds are ignored."""
+    regressions = []
+    for name, a_result in sorted(current["results"].items()):
+        try:
+            before = baseline["results"][name]["seconds"]
+            after = a_result["seconds"]
+        except KeyError:
+            # new, failed or removed benchmark, nothing to compare with
+            continue
+        if after > before * (1.0 + tolerance) and after - before > noise_floor:
+            regressions.append((name, before, after))
+    return regressions
+
+
+# ------------------------------------------------------------------------------
+def _int_list(a_string):
+    return [int(x) for x in a_string.split(",") if x.strip()]
+
+
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        type=_int_list,
+        default=[100, 10000],
+        help="comma separated numbers of options, 100000 is a long run",
+    )
+    parser.add_argument(
+        "--depths",
+        type=_int_list,
+        default=[1, 10],
+        help="comma separated nesting depths",
+    )
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--levels", type=int, default=4)
+    parser.add_argument("--chain-length", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-files",
+        action="store_true",
+        help="skip writing and reading the configuration file types",
+    )
+    parser.add_argument("--output", help="the JSON file for the results")
+    parser.add_argument("--baseline", help="a JSON file of earlier results")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="the fraction of slowdown allowed against the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    current = run(
+        args.sizes,
+        args.depths,
+        args.fan_out,
+        args.levels,
+        args.chain_length,
+        args.repeat,
+        not args.no_files,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    for name, a_result in sorted(current["results"].items()):
+        if "seconds" in a_result:
+            print("%-60s %10.4f" % (name, a_result["seconds"]))
+        else:
+            print("%-60s %s" % (name, a_result["error"]))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print(
+                "REGRESSION %s: %.4f -> %.4f (%+.0f%%)"
+                % (name, before, after, (after / before - 1.0) * 100)
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
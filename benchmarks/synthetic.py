@@ -0,0 +1,115 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""generators of synthetic option definitions for benchmarking.  Each
+generator returns a Namespace that can be handed to a ConfigurationManager as
+a definition source."""
+
+import sys
+
+from configmanners import Namespace, RequiredConfig
+from configmanners.converters import class_converter
+
+# the generated defaults cycle through these so that each of the common
+# from string converters gets some exercise
+_defaults = (17, "a string", True, 3.5)
+
+
+# ------------------------------------------------------------------------------
+def nested_options(number_of_options, depth=1, options_per_namespace=10):
+    """create a Namespace holding 'number_of_options' Options.  The Options
+    are spread out in groups of 'options_per_namespace'.  Each group lives at
+    the bottom of its own chain of nested Namespaces 'depth' levels deep:
+
+        g0.d1.d2.o0, g0.d1.d2.o1, ... g1.d1.d2.o10, ...
+
+    With a depth of 1, the groups are in top level Namespaces."""
+    n = Namespace()
+    for i in range(number_of_options):
+        group_path = ["g%d" % (i // options_per_namespace)]
+        group_path.extend("d%d" % level for level in range(1, depth))
+        current = n
+        for a_name in group_path:
+            if a_name not in current:
+                current.namespace(a_name)
+            current = current[a_name]
+        current.add_option(
+            "o%d" % i,
+            default=_defaults[i % len(_defaults)],
+            doc="synthetic option %d" % i,
+        )
+    return n
+
+
+# ------------------------------------------------------------------------------
+def option_keys(a_namespace):
+    """the full dotted names of the Options in a Namespace"""
+    return [
+        key
+        for key in a_namespace.keys_breadth_first()
+        if not isinstance(a_namespace[key], Namespace)
+    ]
+
+
+# ------------------------------------------------------------------------------
+def _make_class(name, required_config):
+    """create a RequiredConfig class that can be found again by name through
+    this module, so that it survives being written to and read from
+    configuration files"""
+    a_class = type(name, (RequiredConfig,), {"required_config": required_config})
+    a_class.__module__ = __name__
+    a_class.__qualname__ = name
+    setattr(sys.modules[__name__], name, a_class)
+    return a_class
+
+
+# ------------------------------------------------------------------------------
+def class_expansion(fan_out, levels, options_per_class=5):
+    """create a Namespace with a single class Option at the root of a tree of
+    RequiredConfig classes.  Each class has 'options_per_class' Options of
+    its own and 'fan_out' Namespaces each holding a class Option that refers
+    to a class one level down.  The tree is 'levels' deep, so the overlay
+    expansion brings in 'fan_out' ** 'levels' classes in total."""
+
+    def make(path, level):
+        rc = Namespace()
+        for i in range(options_per_class):
+            rc.add_option(
+                "o%d" % i,
+                default=_defaults[i % len(_defaults)],
+                doc="synthetic class option %d" % i,
+            )
+        if level < levels:
+            for i in range(fan_out):
+                rc.namespace("c%d" % i)
+                rc["c%d" % i].add_option(
+                    "cls",
+                    default=make("%s_%d" % (path, i), level + 1),
+                    from_string_converter=class_converter,
+                )
+        return _make_class("SyntheticClass%s" % path, rc)
+
+    n = Namespace()
+    n.add_option("cls", default=make("", 1), from_string_converter=class_converter)
+    return n
+
+
+# ------------------------------------------------------------------------------
+def reference_chain(length, options_per_link=3):
+    """create a Namespace with 'length' Namespaces r0, r1, ... where the
+    Options in each of r1 onward take their values by reference from the
+    Namespace before it.  A value given to r0 flows down the whole chain."""
+    n = Namespace()
+    for link in range(length):
+        n.namespace("r%d" % link)
+        for i in range(options_per_link):
+            if link:
+                n["r%d" % link].add_option(
+                    "o%d" % i,
+                    default=i,
+                    reference_value_from="r%d" % (link - 1),
+                )
+            else:
+                n["r%d" % link].add_option("o%d" % i, default=i)
+    return n
@@ -2,6 +2,8 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import importlib
+
 __version__ = "3.0"
 
 # Having these here makes it possible to easily import once configmanners is
@@ -10,26 +12,56 @@ __version__ = "3.0"
 #
 #    from configmanners import Namespace, ConfigurationManager
 #
+# The modules that define them are not imported until one of these names is
+# first used, so that 'import configmanners' costs as little as possible.
+# Each name maps to the module that defines it.
+_lazy_names = {
+    "ConfigurationManager": "configmanners.config_manager",
+    "RequiredConfig": "configmanners.required_config",
+    "Namespace": "configmanners.namespace",
+    "ConfigFileFutureProxy": "configmanners.config_file_future_proxy",
+    "PrefixedEnvironment": "configmanners.environment",
+    "class_converter": "configmanners.converters",
+    "regex_converter": "configmanners.converters",
+    "timedelta_converter": "configmanners.converters",
+    # the commandline module brings in command_line and, if argparse is
+    # available, a definition of the configmanners version of ArgumentParser
+    "command_line": "configmanners.commandline",
+    "ArgumentParser": "configmanners.commandline",
+}
 
-from configmanners.config_manager import ConfigurationManager
-from configmanners.required_config import RequiredConfig
-from configmanners.namespace import Namespace
-from configmanners.config_file_future_proxy import ConfigFileFutureProxy
-from configmanners.converters import (
-    class_converter,
-    regex_converter,
-    timedelta_converter,
-)
-
+# 'environment' is also the name of the module that defines it.  Importing
+# that module from anywhere would replace a lazily found 'environment' here
+# with the module itself, so it is imported now.
 from configmanners.environment import environment
 
-# this next line brings in command_line and, if argparse is available,
-# a definition of the configmanners version of ArgumentParser.  Why is it done
-# with "import *" ? Because we don't know what symbols to import, the decision
-# about what is symbols exist within the module.  To make the import specific
-# here, it would be necessary to reproduce the same logic that is already
-# in the commandline module.
-from configmanners.commandline import *
+__all__ = sorted(list(_lazy_names) + ["configuration", "environment"])
+
+
+# ------------------------------------------------------------------------------
+def __getattr__(name):
+    """import the module for one of the names in '_lazy_names' on first use.
+    The value is saved, so this is not called again for the same name."""
+    try:
+        module_name = _lazy_names[name]
+    except KeyError:
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, name)
+        ) from None
+    try:
+        value = getattr(importlib.import_module(module_name), name)
+    except AttributeError:
+        # like ArgumentParser when argparse is not available
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, name)
+        ) from None
+    globals()[name] = value
+    return value
+
+
+# ------------------------------------------------------------------------------
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
 
 
 # ------------------------------------------------------------------------------
@@ -37,6 +69,8 @@ def configuration(*args, **kwargs):
     """this function just instantiates a ConfigurationManager and returns
     the configuration dictionary.  It accepts all the same parameters as the
     constructor for the ConfigurationManager class."""
+    from configmanners.config_manager import ConfigurationManager
+
     try:
         config_kwargs = {"mapping_class": kwargs.pop("mapping_class")}
     except KeyError:
@@ -5,13 +5,12 @@
 
 import sys
 import os
-import collections
+import collections.abc
 import inspect
 import os.path
 import contextlib
 import functools
 import warnings
-from functools import reduce
 
 # ==============================================================================
 # for convenience define some external symbols here - some client modules may
@@ -29,10 +28,14 @@ from configmanners.def_sources import (
 from configmanners.dotdict import (
     DotDict,
     DotDictWithAcquisition,
+    DottedKeySuffixIndex,
 )
 from configmanners.environment import environment
 from configmanners.namespace import Namespace
 from configmanners.option import Option, Aggregation
+from configmanners.orderedset import OrderedSet
+from configmanners.snapshot import freeze
+from configmanners.timings import Timings, NoTimings
 
 # RequiredConfig is not used directly in this file, but made available as
 # a type to be imported from this module
@@ -49,6 +52,17 @@ from configmanners.value_sources import (
 # ==============================================================================
 class ConfigurationManager(object):
 
+    # whether the state of each Option before the overlay is kept so that
+    # the values may be overlaid again.  See '_overlay_again'
+    _keeps_option_states = False
+
+    # while the overlay is at work, the names of the Options that it has
+    # brought in or whose defaults it may have changed, in the order that it
+    # did so, and None at any other time.  The command line value sources
+    # keep what they make from the option definitions from one pass to the
+    # next, and look only at the Options named here since they last did.
+    _changed_keys = None
+
     # --------------------------------------------------------------------------
     def __init__(
         self,
@@ -66,6 +80,7 @@ class ConfigurationManager(object):
         config_pathname=".",
         config_optional=True,
         value_source_object_hook=DotDict,
+        timings=None,
     ):
         """create and initialize a configmanners object.
 
@@ -113,6 +128,15 @@ class ConfigurationManager(object):
                                      representation of a value source.
                                      This is used to enable any special
                                      processing, like key translations.
+                                     It is given the keyword argument
+                                     'initializer', and also 'lazy' if
+                                     it takes that parameter of DotDict.
+          timings - (optional) True to record the wall clock time, cpu time
+                    and item counts of each phase of startup and of each
+                    call to a value source.  An instance of
+                    configmanners.timings.Timings may be passed in instead
+                    to supply the recorder.  The results are available from
+                    the 'get_timings' method.
         """
 
         # instead of allowing mutables as default keyword argument values...
@@ -141,6 +165,12 @@ class ConfigurationManager(object):
 
         self.value_source_object_hook = value_source_object_hook
 
+        if timings is True:
+            timings = Timings()
+        elif not timings:
+            timings = NoTimings()
+        self._timings = timings
+
         self.app_name = app_name
         self.app_version = app_version
         self.app_description = app_description
@@ -170,7 +200,12 @@ class ConfigurationManager(object):
             # one that can interact with the user on the commandline.
             for a_value_source in values_source_list:
                 if inspect.ismodule(a_value_source):
-                    handler = type_handler_dispatch[a_value_source][0].ValueSource
+                    # the handlers registered for the module itself come
+                    # first.  Looking it up as a key would add an empty entry
+                    # for modules that are not keys
+                    handler = next(
+                        iter(type_handler_dispatch.get_handlers(a_value_source))
+                    ).ValueSource
                     try:
                         # if a value source is able to handle the command line
                         # it will have defined 'command_line_value_source' as
@@ -192,7 +227,6 @@ class ConfigurationManager(object):
                     # try to use it as a commandline value source.
                     pass
 
-        admin_tasks_done = False
         self.keys_blocked_from_output = [
             "help",
             "admin.conf",
@@ -212,7 +246,8 @@ class ConfigurationManager(object):
         # hierarchy of all the options called 'option_definitions'
         for a_definition_source in self.definition_source_list:
             try:
-                safe_copy_of_def_source = a_definition_source.safe_copy()
+                with self._timings.phase("safe_copy"):
+                    safe_copy_of_def_source = a_definition_source.safe_copy()
             except AttributeError:
                 # apparently, the definition source was not in the form of a
                 # Namespace object.  This isn't a show stopper, but we don't
@@ -223,19 +258,64 @@ class ConfigurationManager(object):
                 # The only action we can take is to trust and continue with the
                 # original copy of the definition source.
                 safe_copy_of_def_source = a_definition_source
-            setup_definitions(safe_copy_of_def_source, self.option_definitions)
+            with self._timings.phase("setup_definitions"):
+                setup_definitions(safe_copy_of_def_source, self.option_definitions)
+
+        self.use_admin_controls = use_admin_controls
+        self.quit_after_admin = quit_after_admin
+        self._values_source_list = values_source_list
+        # the state of each Option before the overlay first changed it, kept
+        # only if the values may be overlaid again.  See '_overlay_again'
+        self._option_states = {} if self._keeps_option_states else None
+        # the value that each key had when its requirements were last brought
+        # in.  Expanding the very same value again would bring in nothing new
+        self._expanded_values = {}
+        self._overlay_values()
+
+    # --------------------------------------------------------------------------
+    def _overlay_values(self, keys=None):
+        """overlay the values from the value sources onto the option
+        definitions, check the value sources for mismatches and do what the
+        admin options ask for.
 
+        parameters:
+            keys - if given, the names of all the Options in the option
+                   definitions, which are to stay as they are.  No Option
+                   is brought in by expansion: if the values would bring in
+                   or drop any Options, False is returned at once.
+
+        returns:
+            True if the values were overlaid
+        """
+        use_admin_controls = self.use_admin_controls
+        use_auto_help = self.use_auto_help
+        values_source_list = self._values_source_list
         if use_admin_controls:
             # the name of the config file needs to be loaded from the command
             # line prior to processing the rest of the command line options.
             config_filename = config_filename_from_commandline(self)
             if config_filename and ConfigFileFutureProxy in values_source_list:
+                self._keep_option_state("admin.conf")
                 self.option_definitions.admin.conf.default = config_filename
 
-        self.values_source_list = wrap_with_value_source_api(values_source_list, self)
+        with self._timings.phase("wrap_with_value_source_api") as a_phase:
+            self.values_source_list = wrap_with_value_source_api(
+                values_source_list, self
+            )
+            a_phase["items"] = len(self.values_source_list)
 
-        known_keys = self._overlay_expand()
-        self._check_for_mismatches(known_keys)
+        with self._timings.phase("overlay_expand") as a_phase:
+            self._changed_keys = []
+            try:
+                known_keys = self._overlay_expand(keys)
+            finally:
+                self._changed_keys = None
+            if known_keys is None:
+                return False
+            a_phase["items"] = len(known_keys)
+        with self._timings.phase("check_for_mismatches") as a_phase:
+            self._check_for_mismatches(known_keys)
+            a_phase["items"] = len(known_keys)
 
         # the app_name, app_version and app_description are to come from
         # if 'application' option if it is present. If it is not present,
@@ -251,6 +331,7 @@ class ConfigurationManager(object):
             # 'app_name' from the parameters passed in, if they exist.
             pass
 
+        admin_tasks_done = False
         try:
             if use_auto_help and self._get_option("help").value:
                 self.output_summary()
@@ -263,13 +344,15 @@ class ConfigurationManager(object):
 
         # keys that end with a "$" are called "blocked_by_suffix".
         # This means that these options are not to be written out to
-        # configuration files.
-        keys_blocked_by_suffix = [
-            key
-            for key in self.option_definitions.keys_breadth_first()
-            if key.endswith("$")
-        ]
-        self.keys_blocked_from_output.extend(keys_blocked_by_suffix)
+        # configuration files.  When the values are overlaid again, the
+        # definitions are the same and so are these keys.
+        if keys is None:
+            keys_blocked_by_suffix = [
+                key
+                for key in self.option_definitions.keys_breadth_first()
+                if key.endswith("$")
+            ]
+            self.keys_blocked_from_output.extend(keys_blocked_by_suffix)
 
         if use_admin_controls and self._get_option("admin.print_conf").value:
             self.print_conf()
@@ -283,8 +366,63 @@ class ConfigurationManager(object):
             self.log_config()
             admin_tasks_done = True
 
-        if quit_after_admin and admin_tasks_done:
+        if self.quit_after_admin and admin_tasks_done:
             sys.exit()
+        return True
+
+    # --------------------------------------------------------------------------
+    def _overlay_again(self, argv_source=None):
+        """overlay the values from the value sources again, this time with
+        the command line from 'argv_source'.  Each Option goes back to the
+        state that it had before the overlay.  The option definitions are
+        neither set up nor expanded again: if the new values would bring in
+        or drop any Options, like a class option given another class, the
+        values are not all overlaid and False is returned.  Another call may
+        still be made, but 'get_config' is not to be used until one returns
+        True.  Only the managers that keep the states of their Options may
+        do this.
+
+        parameters:
+            argv_source - the command line arguments, sys.argv[1:] if None
+
+        returns:
+            True if the values were overlaid
+        """
+        if argv_source is None:
+            argv_source = sys.argv[1:]
+        self.argv_source = argv_source
+        self.args = []
+        self._config = None
+        for an_option, state in self._option_states.values():
+            (
+                an_option.default,
+                an_option.value,
+                an_option.sourced_from,
+                an_option.has_changed,
+            ) = state
+        return self._overlay_values(list(self._option_states))
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _option_state(an_option):
+        """return an Option with what the overlay changes in it"""
+        return (
+            an_option,
+            (
+                an_option.default,
+                an_option.value,
+                an_option.sourced_from,
+                an_option.has_changed,
+            ),
+        )
+
+    # --------------------------------------------------------------------------
+    def _keep_option_state(self, key):
+        """keep the state of an Option that is about to be changed outside of
+        the overlay, if the states are kept and it has not been kept yet"""
+        option_states = self._option_states
+        if option_states is not None and key not in option_states:
+            option_states[key] = self._option_state(self.option_definitions[key])
 
     # --------------------------------------------------------------------------
     @contextlib.contextmanager
@@ -301,13 +439,43 @@ class ConfigurationManager(object):
 
     # --------------------------------------------------------------------------
     def get_config(self, mapping_class=DotDictWithAcquisition):
-        config = self._generate_config(mapping_class)
-        if self._aggregate(self.option_definitions, config, config):
-            # state changed, must regenerate
-            return self._generate_config(mapping_class)
-        else:
+        with self._timings.phase("get_config"):
+            with self._timings.phase("generate_config"):
+                config = self._generate_config(mapping_class)
+            with self._timings.phase("aggregate"):
+                aggregates_found = self._aggregate(
+                    self.option_definitions, config, config
+                )
+            if aggregates_found:
+                # state changed, must regenerate
+                with self._timings.phase("generate_config"):
+                    config = self._generate_config(mapping_class)
             return config
 
+    # --------------------------------------------------------------------------
+    def get_snapshot(self, class_name="Snapshot"):
+        """return the configuration as an immutable snapshot.  Reading values
+        from a snapshot is much faster than reading them from the mapping
+        returned by 'get_config': acquisition is resolved when the snapshot
+        is made rather than on every read.  Snapshots may be shared freely
+        between threads.  See configmanners.snapshot for details.
+
+        parameters:
+            class_name - the name for the generated class of the top level
+                         of the snapshot"""
+        with self._timings.phase("get_snapshot"):
+            # aggregations may rely on acquisition, so they must be run on
+            # the same mapping that 'get_config' gives by default
+            return freeze(self.get_config(), class_name)
+
+    # --------------------------------------------------------------------------
+    def get_timings(self):
+        """return the timings recorded for this ConfigurationManager as a dict
+        of plain dicts and lists.  See configmanners.timings.Timings.as_dict.
+        If the ConfigurationManager was not created with the 'timings'
+        parameter, the dict is empty."""
+        return self._timings.as_dict()
+
     # --------------------------------------------------------------------------
     def output_summary(self, output_stream=sys.stdout):
         """outputs a usage tip and the list of acceptable commands.
@@ -457,36 +625,39 @@ class ConfigurationManager(object):
         if skip_keys:
             blocked_keys.extend(skip_keys)
 
+        # a copy on write copy shares the parts of the option definitions
+        # that aren't changed below, so this is cheap even for large trees
+        option_defs = self.option_definitions.safe_copy(copy_on_write=True)
+
         if blocked_keys:
-            option_defs = self.option_definitions.safe_copy()
             for a_blocked_key in blocked_keys:
                 try:
                     del option_defs[a_blocked_key]
                 except (AttributeError, KeyError):
                     # okay that key isn't here
                     pass
-            # remove empty namespaces
-            all_keys = [k for k in option_defs.keys_breadth_first(include_dicts=True)]
+            # remove empty namespaces.  A namespace is empty if no key has it
+            # as its parent
+            all_keys = list(option_defs.keys_breadth_first(include_dicts=True))
+            option_keys = set(option_defs.keys_breadth_first())
+            parents = set(key.rpartition(".")[0] for key in all_keys)
             for key in all_keys:
-                candidate = option_defs[key]
-                if isinstance(candidate, Namespace) and not len(candidate):
+                if key not in option_keys and key not in parents:
                     del option_defs[key]
-        else:
-            option_defs = self.option_definitions
 
-        # find all of the secret options and overwrite their values with
-        # '*' * 16
+        # find all of the secret options and replace them with copies whose
+        # values are '*' * 16.  The original options are left alone.
         if not self.option_definitions.admin.expose_secrets.default:
             for a_key in option_defs.keys_breadth_first():
-                an_option = option_defs[a_key]
-                if (
-                    (not a_key.startswith("admin"))
-                    and isinstance(an_option, Option)
-                    and an_option.secret
-                ):
+                if a_key.startswith("admin"):
+                    continue
+                an_option = self.option_definitions[a_key]
+                if isinstance(an_option, Option) and an_option.secret:
                     # force the option to be a string of *
-                    option_defs[a_key].value = "*" * 16
-                    option_defs[a_key].from_string_converter = str
+                    a_masked_option = an_option.copy()
+                    a_masked_option.value = "*" * 16
+                    a_masked_option.from_string_converter = str
+                    option_defs[a_key] = a_masked_option
 
         dispatch_request_to_write(config_file_type, option_defs, opener)
 
@@ -545,10 +716,20 @@ class ConfigurationManager(object):
         ]
 
     # --------------------------------------------------------------------------
-    def _create_reference_value_options(self, keys, finished_keys):
+    def _create_reference_value_options(self, keys, finished_keys, known_keys=None):
         """this method steps through the option definitions looking for
         alt paths.  On finding one, it creates the 'reference_value_from' links
-        within the option definitions and populates it with copied options."""
+        within the option definitions and populates it with copied options.
+
+        parameters:
+            keys - the names of the options to examine
+            finished_keys - the names of options that have already been
+                            overlaid and expanded.  These are skipped.
+            known_keys - the names of all the options that currently exist.
+                         If not given, 'keys' is assumed to be all of them.
+        """
+        if known_keys is None:
+            known_keys = keys
         # a set of known reference_value_from_links
         set_of_reference_value_option_names = set()
         for key in keys:
@@ -560,7 +741,7 @@ class ConfigurationManager(object):
                 fully_qualified_reference_name = ".".join(
                     (an_option.reference_value_from, an_option.name)
                 )
-                if fully_qualified_reference_name in keys:
+                if fully_qualified_reference_name in known_keys:
                     continue  # this referenced value has already been defined
                     # no need to repeat it - skip on to the next key
                 reference_option = an_option.copy()
@@ -582,7 +763,7 @@ class ConfigurationManager(object):
         return set_of_reference_value_option_names
 
     # --------------------------------------------------------------------------
-    def _overlay_expand(self):
+    def _overlay_expand(self, keys=None):
         """This method overlays each of the value sources onto the default
         in each of the defined options.  It does so using a breadth first
         iteration, overlaying and expanding each level of the tree in turn.
@@ -596,188 +777,251 @@ class ConfigurationManager(object):
         'set_value' method of the Option object.  If the resultant type has its
         own configuration options, bring those into the current namespace and
         then proceed to overlay/expand those.
-        """
-        new_keys_have_been_discovered = True  # loop control, False breaks loop
-        finished_keys = set()
-        all_reference_values = {}
-
-        while new_keys_have_been_discovered:  # loop until nothing more is done
-            # names_of_all_exsting_options holds a list of all keys in the
-            # option definitons in breadth first order using this form:
-            # [ 'x', 'y', 'z', 'x.a', 'x.b', 'z.a', 'z.b', 'x.a.j', 'x.a.k',
-            # 'x.b.h']
-            names_of_all_exsting_options = [
-                x
-                for x in self.option_definitions.keys_breadth_first()
-                if isinstance(self.option_definitions[x], Option)
-            ]
-            new_keys_have_been_discovered = False  # setup to break loop
 
-            # create alternate paths options
-            set_of_reference_value_option_names = self._create_reference_value_options(
-                names_of_all_exsting_options, finished_keys
-            )
-
-            for a_ref_option_name in set_of_reference_value_option_names:
-                if a_ref_option_name not in all_reference_values:
-                    all_reference_values[a_ref_option_name] = []
+        The work is driven by a worklist.  The first pass visits every Option.
+        Each subsequent pass visits only the Options that the previous pass
+        brought in through expansion or that must be redone because something
+        they depend upon has changed.  When the worklist is empty, the work is
+        done.
 
-            all_keys = (
-                list(set_of_reference_value_option_names) + names_of_all_exsting_options
-            )
+        parameters:
+            keys - if given, the names of all the Options, which the first
+                   pass visits in this order.  The option definitions are to
+                   stay as they are: if expanding a value would bring in or
+                   drop any Options, None is returned at once.
 
-            # previous versions of this method pulled the values from the
-            # values sources deeper within the following nested loops.
-            # that was not necessary and caused a lot of redundant work.
-            # the 'values_from_all_sources' now holds all the the values
-            # from each of the value sources.
-            values_from_all_sources = [
-                a_value_source.get_values(
-                    self,  # pass in the config_manager itself
-                    True,  # ignore mismatches
-                    self.value_source_object_hook,  # build with this class
+        returns:
+            the names of all the Options
+        """
+        finished_keys = set()
+        all_reference_values = {}
+        expanded_values = self._expanded_values
+        option_states = self._option_states
+
+        # 'known_keys' holds the names of all the Options in the option
+        # definitions.  'pending_keys' is the worklist: the names of the
+        # Options that have yet to be overlaid and expanded.  It starts with
+        # all the Options in breadth first order using this form:
+        # [ 'x', 'y', 'z', 'x.a', 'x.b', 'z.a', 'z.b', 'x.a.j', 'x.a.k',
+        # 'x.b.h']
+        # New keys are appended in the order that they are discovered.
+        if keys is None:
+            known_keys = set()
+            pending_keys = OrderedSet()
+            for key in self.option_definitions.keys_breadth_first():
+                if isinstance(self.option_definitions[key], Option):
+                    known_keys.add(key)
+                    pending_keys.add(key)
+        else:
+            known_keys = set(keys)
+            pending_keys = OrderedSet(keys)
+
+        while pending_keys:  # loop until nothing more is to be done
+            with self._timings.phase("overlay_expand.pass") as a_pass:
+                worklist = list(pending_keys)
+                pending_keys = OrderedSet()
+                a_pass["items"] = len(worklist)
+
+                # create alternate paths options
+                set_of_reference_value_option_names = self._create_reference_value_options(
+                    worklist, finished_keys, known_keys
                 )
-                for a_value_source in self.values_source_list
-            ]
-            value_source_identities = [
-                a_value_source.identity for a_value_source in self.values_source_list
-            ]
-
-            # overlay process:
-            # fetch all the default values from the value sources before
-            # applying the from string conversions
-
-            for key in all_keys:
-                if key in finished_keys:
-                    continue
-                # if not isinstance(an_option, Option):
-                #   continue  # aggregations and other types are ignored
-                # loop through all the value sources looking for values
-                # that match this current key.
-                if self.option_definitions[key].reference_value_from:
-                    reference_value_from = self.option_definitions[
-                        key
-                    ].reference_value_from
-                    top_key = key.split(".")[-1]
-                    self.option_definitions[key].default = self.option_definitions[
-                        reference_value_from
-                    ][top_key].default
-                    self.option_definitions[
-                        key
-                    ].sourced_from = "reference_value - '%s.%s'" % (
-                        reference_value_from,
-                        top_key,
-                    )
-
-                    all_reference_values[
-                        ".".join((reference_value_from, top_key))
-                    ].append(key)
 
-                an_option = self.option_definitions[key]
-                if key in all_reference_values:
-                    # make sure that this value gets propagated to keys
-                    # even if the keys have already been overlaid
-                    finished_keys -= set(all_reference_values[key])
-
-                for val_src_dict, val_src_identity in zip(
-                    values_from_all_sources, value_source_identities
-                ):
-                    try:
-
-                        # overlay the default with the new value from
-                        # the value source.  This assignment may come
-                        # via acquisition, so the key given may not have
-                        # been an exact match for what was returned.
-                        an_option.has_changed = an_option.default != val_src_dict[key]
-                        an_option.default = val_src_dict[key]
-                        an_option.sourced_from = val_src_identity
-                        if key in all_reference_values:
-                            # make sure that this value gets propagated to keys
-                            # even if the keys have already been overlaid
-                            finished_keys -= set(all_reference_values[key])
-                    except KeyError as x:
-                        pass  # okay, that source doesn't have this value
-
-            # expansion process:
-            # step through all the keys converting them to their proper
-            # types and bringing in any new keys in the process
-            for key in all_keys:
-                if key in finished_keys:
-                    continue
-                # mark this key as having been seen and processed
-                finished_keys.add(key)
-                an_option = self.option_definitions[key]
-                # if not isinstance(an_option, Option):
-                #    continue  # aggregations, namespaces are ignored
-                # apply the from string conversion to make the real value
-                an_option.set_value(an_option.default)
-                # new values have been seen, don't let loop break
-                new_keys_have_been_discovered = True
-                try:
-                    try:
-                        # try to fetch new requirements from this value
-                        new_requirements = an_option.value.get_required_config()
-                    except (AttributeError, KeyError):
-                        new_requirements = getattr(
-                            an_option.value, "required_config", None
+                for a_ref_option_name in set_of_reference_value_option_names:
+                    if a_ref_option_name not in all_reference_values:
+                        all_reference_values[a_ref_option_name] = []
+                known_keys.update(set_of_reference_value_option_names)
+
+                # the newly created reference value options go first so that they
+                # are overlaid before the options that refer to them
+                worklist = list(set_of_reference_value_option_names) + worklist
+                # these are the Options brought in since the last pass
+                self._changed_keys.extend(worklist)
+
+                # previous versions of this method pulled the values from the
+                # values sources deeper within the following nested loops.
+                # that was not necessary and caused a lot of redundant work.
+                # the 'values_from_all_sources' now holds all the the values
+                # from each of the value sources.  The sources are consulted once
+                # per pass because the command line sources can only interpret
+                # the options that have been defined so far.
+                values_from_all_sources = []
+                for index, a_value_source in enumerate(self.values_source_list):
+                    with self._timings.value_source(
+                        index, a_value_source.identity
+                    ) as a_call:
+                        values = a_value_source.get_values(
+                            self,  # pass in the config_manager itself
+                            True,  # ignore mismatches
+                            self.value_source_object_hook,  # build with this class
                         )
-                    # make sure what we got as new_req is actually a
-                    # Mapping of some sort
-                    if not isinstance(new_requirements, collections.abc.Mapping):
-                        # we didn't get a mapping, perhaps the option value
-                        # was a Mock object - in any case we can't try to
-                        # interpret 'new_req' as a configmanners requirement
-                        # collection.  We must abandon processing this
-                        # option further
+                        if self._timings.enabled:
+                            a_call["items"] = len(values)
+                    values_from_all_sources.append(values)
+                value_source_identities = [
+                    a_value_source.identity for a_value_source in self.values_source_list
+                ]
+
+                # overlay process:
+                # fetch all the default values from the value sources before
+                # applying the from string conversions
+
+                for key in worklist:
+                    if key in finished_keys:
                         continue
-                    if not isinstance(new_requirements, Namespace):
-                        new_requirements = Namespace(initializer=new_requirements)
-                    # get the parent namespace
-                    current_namespace = self.option_definitions.parent(key)
-                    if current_namespace is None:
-                        # we're at the top level, use the base namespace
-                        current_namespace = self.option_definitions
-                    if current_namespace._reference_value_from:
-                        # don't expand things that are in reference value
-                        # namespaces, they will be populated by expanding the
-                        # targets
+                    an_option = self.option_definitions[key]
+                    if option_states is not None and key not in option_states:
+                        option_states[key] = self._option_state(an_option)
+                    # loop through all the value sources looking for values
+                    # that match this current key.
+                    if an_option.reference_value_from:
+                        reference_value_from = an_option.reference_value_from
+                        top_key = key.split(".")[-1]
+                        an_option.default = self.option_definitions[reference_value_from][
+                            top_key
+                        ].default
+                        an_option.sourced_from = "reference_value - '%s.%s'" % (
+                            reference_value_from,
+                            top_key,
+                        )
+
+                        # the referenced Option may be an ordinary Option
+                        # rather than one created as a reference value
+                        all_reference_values.setdefault(
+                            ".".join((reference_value_from, top_key)), []
+                        ).append(key)
+
+                    if key in all_reference_values:
+                        # make sure that this value gets propagated to keys
+                        # even if the keys have already been overlaid
+                        for a_referring_key in all_reference_values[key]:
+                            if a_referring_key in finished_keys:
+                                finished_keys.discard(a_referring_key)
+                                pending_keys.add(a_referring_key)
+
+                    for val_src_dict, val_src_identity in zip(
+                        values_from_all_sources, value_source_identities
+                    ):
+                        try:
+
+                            # overlay the default with the new value from
+                            # the value source.  This assignment may come
+                            # via acquisition, so the key given may not have
+                            # been an exact match for what was returned.
+                            an_option.has_changed = an_option.default != val_src_dict[key]
+                            an_option.default = val_src_dict[key]
+                            an_option.sourced_from = val_src_identity
+                        except KeyError as x:
+                            pass  # okay, that source doesn't have this value
+                # and these are the Options whose defaults may have changed
+                self._changed_keys.extend(worklist)
+
+                # expansion process:
+                # step through all the keys converting them to their proper
+                # types and bringing in any new keys in the process
+                for key in worklist:
+                    if key in finished_keys:
                         continue
-                    # some new Options to be brought in may have already been
-                    # seen and in the finished_keys set.  They must be reset
-                    # as unfinished so that a new default doesn't permanently
-                    # overwrite any of the values already placed by the
-                    # overlays.  So we've got to remove those keys from the
-                    # finished keys list.
-                    # Before we can do that however, we need the fully
-                    # qualified names for the new keys.
-                    qualified_parent_name_list = key.rsplit(".", 1)
-                    if len(qualified_parent_name_list) > 1:
-                        qualified_parent_name = qualified_parent_name_list[0]
-                    else:
-                        qualified_parent_name = ""
-
-                    finished_keys = finished_keys.difference(
-                        ".".join((qualified_parent_name, ref_option_name))
-                        for ref_option_name in new_requirements
-                    )
-                    # add the new Options to the namespace
-                    new_namespace = new_requirements.safe_copy(
-                        an_option.reference_value_from
-                    )
+                    # mark this key as having been seen and processed
+                    finished_keys.add(key)
+                    an_option = self.option_definitions[key]
+                    # if not isinstance(an_option, Option):
+                    #    continue  # aggregations, namespaces are ignored
+                    # apply the from string conversion to make the real value
+                    an_option.set_value(an_option.default)
+                    if key in expanded_values:
+                        if expanded_values[key] is an_option.value:
+                            continue
+                        if keys is not None:
+                            # an equal value brings in the same requirements,
+                            # anything else would change the definitions
+                            if expanded_values[key] == an_option.value:
+                                continue
+                            return None
+                    try:
+                        try:
+                            # try to fetch new requirements from this value
+                            new_requirements = an_option.value.get_required_config()
+                        except (AttributeError, KeyError):
+                            new_requirements = getattr(
+                                an_option.value, "required_config", None
+                            )
+                        # make sure what we got as new_req is actually a
+                        # Mapping of some sort
+                        if not isinstance(new_requirements, collections.abc.Mapping):
+                            # we didn't get a mapping, perhaps the option value
+                            # was a Mock object - in any case we can't try to
+                            # interpret 'new_req' as a configmanners requirement
+                            # collection.  We must abandon processing this
+                            # option further
+                            continue
+                        if not isinstance(new_requirements, Namespace):
+                            new_requirements = Namespace(initializer=new_requirements)
+                        # get the parent namespace
+                        current_namespace = self.option_definitions.parent(key)
+                        if current_namespace is None:
+                            # we're at the top level, use the base namespace
+                            current_namespace = self.option_definitions
+                        if current_namespace._reference_value_from:
+                            # don't expand things that are in reference value
+                            # namespaces, they will be populated by expanding the
+                            # targets
+                            continue
+                        if keys is not None:
+                            # new requirements, the definitions would change
+                            return None
+                        # some new Options to be brought in may have already been
+                        # seen and in the finished_keys set.  They must be reset
+                        # as unfinished so that a new default doesn't permanently
+                        # overwrite any of the values already placed by the
+                        # overlays.  So we've got to return those keys to the
+                        # worklist.
+                        # Before we can do that however, we need the fully
+                        # qualified names for the new keys.
+                        qualified_parent_name_list = key.rsplit(".", 1)
+                        if len(qualified_parent_name_list) > 1:
+                            qualified_parent_name = qualified_parent_name_list[0]
+                        else:
+                            qualified_parent_name = ""
+
+                        for ref_option_name in new_requirements:
+                            a_requirement_key = ".".join(
+                                (qualified_parent_name, ref_option_name)
+                            )
+                            if a_requirement_key in finished_keys:
+                                finished_keys.discard(a_requirement_key)
+                                pending_keys.add(a_requirement_key)
+                        # add the new Options to the namespace
+                        new_namespace = new_requirements.safe_copy(
+                            an_option.reference_value_from
+                        )
 
-                    for new_key in new_namespace.keys_breadth_first():
-                        if new_key not in current_namespace:
-                            current_namespace[new_key] = new_namespace[new_key]
-                except AttributeError as x:
-                    # there are apparently no new Options to bring in from
-                    # this option's value
-                    pass
+                        for new_key in new_namespace.keys_breadth_first():
+                            if new_key not in current_namespace:
+                                new_value = new_namespace[new_key]
+                                current_namespace[new_key] = new_value
+                                if isinstance(new_value, Option):
+                                    # a newly discovered Option, it goes onto the
+                                    # worklist for the next pass
+                                    if qualified_parent_name:
+                                        new_key = ".".join((qualified_parent_name, new_key))
+                                    known_keys.add(new_key)
+                                    pending_keys.add(new_key)
+                        expanded_values[key] = an_option.value
+                    except AttributeError as x:
+                        # there are apparently no new Options to bring in from
+                        # this option's value
+                        pass
         return finished_keys
 
     # --------------------------------------------------------------------------
     def _check_for_mismatches(self, known_keys):
         """check for bad options from value sources"""
-        for a_value_source in self.values_source_list:
+        # an index of the known keys by their trailing components, shared by
+        # all the value sources, used to find keys that were used during
+        # acquisition
+        known_key_suffixes = DottedKeySuffixIndex(known_keys)
+        for index, a_value_source in enumerate(self.values_source_list):
             try:
                 if a_value_source.always_ignore_mismatches:
                     continue
@@ -798,11 +1042,14 @@ class ConfigurationManager(object):
                 allow_mismatches = True
             # make a set of all the keys from a value source in the form
             # of strings like this: 'x.y.z'
-            value_source_mapping = a_value_source.get_values(
-                self, allow_mismatches, self.value_source_object_hook
-            )
+            with self._timings.value_source(index, a_value_source.identity) as a_call:
+                value_source_mapping = a_value_source.get_values(
+                    self, allow_mismatches, self.value_source_object_hook
+                )
+                if self._timings.enabled:
+                    a_call["items"] = len(value_source_mapping)
             value_source_keys_set = set(
-                [k for k in DotDict(value_source_mapping).keys_breadth_first()]
+                DotDict(value_source_mapping, lazy=True).keys_breadth_first()
             )
             # make a set of the keys that didn't match any of the known
             # keys in the requirements
@@ -812,11 +1059,7 @@ class ConfigurationManager(object):
             # remove keys of the form 'y.z' if they match a known key of the
             # form 'x.y.z'
             for key in unmatched_keys.copy():
-                key_is_okay = reduce(
-                    lambda x, y: x or y,
-                    (known_key.endswith(key) for known_key in known_keys),
-                )
-                if key_is_okay:
+                if known_key_suffixes.has_suffix(key):
                     unmatched_keys.remove(key)
                 if "__identity" in unmatched_keys:
                     # we allow bare Mappings to use the key "__identity" to give
@@ -924,7 +1167,7 @@ class ConfigurationManager(object):
 
     # --------------------------------------------------------------------------
     def _walk_config_copy_values(self, source, destination, mapping_class):
-        for key, val in source.items():
+        for key, val in collections.abc.Mapping.items(source):
             if key.endswith("$"):
                 continue
             value_type = type(val)
@@ -937,7 +1180,7 @@ class ConfigurationManager(object):
     # --------------------------------------------------------------------------
     def _aggregate(self, source, base_namespace, local_namespace):
         aggregates_found = False
-        for key, val in source.items():
+        for key, val in collections.abc.Mapping.items(source):
             if isinstance(val, Namespace):
                 new_aggregates_found = self._aggregate(
                     val, base_namespace, local_namespace[key]
@@ -971,3 +1214,12 @@ class ConfigurationManager(object):
             (key, self.option_definitions[key])
             for key in self.option_definitions.keys_breadth_first()
         ]
+
+
+# ==============================================================================
+class _ReusableConfigurationManager(ConfigurationManager):
+    """a ConfigurationManager that keeps the state of each Option before the
+    overlay, so that '_overlay_again' may overlay the values for another
+    command line."""
+
+    _keeps_option_states = True
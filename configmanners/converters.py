@@ -22,6 +22,7 @@ datetime_converter = datetime_from_ISO_string
 date_converter = date_from_ISO_string
 
 from configmanners.config_exceptions import CannotConvertError
+from configmanners.memoize import CacheInfo, LRUCache, memoize
 
 # ------------------------------------------------------------------------------
 #  Utility section
@@ -123,9 +124,65 @@ def str_to_boolean(input_str):
 boolean_converter = str_to_boolean  # for backward compatiblity
 
 
+# the modules imported by 'str_to_python_object', keyed by the strings that it
+# was given.  The values are tuples: the name of the module imported, the
+# module in sys.modules under that name at the time, the package returned by
+# __import__ and the names of the attributes leading from it to the object.
+# An entry is used only while sys.modules still has the same module.
+_imported_python_objects = LRUCache(max_size=1000)
+# the strings that could not be imported, remembered for this many seconds
+NOT_FOUND_TTL = 5
+# the values are tuples: the name of the module that could not be imported,
+# whatever sys.modules had under that name at the time and the error message
+_python_objects_not_found = LRUCache(max_size=1000, ttl=NOT_FOUND_TTL)
+
+
+# ------------------------------------------------------------------------------
+def _same_module_in_sys_modules(a_cached_value):
+    """a cached value is valid while sys.modules holds the same module under
+    the name of the module saved with it"""
+    return sys.modules.get(a_cached_value[0]) is a_cached_value[1]
+
+
+# ------------------------------------------------------------------------------
+def _import_python_object(input_str):
+    """import the module for 'str_to_python_object', trying the whole string
+    as a module name first.  Returns the value saved in the cache of
+    imported python objects."""
+    parts = [x.strip() for x in input_str.split(".") if x.strip()]
+    module_name = input_str
+    try:
+        # first try as a complete module
+        package = __import__(input_str)
+    except ImportError:
+        # it must be a class from a module
+        if len(parts) == 1:
+            # since it has only one part, it must be a class from __main__
+            parts = ("__main__", input_str)
+        module_name = ".".join(parts[:-1])
+        try:
+            package = __import__(module_name, globals(), locals(), [])
+        except ImportError as x:
+            _python_objects_not_found.put(
+                input_str, (module_name, sys.modules.get(module_name), str(x))
+            )
+            raise
+    return (module_name, sys.modules.get(module_name), package, tuple(parts[1:]))
+
+
 # ------------------------------------------------------------------------------
 def str_to_python_object(input_str):
-    """a conversion that will import a module and class name"""
+    """a conversion that will import a module and class name.
+
+    The imports are cached.  The attributes leading from the module to the
+    object are looked up every time, so objects that are replaced in their
+    module are seen.  A cached import is used only while sys.modules holds
+    the same module, a string that can't be imported is remembered for
+    NOT_FOUND_TTL seconds, or until sys.modules changes for its module.
+    'str_to_python_object.cache_info()' returns a CacheInfo of the hits and
+    misses of both caches together, with the entries dropped because
+    sys.modules changed counted as expired.
+    'str_to_python_object.cache_clear()' empties them."""
     if not input_str:
         return None
     if isinstance(input_str, bytes):
@@ -138,30 +195,124 @@ def str_to_python_object(input_str):
     input_str = str_quote_stripper(input_str)
     if "." not in input_str and input_str in known_mapping_str_to_type:
         return known_mapping_str_to_type[input_str]
-    parts = [x.strip() for x in input_str.split(".") if x.strip()]
     try:
+        not_found = _python_objects_not_found.get(
+            input_str, _same_module_in_sys_modules
+        )
+    except KeyError:
+        pass
+    else:
+        raise CannotConvertError(not_found[2])
+    try:
+        imported = _imported_python_objects.get(input_str, _same_module_in_sys_modules)
+    except KeyError:
         try:
-            # first try as a complete module
-            package = __import__(input_str)
-        except ImportError:
-            # it must be a class from a module
-            if len(parts) == 1:
-                # since it has only one part, it must be a class from __main__
-                parts = ("__main__", input_str)
-            package = __import__(".".join(parts[:-1]), globals(), locals(), [])
-        obj = package
-        for name in parts[1:]:
+            imported = _import_python_object(input_str)
+        except ImportError as x:
+            raise CannotConvertError(str(x))
+        _imported_python_objects.put(input_str, imported)
+    obj, attribute_names = imported[2:]
+    try:
+        for name in attribute_names:
             obj = getattr(obj, name)
         return obj
     except AttributeError as x:
         raise CannotConvertError("%s cannot be found" % input_str)
-    except ImportError as x:
-        raise CannotConvertError(str(x))
 
 
+# ------------------------------------------------------------------------------
+def _python_object_cache_info():
+    found = _imported_python_objects.info()
+    not_found = _python_objects_not_found.info()
+    return CacheInfo(
+        found.hits + not_found.hits,
+        found.misses + not_found.misses,
+        found.maxsize + not_found.maxsize,
+        found.currsize + not_found.currsize,
+        found.expired + not_found.expired,
+    )
+
+
+# ------------------------------------------------------------------------------
+def _python_object_cache_clear():
+    _imported_python_objects.clear()
+    _python_objects_not_found.clear()
+
+
+str_to_python_object.cache_info = _python_object_cache_info
+str_to_python_object.cache_clear = _python_object_cache_clear
+
 class_converter = str_to_python_object  # for backward compatibility
 
 
+# ------------------------------------------------------------------------------
+@memoize(max_cache_size=1000)
+def _classes_in_namespaces_class(
+    class_list,
+    template_for_namespace,
+    name_of_class_option,
+    instantiate_classes,
+):
+    """create the proxy class for a tuple of class names for the converter
+    made by 'str_to_classes_in_namespaces'.  The classes are cached so that
+    converting the same list again gives the same class, which the overlay
+    process recognizes as already expanded."""
+    # these are only used within this method.  No need to pollute the module
+    # scope with them and avoid potential circular imports
+    from configmanners.namespace import Namespace
+    from configmanners.required_config import RequiredConfig
+
+    # ==========================================================================
+    class InnerClassList(RequiredConfig):
+        """This nested class is a proxy list for the classes.  It collects
+        all the config requirements for the listed classes and places them
+        each into their own Namespace.
+        """
+
+        # we're dynamically creating a class here.  The following block of
+        # code is actually adding class level attributes to this new class
+        required_config = Namespace()  # 1st requirement for configmanners
+        subordinate_namespace_names = []  # to help the programmer know
+        # what Namespaces we added
+        namespace_template = template_for_namespace  # save the template
+        # for future reference
+        class_option_name = name_of_class_option  # save the class's option
+        # name for the future
+        # for each class in the class list
+        for namespace_index, a_class in enumerate(class_list):
+            # figure out the Namespace name
+            namespace_name = template_for_namespace % namespace_index
+            subordinate_namespace_names.append(namespace_name)
+            # create the new Namespace
+            required_config[namespace_name] = Namespace()
+            # add the option for the class itself
+            required_config[namespace_name].add_option(
+                name_of_class_option,
+                # doc=a_class.__doc__  # not helpful if too verbose
+                default=a_class,
+                from_string_converter=class_converter,
+            )
+            if instantiate_classes:
+                # add an aggregator to instantiate the class
+                required_config[namespace_name].add_aggregation(
+                    "%s_instance" % name_of_class_option,
+                    lambda c, lc, a: lc[name_of_class_option](lc),
+                )
+
+        @classmethod
+        def to_str(cls):
+            """this method takes this inner class object and turns it back
+            into the original string of classnames.  This is used
+            primarily as for the output of the 'help' option"""
+            return ", ".join(
+                py_obj_to_str(v[name_of_class_option].value)
+                for v in cls.get_required_config().values()
+                if isinstance(v, Namespace)
+            )
+
+    return InnerClassList
+
+
 # ------------------------------------------------------------------------------
 def str_to_classes_in_namespaces(
     template_for_namespace="cls%d",
@@ -219,74 +370,26 @@ def str_to_classes_in_namespaces(
                               class.
     """
 
-    # these are only used within this method.  No need to pollute the module
-    # scope with them and avoid potential circular imports
-    from configmanners.namespace import Namespace
-    from configmanners.required_config import RequiredConfig
-
     # --------------------------------------------------------------------------
     def class_list_converter(class_list_str):
         """This function becomes the actual converter used by configmanners to
         take a string and convert it into the nested sequence of Namespaces,
         one for each class in the list.  It does this by creating a proxy
         class stuffed with its own 'required_config' that's dynamically
-        generated."""
+        generated.  The same list of classes always gets the same proxy
+        class."""
         if isinstance(class_list_str, str):
             class_list = [x.strip() for x in class_list_str.split(",")]
             if class_list == [""]:
                 class_list = []
         else:
             raise TypeError("must be derivative of %s" % str)
-
-        # ======================================================================
-        class InnerClassList(RequiredConfig):
-            """This nested class is a proxy list for the classes.  It collects
-            all the config requirements for the listed classes and places them
-            each into their own Namespace.
-            """
-
-            # we're dynamically creating a class here.  The following block of
-            # code is actually adding class level attributes to this new class
-            required_config = Namespace()  # 1st requirement for configmanners
-            subordinate_namespace_names = []  # to help the programmer know
-            # what Namespaces we added
-            namespace_template = template_for_namespace  # save the template
-            # for future reference
-            class_option_name = name_of_class_option  # save the class's option
-            # name for the future
-            # for each class in the class list
-            for namespace_index, a_class in enumerate(class_list):
-                # figure out the Namespace name
-                namespace_name = template_for_namespace % namespace_index
-                subordinate_namespace_names.append(namespace_name)
-                # create the new Namespace
-                required_config[namespace_name] = Namespace()
-                # add the option for the class itself
-                required_config[namespace_name].add_option(
-                    name_of_class_option,
-                    # doc=a_class.__doc__  # not helpful if too verbose
-                    default=a_class,
-                    from_string_converter=class_converter,
-                )
-                if instantiate_classes:
-                    # add an aggregator to instantiate the class
-                    required_config[namespace_name].add_aggregation(
-                        "%s_instance" % name_of_class_option,
-                        lambda c, lc, a: lc[name_of_class_option](lc),
-                    )
-
-            @classmethod
-            def to_str(cls):
-                """this method takes this inner class object and turns it back
-                into the original string of classnames.  This is used
-                primarily as for the output of the 'help' option"""
-                return ", ".join(
-                    py_obj_to_str(v[name_of_class_option].value)
-                    for v in cls.get_required_config().values()
-                    if isinstance(v, Namespace)
-                )
-
-        return InnerClassList  # result of class_list_converter
+        return _classes_in_namespaces_class(
+            tuple(class_list),
+            template_for_namespace,
+            name_of_class_option,
+            instantiate_classes,
+        )
 
     return class_list_converter  # result of classes_in_namespaces_converter
 
@@ -301,6 +404,50 @@ def take_two(a_list):
         yield a_pair
 
 
+# ------------------------------------------------------------------------------
+@memoize(max_cache_size=1000)
+def _namespaces_and_classes_class(list_of_entries, name_of_class_option):
+    """create the proxy class for a tuple of alternating namespace and class
+    names for the converter made by 'str_to_namespaces_and_classes'.  The
+    classes are cached, like those of '_classes_in_namespaces_class'."""
+    # these are only used within this method.  No need to pollute the module
+    # scope with them and avoid potential circular imports
+    from configmanners import Namespace, RequiredConfig
+
+    # ==========================================================================
+    class InnerClassList(RequiredConfig):
+        """This nested class is a proxy list for the classes.  It collects
+        all the config requirements for the listed classes and places them
+        each into their own Namespace.
+        """
+
+        # we're dynamically creating a class here.  The following block of
+        # code is actually adding class level attributes to this new class
+        required_config = Namespace()  # 1st requirement for configmanners
+        subordinate_namespace_names = []  # to help the programmer know
+        # what Namespaces we added
+        class_option_name = name_of_class_option  # save the class's option
+        # name for the future
+        # for each class in the class list
+        for namespace_name, a_class_name in take_two(list_of_entries):
+            subordinate_namespace_names.append(namespace_name)
+            # create the new Namespace
+            required_config[namespace_name] = Namespace()
+            # add the option for the class itself
+            required_config[namespace_name].add_option(
+                name_of_class_option,
+                # doc=a_class.__doc__  # not helpful if too verbose
+                default=a_class_name,
+                from_string_converter=class_converter,
+            )
+
+        @classmethod
+        def to_str(cls):
+            return ", ".join(list_of_entries)
+
+    return InnerClassList
+
+
 # ------------------------------------------------------------------------------
 def str_to_namespaces_and_classes(
     name_of_class_option="klass",
@@ -330,56 +477,23 @@ def str_to_namespaces_and_classes(
                             "alpha_ns.klass", "beta_ns.cls", klass.
     """
 
-    # these are only used within this method.  No need to pollute the module
-    # scope with them and avoid potential circular imports
-    from configmanners import Namespace, RequiredConfig
-
     # --------------------------------------------------------------------------
     def class_list_converter(class_list_str):
         """This function becomes the actual converter used by configmanners to
         take a string and convert it into the nested sequence of Namespaces,
         one for each class in the list.  It does this by creating a proxy
         class stuffed with its own 'required_config' that's dynamically
-        generated."""
+        generated.  The same list of entries always gets the same proxy
+        class."""
         if isinstance(class_list_str, str):
             list_of_entries = [x.strip() for x in class_list_str.split(",")]
             if list_of_entries == [""]:
                 list_of_entries = []
         else:
             raise TypeError("must be derivative of %s" % str)
-
-        # ======================================================================
-        class InnerClassList(RequiredConfig):
-            """This nested class is a proxy list for the classes.  It collects
-            all the config requirements for the listed classes and places them
-            each into their own Namespace.
-            """
-
-            # we're dynamically creating a class here.  The following block of
-            # code is actually adding class level attributes to this new class
-            required_config = Namespace()  # 1st requirement for configmanners
-            subordinate_namespace_names = []  # to help the programmer know
-            # what Namespaces we added
-            class_option_name = name_of_class_option  # save the class's option
-            # name for the future
-            # for each class in the class list
-            for namespace_name, a_class_name in take_two(list_of_entries):
-                subordinate_namespace_names.append(namespace_name)
-                # create the new Namespace
-                required_config[namespace_name] = Namespace()
-                # add the option for the class itself
-                required_config[namespace_name].add_option(
-                    name_of_class_option,
-                    # doc=a_class.__doc__  # not helpful if too verbose
-                    default=a_class_name,
-                    from_string_converter=class_converter,
-                )
-
-            @classmethod
-            def to_str(cls):
-                return ", ".join(list_of_entries)
-
-        return InnerClassList  # result of class_list_converter
+        return _namespaces_and_classes_class(
+            tuple(list_of_entries), name_of_class_option
+        )
 
     return class_list_converter  # result of classes_in_namespaces_converter
 
@@ -27,6 +27,12 @@ from configmanners.converters import (
     CannotConvertError,
 )
 
+# the Mapping class of the results of parsing.  It translates keys with '-'
+# into keys with '_'.
+HyphenUnderscoreDict = create_key_translating_dot_dict(
+    "HyphenUnderscoreDict", (("-", "_"),)
+)
+
 
 # -----------------------------------------------------------------------------
 # horrors
@@ -221,6 +227,10 @@ class ArgumentParser(argparse.ArgumentParser):
         super(ArgumentParser, self).__init__(*args, **kwargs)
         self.value_source_list = [environ, ConfigFileFutureProxy, argparse]
         self.required_config = Namespace()
+        # the definitions saved by 'compile' and the ConfigurationManagers
+        # made from them, the most recently used first
+        self._compiled_required_config = None
+        self._compiled_managers = []
 
     # --------------------------------------------------------------------------
     def get_required_config(self):
@@ -267,6 +277,8 @@ class ArgumentParser(argparse.ArgumentParser):
         # In this section, variables beginning with the prefix "argparse" are
         # values that define Action object.  Variables that begin with
         # "configmanners" are the arguments to create configmanners Options.
+        self._compiled_required_config = None
+        self._compiled_managers = []
         argparse_action_name = kwargs.get("action", None)
         argparse_dest = kwargs.get("dest", None)
         argparse_const = kwargs.get("const", None)
@@ -492,6 +504,8 @@ class ArgumentParser(argparse.ArgumentParser):
         corresponding configmanners Option object for the subparser and pack it's
         foreign data section with the original args & kwargs."""
 
+        self._compiled_required_config = None
+        self._compiled_managers = []
         kwargs["parser_class"] = self.__class__
         kwargs["action"] = configmannersSubParsersAction
 
@@ -546,16 +560,47 @@ class ArgumentParser(argparse.ArgumentParser):
         self.extra_defaults = kwargs
 
     # --------------------------------------------------------------------------
-    def parse_args(self, args=None, namespace=None):
-        """this method hijacks the normal argparse Namespace generation,
-        shimming configmanners into the process. The return value will be a
-        configmanners DotDict rather than an argparse Namespace."""
+    def compile(self):
+        """build the configmanners definitions for this parser once and keep
+        the ConfigurationManagers made from them for the later calls of
+        'parse_args' or 'parse_known_args'.  A kept manager is used again by
+        overlaying the values for the new command line onto its Options: the
+        definitions are neither copied, set up nor expanded again.  A command
+        line that would bring in other Options than those of every kept
+        manager, like one that chooses another subcommand, gets a new manager.
+        The most recently used managers are kept, up to
+        'number_of_compiled_managers'.  Arguments added to this parser
+        afterwards drop what was kept, but changes to its subparsers are not
+        seen until 'compile' is called again.  Returns the parser itself."""
+        self._compiled_required_config = self.get_required_config()
+        self._compiled_managers = []
+        return self
+
+    # the number of ConfigurationManagers kept by a compiled parser
+    number_of_compiled_managers = 8
+
+    # --------------------------------------------------------------------------
+    def _create_configuration_manager(self, args):
         # load the config_manager within the scope of the method that uses it
         # so that we avoid circular references in the outer scope
-        from configmanners.config_manager import ConfigurationManager
+        from configmanners.config_manager import (
+            ConfigurationManager,
+            _ReusableConfigurationManager,
+        )
 
-        configuration_manager = ConfigurationManager(
-            definition_source=[self.get_required_config()],
+        required_config = self._compiled_required_config
+        if required_config is None:
+            manager_class = ConfigurationManager
+            required_config = self.get_required_config()
+        else:
+            compiled_managers = self._compiled_managers
+            for index, a_manager in enumerate(compiled_managers):
+                if a_manager._overlay_again(args):
+                    compiled_managers.insert(0, compiled_managers.pop(index))
+                    return a_manager
+            manager_class = _ReusableConfigurationManager
+        a_manager = manager_class(
+            definition_source=[required_config],
             values_source_list=self.value_source_list,
             argv_source=args,
             app_name=self.prog,
@@ -563,6 +608,17 @@ class ArgumentParser(argparse.ArgumentParser):
             app_description=self.description,
             use_auto_help=False,
         )
+        if manager_class is _ReusableConfigurationManager:
+            compiled_managers.insert(0, a_manager)
+            del compiled_managers[self.number_of_compiled_managers :]
+        return a_manager
+
+    # --------------------------------------------------------------------------
+    def parse_args(self, args=None, namespace=None):
+        """this method hijacks the normal argparse Namespace generation,
+        shimming configmanners into the process. The return value will be a
+        configmanners DotDict rather than an argparse Namespace."""
+        configuration_manager = self._create_configuration_manager(args)
 
         # it is apparent a common idiom that commandline options may have
         # embedded '-' characters in them.  configmanners requires that option
@@ -571,11 +627,7 @@ class ArgumentParser(argparse.ArgumentParser):
         # code fragment, we fetch the final configuration from configmanners
         # using a Mapping that will translate keys with '-' into keys with
         # '_' instead.
-        conf = configuration_manager.get_config(
-            mapping_class=create_key_translating_dot_dict(
-                "HyphenUnderscoreDict", (("-", "_"),)
-            )
-        )
+        conf = configuration_manager.get_config(mapping_class=HyphenUnderscoreDict)
 
         # here is where we add the values given to "set_defaults" method
         # of argparse.
@@ -601,24 +653,8 @@ class ArgumentParser(argparse.ArgumentParser):
         """this method hijacks the normal argparse Namespace generation,
         shimming configmanners into the process. The return value will be a
         configmanners DotDict rather than an argparse Namespace."""
-        # load the config_manager within the scope of the method that uses it
-        # so that we avoid circular references in the outer scope
-        from configmanners.config_manager import ConfigurationManager
-
-        configuration_manager = ConfigurationManager(
-            definition_source=[self.get_required_config()],
-            values_source_list=self.value_source_list,
-            argv_source=args,
-            app_name=self.prog,
-            app_version=self.version,
-            app_description=self.description,
-            use_auto_help=False,
-        )
-        conf = configuration_manager.get_config(
-            mapping_class=create_key_translating_dot_dict(
-                "HyphenUnderscoreDict", (("-", "_"),)
-            )
-        )
+        configuration_manager = self._create_configuration_manager(args)
+        conf = configuration_manager.get_config(mapping_class=HyphenUnderscoreDict)
         return conf
 
     # --------------------------------------------------------------------------
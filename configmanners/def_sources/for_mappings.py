@@ -3,7 +3,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 
-import collections
+import collections.abc
 
 from configmanners.converters import str_dict_keys
 from configmanners.namespace import Namespace
@@ -15,7 +15,7 @@ from configmanners.option import (
 
 # ------------------------------------------------------------------------------
 def setup_definitions(source, destination):
-    for key, val in source.items():
+    for key, val in collections.abc.Mapping.items(source):
         if key.startswith("__"):
             continue  # ignore these
         if isinstance(val, Option):
@@ -2,7 +2,7 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-import collections
+import collections.abc
 import weakref
 from io import StringIO
 
@@ -49,6 +49,20 @@ def stylize_keys(a_mapping):
     return stylized_keys_dict
 
 
+# ------------------------------------------------------------------------------
+def _get_key_as_attribute(a_mapping, key):
+    """return the value of a key found through attribute lookup.  The methods
+    of a DotDict, like 'keys', are not keys: when there is no key by such a
+    name, it is looked for just like any other missing attribute."""
+    if (
+        isinstance(a_mapping, DotDict)
+        and key not in a_mapping.__dict__
+        and hasattr(type(a_mapping), key)
+    ):
+        return type(a_mapping).__getattr__(a_mapping, key)
+    return getattr(a_mapping, key)
+
+
 # ==============================================================================
 class DotDict(collections.abc.MutableMapping):
     """This class is a mapping that stores its items within the __dict__
@@ -93,26 +107,82 @@ class DotDict(collections.abc.MutableMapping):
     """
 
     # --------------------------------------------------------------------------
-    def __init__(self, initializer=None):
+    def __init__(self, initializer=None, lazy=False):
         """the constructor allows for initialization from another mapping.
 
         parameters:
             initializer - a mapping of keys and values to be added to this
-                          mapping."""
+                          mapping.
+            lazy - if True, the keys and values of the initializer are not
+                   copied until this DotDict is first used.  Nested mappings
+                   become lazy DotDicts too, so only the parts of a large
+                   mapping that are actually used get copied.  Until then,
+                   changes to the initializer show through."""
         self.__dict__["_key_order"] = OrderedSet()
+        # weak references to the DotDicts that hold this one as a value
+        self.__dict__["_containers"] = []
+        # the flat index maps full dotted keys of the form X.Y.Z to the value
+        # found at the end of that path
+        self.__dict__["_dotted_key_index"] = {}
+        # True when some containing DotDict has an entry in its flat index
+        # that passes through this DotDict
+        self.__dict__["_indexed_by_container"] = False
+        # the flattened results of keys_breadth_first keyed by the value of
+        # its include_dicts parameter
+        self.__dict__["_breadth_first_keys"] = {}
         if isinstance(initializer, collections.abc.Mapping):
-            for key, value in iteritems_breadth_first(initializer, include_dicts=True):
-                if isinstance(value, collections.abc.Mapping):
-                    self[key] = self.__class__(value)
-                else:
-                    self[key] = value
+            if lazy:
+                # without '_key_order', the first use of this DotDict ends up
+                # in '__getattr__', which copies in the initializer
+                del self.__dict__["_key_order"]
+                self.__dict__["_lazy_initializer"] = initializer
+            else:
+                self._copy_initializer(initializer, False)
         elif initializer is not None:
             raise TypeError("can only initialize with a Mapping")
 
+    # --------------------------------------------------------------------------
+    def _copy_initializer(self, initializer, lazy):
+        # each nested mapping copies itself, so only the top level keys are
+        # needed here
+        for key, value in initializer.items():
+            if not isinstance(value, collections.abc.Mapping):
+                self[key] = value
+            elif lazy:
+                self[key] = self.__class__(initializer=value, lazy=True)
+            else:
+                self[key] = self.__class__(initializer=value)
+
+    # --------------------------------------------------------------------------
+    def _finish_lazy_initialization(self):
+        """copy in the initializer of a lazy DotDict.  Returns False if there
+        was nothing left to do."""
+        try:
+            initializer = self.__dict__.pop("_lazy_initializer")
+        except KeyError:
+            return False
+        self.__dict__["_key_order"] = OrderedSet()
+        self._copy_initializer(initializer, True)
+        return True
+
     # --------------------------------------------------------------------------
     def __setattr__(self, key, value):
         """this function saves keys into the mapping's __dict__."""
-        self._key_order.add(key)
+        if key in self._key_order:
+            old_value = self.__dict__.get(key)
+            if old_value is not value:
+                # replacing a value may invalidate paths in the flat index
+                if isinstance(old_value, DotDict):
+                    old_value._remove_container(self)
+                    self._drop_breadth_first_keys()
+                elif isinstance(value, DotDict):
+                    self._drop_breadth_first_keys()
+                self._drop_dotted_key_index()
+        else:
+            self._key_order.add(key)
+            self._drop_breadth_first_keys()
+        if isinstance(value, DotDict):
+            value._add_container(self)
         self.__dict__[key] = value
 
     # --------------------------------------------------------------------------
@@ -127,10 +197,13 @@ class DotDict(collections.abc.MutableMapping):
         # raises an AttributeError instead of KeyError.
         if key.startswith("__") and key.endswith("__"):
             raise AttributeError(key)
+        if self._finish_lazy_initialization():
+            return getattr(self, key)
         raise KeyError(key)
 
     # --------------------------------------------------------------------------
     def __delattr__(self, key):
+        old_value = self.__dict__.get(key)
         try:
             self._key_order.discard(key)
         except ValueError:
@@ -138,18 +211,43 @@ class DotDict(collections.abc.MutableMapping):
             # the next line will catch the error if it still is one
             pass
         super(DotDict, self).__delattr__(key)
+        if isinstance(old_value, DotDict):
+            old_value._remove_container(self)
+        self._drop_breadth_first_keys()
+        self._drop_dotted_key_index()
 
     # --------------------------------------------------------------------------
     def __getitem__(self, key):
         """define the square bracket operator to refer to the object's __dict__
-        for fetching values.  It accepts keys in the form X.Y.Z"""
+        for fetching values.  It accepts keys in the form X.Y.Z
+
+        Dotted keys are remembered in a flat index, so that looking up the
+        same dotted key again is a single dict access.  A key without a dot
+        is found in the __dict__ just as directly, so it is not indexed."""
+        self_dict = self.__dict__
+        try:
+            if "." in key:
+                return self_dict["_dotted_key_index"][key]
+            return self_dict[key]
+        except (KeyError, TypeError):
+            # TypeError: not a string or an unhashable key, let the attribute
+            # lookup below deal with it
+            pass
         try:
             key_split = key.split(".")
         except AttributeError:
             key_split = [key]
+        if len(key_split) > 1:
+            try:
+                return self._index_dotted_key(key, key_split)
+            except KeyError:
+                # the path isn't made up entirely of real keys.  The
+                # attribute lookup below will either find the value or raise
+                # the appropriate error
+                pass
         current = self
         for k in key_split:
-            current = getattr(current, k)
+            current = _get_key_as_attribute(current, k)
         return current
 
     # --------------------------------------------------------------------------
@@ -199,21 +297,150 @@ class DotDict(collections.abc.MutableMapping):
         """makes the len function also ignore the '_' keys"""
         return len(self._key_order)
 
+    # --------------------------------------------------------------------------
+    def __getstate__(self):
+        """the flat index and the links to containing DotDicts are not part
+        of the state used by pickle and the copy module"""
+        self._finish_lazy_initialization()
+        state = self.__dict__.copy()
+        for a_name in (
+            "_containers",
+            "_dotted_key_index",
+            "_indexed_by_container",
+            "_breadth_first_keys",
+        ):
+            state.pop(a_name, None)
+        return state
+
+    # --------------------------------------------------------------------------
+    def __setstate__(self, state):
+        """rebuild an empty flat index and relink any nested DotDicts to this
+        new instance"""
+        self.__dict__.update(state)
+        self.__dict__["_containers"] = []
+        self.__dict__["_dotted_key_index"] = {}
+        self.__dict__["_indexed_by_container"] = False
+        self.__dict__["_breadth_first_keys"] = {}
+        for key in self._key_order:
+            value = self.__dict__.get(key)
+            if isinstance(value, DotDict):
+                value._add_container(self)
+
+    # --------------------------------------------------------------------------
+    def _index_dotted_key(self, key, key_split):
+        """walk the nested DotDicts along the components of a dotted key using
+        only the real keys at each level.  On success, the value is saved in
+        the flat index and returned.  If the path leaves the nested DotDicts or
+        a component is not a key, a KeyError is raised.
+
+        parameters:
+            key - the original dotted key
+            key_split - the original key split into its components
+        """
+        containers = []
+        current = self
+        for k in key_split:
+            if not isinstance(current, DotDict) or k not in current._key_order:
+                raise KeyError(key)
+            containers.append(current)
+            current = current.__dict__[k]
+        # the DotDicts along the path must tell this one if they change
+        for a_container in containers[1:]:
+            a_container.__dict__["_indexed_by_container"] = True
+        self.__dict__["_dotted_key_index"][key] = current
+        return current
+
+    # --------------------------------------------------------------------------
+    def _drop_dotted_key_index(self):
+        """a key has been replaced or deleted.  The flat index of this DotDict
+        and the flat index of any containing DotDict that passes through
+        this one may now be wrong.  Throw them away; they'll be rebuilt on
+        demand."""
+        self_dict = self.__dict__
+        if self_dict["_dotted_key_index"]:
+            self_dict["_dotted_key_index"] = {}
+        if self_dict["_indexed_by_container"]:
+            self_dict["_indexed_by_container"] = False
+            for a_container in self._live_containers():
+                a_container._drop_dotted_key_index()
+
+    # --------------------------------------------------------------------------
+    def _drop_breadth_first_keys(self):
+        """the set of keys has changed, so the saved results of
+        keys_breadth_first for this DotDict and for all the DotDicts that
+        contain it are wrong.  A DotDict that has nothing saved can stop the
+        climb: its containers can't have saved anything that includes it."""
+        if self.__dict__["_breadth_first_keys"]:
+            self.__dict__["_breadth_first_keys"] = {}
+            for a_container in self._live_containers():
+                a_container._drop_breadth_first_keys()
+
+    # --------------------------------------------------------------------------
+    def _add_container(self, a_container):
+        """record a weak reference to a DotDict that holds this one"""
+        live_references = []
+        for a_reference in self.__dict__["_containers"]:
+            a_live_container = a_reference()
+            if a_live_container is a_container:
+                return
+            if a_live_container is not None:
+                live_references.append(a_reference)
+        live_references.append(weakref.ref(a_container))
+        self.__dict__["_containers"] = live_references
+
+    # --------------------------------------------------------------------------
+    def _remove_container(self, a_container):
+        """forget a DotDict that no longer holds this one"""
+        self.__dict__["_containers"] = [
+            a_reference
+            for a_reference in self.__dict__["_containers"]
+            if a_reference() not in (None, a_container)
+        ]
+
+    # --------------------------------------------------------------------------
+    def _live_containers(self):
+        """a generator of the DotDicts that still hold this one"""
+        for a_reference in self.__dict__["_containers"]:
+            a_container = a_reference()
+            if a_container is not None:
+                yield a_container
+
     # --------------------------------------------------------------------------
     def keys_breadth_first(self, include_dicts=False):
-        """a generator that returns all the keys in a set of nested
-        DotDict instances.  The keys take the form X.Y.Z"""
+        """an iterator that returns all the keys in a set of nested
+        DotDict instances.  The keys take the form X.Y.Z
+
+        The flattened list of keys is saved and reused until a key is added
+        or deleted or a nested DotDict is replaced somewhere in the tree."""
+        breadth_first_keys = self.__dict__["_breadth_first_keys"]
+        try:
+            return iter(breadth_first_keys[include_dicts])
+        except KeyError:
+            pass
+        keys = []
         namespaces = []
         for key in self._key_order:
-            if isinstance(getattr(self, key), DotDict):
-                namespaces.append(key)
+            value = self._value_for_listing(key)
+            if isinstance(value, DotDict):
+                namespaces.append((key, value))
                 if include_dicts:
-                    yield key
+                    keys.append(key)
             else:
-                yield key
-        for a_namespace in namespaces:
-            for key in self[a_namespace].keys_breadth_first(include_dicts):
-                yield "%s.%s" % (a_namespace, key)
+                keys.append(key)
+        for a_namespace, value in namespaces:
+            keys.extend(
+                "%s.%s" % (a_namespace, key)
+                for key in value.keys_breadth_first(include_dicts)
+            )
+        breadth_first_keys[include_dicts] = keys
+        return iter(keys)
+
+    # --------------------------------------------------------------------------
+    def _value_for_listing(self, key):
+        """return the value of a key for the purposes of listing keys in
+        keys_breadth_first.  Derived classes that share nested DotDicts
+        may return a stand in with the same keys."""
+        return getattr(self, key)
 
     # --------------------------------------------------------------------------
     def assign(self, key, value):
@@ -252,6 +479,43 @@ class DotDict(collections.abc.MutableMapping):
         return out.getvalue().strip()
 
 
+# ==============================================================================
+class DottedKeySuffixIndex(object):
+    """an index of dotted keys of the form X.Y.Z stored as a tree of their
+    components in reverse order.  It answers the question "is 'Y.Z' (or 'Z')
+    the tail end of any of the indexed keys" in time proportional to the
+    number of components in the key being tested rather than the number of
+    keys in the index."""
+
+    # --------------------------------------------------------------------------
+    def __init__(self, keys=()):
+        """parameters:
+        keys - an iterable of dotted keys to put in the index"""
+        self._root = {}
+        for a_key in keys:
+            self.add(a_key)
+
+    # --------------------------------------------------------------------------
+    def add(self, key):
+        """put a dotted key into the index"""
+        node = self._root
+        for a_component in reversed(key.split(".")):
+            node = node.setdefault(a_component, {})
+
+    # --------------------------------------------------------------------------
+    def has_suffix(self, key):
+        """return True if the key is made up of the trailing components of
+        any key in the index: 'y.z' and 'z' are suffixes of 'x.y.z', while
+        'z' is not a suffix of 'x.yz'"""
+        node = self._root
+        for a_component in reversed(key.split(".")):
+            try:
+                node = node[a_component]
+            except KeyError:
+                return False
+        return True
+
+
 # ==============================================================================
 class DotDictWithAcquisition(DotDict):
     """This mapping, a derivative of DotDict, has special semantics when
@@ -304,18 +568,45 @@ class DotDictWithAcquisition(DotDict):
     Contrarily, the form d['x.y.z.a'] is a single lookup operation that reveals
     that our goal is to get a value for 'a'.  Since this class has acquisition,
     and 'a' is defined in the base, it is perfectly allowable.
+
+    Acquired keys are remembered: each DotDictWithAcquisition walked through
+    while searching for a key records which ancestor owns it, so the next
+    read of that key goes straight to the owner.  Adding or deleting a key
+    removes the records that it invalidates from the DotDicts below.
     """
 
+    # --------------------------------------------------------------------------
+    def __init__(self, initializer=None, lazy=False):
+        # maps acquired keys to the ancestor that owns them (a weakref proxy)
+        self.__dict__["_acquisition_cache"] = {}
+        # True when DotDicts directly below this one may have acquired keys
+        # through it
+        self.__dict__["_acquisition_cached_below"] = False
+        super(DotDictWithAcquisition, self).__init__(initializer, lazy)
+
     # --------------------------------------------------------------------------
     def __getitem__(self, key):
         """define the square bracket operator to refer to the object's __dict__
         for fetching values.  It accepts keys in the form 'x.y.z'"""
+        self_dict = self.__dict__
+        try:
+            if "." in key:
+                return self_dict["_dotted_key_index"][key]
+            return self_dict[key]
+        except KeyError:
+            pass
         key_split = key.split(".")
+        if len(key_split) > 1:
+            try:
+                return self._index_dotted_key(key, key_split)
+            except KeyError:
+                # not a path of real keys, it may yet be found by acquisition
+                pass
         last_index = len(key_split) - 1
         current = self
         for i, k in enumerate(key_split):
             try:
-                current = getattr(current, k)
+                current = _get_key_as_attribute(current, k)
             except KeyError:
                 if i == last_index:
                     raise
@@ -332,7 +623,21 @@ class DotDictWithAcquisition(DotDict):
         DotDict."""
         if isinstance(value, DotDict) and key != "_parent":
             value.__dict__["_parent"] = weakref.proxy(self)
+            if isinstance(value, DotDictWithAcquisition):
+                # with a new parent, anything acquired before is suspect
+                value._clear_acquisition_cache()
+        adding_a_key = key not in self._key_order
         super(DotDictWithAcquisition, self).__setattr__(key, value)
+        if adding_a_key:
+            # this key may now hide the same key further up
+            self.__dict__["_acquisition_cache"].pop(key, None)
+            self._forget_acquired(key)
+
+    # --------------------------------------------------------------------------
+    def __delattr__(self, key):
+        super(DotDictWithAcquisition, self).__delattr__(key)
+        # DotDicts below that acquired this key from here must look again
+        self._forget_acquired(key)
 
     # --------------------------------------------------------------------------
     def __getattr__(self, key):
@@ -341,19 +646,119 @@ class DotDictWithAcquisition(DotDict):
         parent class."""
         if key == "_parent":
             raise AttributeError("_parent")
+        if self._finish_lazy_initialization():
+            return getattr(self, key)
+        self_dict = self.__dict__
         try:
-            _parent = object.__getattribute__(self, "_parent")
-            return getattr(_parent, key)
-        except AttributeError:  # no parent attribute
-            # the copy.deepcopy function will try to probe this class for an
-            # instance of __deepcopy__.  If an AttributeError is raised, then
-            # copy.deepcopy goes on with out it.  However, this class raises
-            # a KeyError instead and copy.deepcopy can't handle it.  So we
-            # make sure that any missing attribute that begins with '__'
-            # raises an AttributeError instead of KeyError.
-            if key.startswith("__"):
-                raise
-            raise KeyError(key)
+            owner = self_dict["_acquisition_cache"][key]
+            return owner.__dict__[key]
+        except KeyError:
+            pass
+        # walk up through the parents to find the owner of the key
+        walked = []
+        a_node = self
+        while True:
+            try:
+                _parent = a_node.__dict__["_parent"]
+            except KeyError:  # no parent attribute
+                # the copy.deepcopy function will try to probe this class for
+                # an instance of __deepcopy__.  If an AttributeError is raised,
+                # then copy.deepcopy goes on with out it.  However, this class
+                # raises a KeyError instead and copy.deepcopy can't handle it.
+                # So we make sure that any missing attribute that begins with
+                # '__' raises an AttributeError instead of KeyError.
+                if key.startswith("__"):
+                    raise AttributeError(key)
+                raise KeyError(key)
+            walked.append(a_node)
+            if key in _parent.__dict__:
+                break
+            a_node = _parent
+        # everything walked through acquires this key from the same owner
+        for a_node in walked:
+            a_node_dict = a_node.__dict__
+            try:
+                a_node_dict["_acquisition_cache"][key] = _parent
+                a_node_dict["_parent"].__dict__["_acquisition_cached_below"] = True
+            except KeyError:
+                # not a DotDictWithAcquisition, it can't cache
+                pass
+        return _parent.__dict__[key]
+
+    # --------------------------------------------------------------------------
+    def _forget_acquired(self, key):
+        """the key has been added to or deleted from this DotDict.  DotDicts
+        below this one that acquired the key through here must find it
+        again."""
+        if not self.__dict__["_acquisition_cached_below"]:
+            return
+        for a_key in self._key_order:
+            value = self.__dict__.get(a_key)
+            if not isinstance(value, DotDictWithAcquisition):
+                continue
+            if value.__dict__["_acquisition_cache"].pop(key, None) is not None:
+                value._forget_acquired(key)
+
+    # --------------------------------------------------------------------------
+    def _clear_acquisition_cache(self):
+        """forget everything acquired by this DotDict and the DotDicts below
+        it"""
+        self_dict = self.__dict__
+        if self_dict["_acquisition_cache"]:
+            self_dict["_acquisition_cache"] = {}
+        if self_dict["_acquisition_cached_below"]:
+            self_dict["_acquisition_cached_below"] = False
+            for a_key in self._key_order:
+                value = self_dict.get(a_key)
+                if isinstance(value, DotDictWithAcquisition):
+                    value._clear_acquisition_cache()
+
+    # --------------------------------------------------------------------------
+    def __getstate__(self):
+        """the acquisition cache is not part of the state"""
+        state = super(DotDictWithAcquisition, self).__getstate__()
+        state.pop("_acquisition_cache", None)
+        state.pop("_acquisition_cached_below", None)
+        return state
+
+    # --------------------------------------------------------------------------
+    def __setstate__(self, state):
+        self.__dict__["_acquisition_cache"] = {}
+        self.__dict__["_acquisition_cached_below"] = False
+        super(DotDictWithAcquisition, self).__setstate__(state)
+
+
+# ------------------------------------------------------------------------------
+@memoize()
+def _accepts_lazy(mapping_class):
+    """True if the constructor of a mapping class takes the 'lazy' parameter
+    of DotDict.  A DotDict derivative that takes '**kwargs' is assumed to
+    pass them on to DotDict."""
+    # imported here, it is not needed to import configmanners
+    import inspect
+
+    try:
+        parameters = inspect.signature(mapping_class).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    for a_parameter in parameters:
+        if a_parameter.name == "lazy":
+            return True
+        if a_parameter.kind is a_parameter.VAR_KEYWORD and issubclass(
+            mapping_class, DotDict
+        ):
+            return True
+    return False
+
+
+# ------------------------------------------------------------------------------
+def create_with_object_hook(obj_hook, initializer):
+    """make a mapping of the class given as a value source object hook from
+    the initializer.  The copy is lazy if the class can do that, otherwise
+    the class is called with the initializer alone, as it always was."""
+    if obj_hook is DotDict or _accepts_lazy(obj_hook):
+        return obj_hook(initializer=initializer, lazy=True)
+    return obj_hook(initializer=initializer)
 
 
 # ------------------------------------------------------------------------------
@@ -372,6 +777,16 @@ def create_key_translating_dot_dict(
                              (original_substring, substitution_string)
         base_class - the baseclass on which this new class is to be based
     """
+
+    # --------------------------------------------------------------------------
+    @memoize()
+    def translate_key(key):
+        # the translation depends only on the key, so one cache serves every
+        # instance of the new class without holding on to any of them
+        for original, replacement in translation_tuples:
+            key = key.replace(original, replacement)
+        return key
+
     # ==========================================================================
     class DotDictWithKeyTranslations(base_class):
         def __init__(self, *args, **kwargs):
@@ -379,11 +794,8 @@ def create_key_translating_dot_dict(
             super(DotDictWithKeyTranslations, self).__init__(*args, **kwargs)
 
         # ----------------------------------------------------------------------
-        @memoize()
         def _translate_key(self, key):
-            for original, replacement in self._translation_tuples:
-                key = key.replace(original, replacement)
-            return key
+            return translate_key(key)
 
         # ----------------------------------------------------------------------
         def assign(self, key, value):
@@ -399,6 +811,8 @@ def create_key_translating_dot_dict(
 
         # ----------------------------------------------------------------------
         def __getattr__(self, key):
+            if self._finish_lazy_initialization():
+                return getattr(self, key)
             alt_key = self._translate_key(key)
             if alt_key == key:
                 return super(DotDictWithKeyTranslations, self).__getattr__(key)
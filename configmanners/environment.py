@@ -2,10 +2,288 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from os import environ
+import collections.abc
+import os
 
-from configmanners.dotdict import stylize_keys
+from configmanners.dotdict import (
+    DotDict,
+    DotDictWithAcquisition,
+    create_with_object_hook,
+)
 
-environment = stylize_keys(environ)
-environment["__identity"] = "environment"
-environment.always_ignore_mismatches = True
+
+# ------------------------------------------------------------------------------
+def stylize_key(name):
+    """return the configmanners key for an environment variable name.  This is
+    the rule used by 'configmanners.dotdict.stylize_keys': if the name is not
+    all uppercase, its doubled underscores stand for the '.' character."""
+    if "__" in name and name != name.upper():
+        return name.replace("__", ".")
+    return name
+
+
+# ==============================================================================
+class Environment(collections.abc.Mapping):
+    """a read only mapping of environment variables by their configmanners
+    keys.  The key 'resource.postgres.host' finds the variable named
+    'resource__postgres__host'.
+
+    Nothing is copied when an instance is created.  A lookup translates the
+    key into the few variable names that could hold its value and tries only
+    those.  The whole environment is read only to iterate over the keys, as
+    is done to check for mismatches.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, source=None, identity="environment", refresh=False):
+        """
+        parameters:
+            source - a mapping of variable names to values, os.environ if None
+            identity - the name of this value source
+            refresh - if True, the variables are read as they are at the time
+                      of each use, so changes to the source are seen.  If
+                      False, the variables are copied on first use and that
+                      copy is used until the 'refresh' method is called.
+        """
+        self._source = os.environ if source is None else source
+        self._refresh = refresh
+        self._snapshot = None
+        # the variables that the key index was made from, and the index
+        self._indexed = (None, None)
+        self._extras = {
+            "__identity": identity,
+            "always_ignore_mismatches": True,
+        }
+        self._acquiring = _AcquiringEnvironment(self)
+
+    # --------------------------------------------------------------------------
+    def refresh(self):
+        """forget the copy of the variables, the next use reads them again"""
+        self._snapshot = None
+
+    # --------------------------------------------------------------------------
+    def _variables(self):
+        if self._refresh:
+            return self._source
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = dict(self._source)
+        return snapshot
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _names_for(key):
+        """the names of the variables that could hold the value for a key"""
+        if "." in key:
+            a_name = key.replace(".", "__")
+            if a_name != a_name.upper():
+                yield a_name
+        if stylize_key(key) == key:
+            yield key
+
+    # --------------------------------------------------------------------------
+    def _key_index(self):
+        """return a dict of variable names by their configmanners keys.  It is
+        made again only if the variables have changed since the last time."""
+        variables = self._variables()
+        indexed_variables, index = self._indexed
+        if variables is indexed_variables:
+            # the copy of the variables made when not refreshing
+            return index
+        if self._refresh:
+            variables = dict(variables)
+        if variables != indexed_variables:
+            index = dict((stylize_key(a_name), a_name) for a_name in variables)
+            self._indexed = (variables, index)
+        return index
+
+    # --------------------------------------------------------------------------
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+        try:
+            return self._extras[key]
+        except KeyError:
+            pass
+        variables = self._variables()
+        for a_name in self._names_for(key):
+            try:
+                return variables[a_name]
+            except KeyError:
+                pass
+        raise KeyError(key)
+
+    # --------------------------------------------------------------------------
+    def __iter__(self):
+        keys = list(self._extras)
+        keys.extend(key for key in self._key_index() if key not in self._extras)
+        return iter(keys)
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        # two variables may have the same key, like 'a__b' and 'a.b', so
+        # they are counted from the key index, just as they are iterated
+        return len(set(self._key_index()).union(self._extras))
+
+    # --------------------------------------------------------------------------
+    def values_for(self, obj_hook=DotDict):
+        """return the values in the form that a value source gives them to the
+        ConfigurationManager.  For DotDict and DotDictWithAcquisition that is a
+        mapping that finds the variables as they are asked for.  Any other
+        class is built from all of the variables."""
+        if obj_hook is DotDict:
+            return self
+        if obj_hook is DotDictWithAcquisition:
+            return self._acquiring
+        return create_with_object_hook(obj_hook, self)
+
+
+# ==============================================================================
+class _AcquiringEnvironment(collections.abc.Mapping):
+    """an Environment with the lookups of a DotDictWithAcquisition.  The keys
+    of the variables are treated as a tree of namespaces: the variable
+    'a__b__c' makes the namespaces 'a' and 'a.b'.  The key 'a.b.c' is looked
+    up one part at a time, each part in the namespace reached so far or in
+    the nearest enclosing namespace that has it.  So if 'a' has no 'b', the
+    value of 'b.c' is found, or if there is no 'b' at all, that of 'a.c' or
+    'c'.  Only a dotted key that is not found as it is needs the namespaces,
+    which are found from the key index of the Environment."""
+
+    # --------------------------------------------------------------------------
+    def __init__(self, environment):
+        self._environment = environment
+        # the key index that the namespaces were found in, and the namespaces
+        self._namespaces_for = (None, None)
+
+    # --------------------------------------------------------------------------
+    def _namespaces(self):
+        """return the key index of the environment and the set of the keys of
+        the namespaces that the variables make.  The set is found again only
+        if the key index has changed."""
+        index = self._environment._key_index()
+        indexed, namespaces = self._namespaces_for
+        if index is not indexed:
+            namespaces = set()
+            for key in index:
+                parts = key.split(".")
+                for i in range(1, len(parts)):
+                    namespaces.add(".".join(parts[:i]))
+            self._namespaces_for = (index, namespaces)
+        return index, namespaces
+
+    # --------------------------------------------------------------------------
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+        try:
+            return self._environment[key]
+        except KeyError:
+            if "." not in key:
+                raise
+        index, namespaces = self._namespaces()
+        parts = key.split(".")
+        name = parts.pop()
+        # the namespace reached so far.  A part that isn't found here or
+        # above is passed over, as DotDictWithAcquisition does
+        path = []
+        for a_part in parts:
+            for depth in range(len(path), -1, -1):
+                candidate = path[:depth] + [a_part]
+                candidate_key = ".".join(candidate)
+                if candidate_key in namespaces:
+                    path = candidate
+                    break
+                if candidate_key in index:
+                    # a value, it has nothing within it
+                    raise KeyError(key)
+        for depth in range(len(path), -1, -1):
+            candidate_key = ".".join(path[:depth] + [name])
+            try:
+                return self._environment[candidate_key]
+            except KeyError:
+                if candidate_key in namespaces:
+                    # a namespace, not a value
+                    break
+        raise KeyError(key)
+
+    # --------------------------------------------------------------------------
+    def __iter__(self):
+        return iter(self._environment)
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._environment)
+
+
+# ==============================================================================
+class PrefixedEnvironment(Environment):
+    """a read only mapping of only the environment variables whose names
+    start with a prefix and a doubled underscore, like 'MYAPP__'.  The prefix
+    is dropped to make the configmanners key: 'MYAPP__resources__port' is
+    the key 'resources.port'.
+
+    The matching variables are found in one pass over the environment the
+    first time they are needed.  That index is used from then on, until the
+    'refresh' method is called.
+
+    Because only the variables with the prefix are seen, the mismatch check
+    can be used: with 'strict' set, a variable with the prefix that is not
+    the name of an option is an error, just as an unknown key in a config
+    file is.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, prefix, source=None, identity=None, strict=True):
+        """
+        parameters:
+            prefix - the start of the names of the variables to use.  The
+                     doubled underscore that follows it may be left off
+            source - a mapping of variable names to values, os.environ if None
+            identity - the name of this value source, by default from the
+                       prefix
+            strict - if False, this value source is left out of the mismatch
+                     check, as the whole environment is
+        """
+        prefix = prefix if prefix.endswith("__") else prefix + "__"
+        if identity is None:
+            identity = "environment %s*" % prefix
+        super(PrefixedEnvironment, self).__init__(source, identity)
+        self.prefix = prefix
+        if strict:
+            del self._extras["always_ignore_mismatches"]
+        self._prefixed = None
+
+    # --------------------------------------------------------------------------
+    def refresh(self):
+        """forget the index, the next use finds the variables again"""
+        self._prefixed = None
+
+    # --------------------------------------------------------------------------
+    def _key_index(self):
+        """return a dict of the values of the variables with the prefix by
+        their configmanners keys"""
+        index = self._prefixed
+        if index is None:
+            index = {}
+            start = len(self.prefix)
+            for a_name, value in self._source.items():
+                if a_name.startswith(self.prefix) and len(a_name) > start:
+                    index[stylize_key(a_name[start:])] = value
+            self._prefixed = index
+        return index
+
+    # --------------------------------------------------------------------------
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+        try:
+            return self._extras[key]
+        except KeyError:
+            return self._key_index()[key]
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return len(set(self._key_index()).union(self._extras))
+
+
+environment = Environment()
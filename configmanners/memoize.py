@@ -2,42 +2,219 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import collections
+import threading
+import time
 from functools import wraps
 
 
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "maxsize", "currsize", "expired"]
+)
+
+
+# ==============================================================================
+class LRUCache(object):
+    """a thread safe, least recently used cache.  When the cache is full, the
+    entry used longest ago is dropped to make room.  A lock guards all
+    changes to the cache."""
+
+    # --------------------------------------------------------------------------
+    def __init__(self, max_size=1000, ttl=None):
+        """
+        parameters:
+            max_size - the number of entries the cache can hold, None for no
+                       limit
+            ttl - if not None, the number of seconds an entry stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+
+    # --------------------------------------------------------------------------
+    def get(self, key, is_valid=None):
+        """return the value saved for the key.  A KeyError is raised if there
+        is none, a TypeError if the key can't be hashed.
+
+        parameters:
+            key - the key
+            is_valid - if not None, a function that takes the value and
+                       returns False if it is out of date.  Such an entry is
+                       dropped and counted as expired.
+        """
+        with self._lock:
+            expires, value = self._entries[key]
+            if (expires is None or expires > time.monotonic()) and (
+                is_valid is None or is_valid(value)
+            ):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            del self._entries[key]
+            self._expired += 1
+        raise KeyError(key)
+
+    # --------------------------------------------------------------------------
+    def put(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._misses += 1
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    # --------------------------------------------------------------------------
+    def discard(self, key):
+        """drop the entry for the key, if there is one"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    # --------------------------------------------------------------------------
+    def info(self):
+        """return a CacheInfo namedtuple of the counts of hits, misses, the
+        maximum size, the current size and the number of entries dropped
+        because they expired"""
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self.max_size,
+                len(self._entries),
+                self._expired,
+            )
+
+    # --------------------------------------------------------------------------
+    def clear(self):
+        """empty the cache and reset the counts"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._expired = 0
+
+    # --------------------------------------------------------------------------
+    def __iter__(self):
+        """the keys from the least to the most recently used"""
+        with self._lock:
+            return iter(list(self._entries))
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._entries)
+
+
+# ------------------------------------------------------------------------------
+def _cache_key(args, kwargs):
+    if kwargs:
+        return (args, tuple(kwargs.items()))
+    return args
+
+
 # ------------------------------------------------------------------------------
-def memoize(max_cache_size=1000):
-    """Python 2.4 compatible memoize decorator.
-    It creates a cache that has a maximum size.  If the cache exceeds the max,
-    it is thrown out and a new one made.  With such behavior, it is wise to set
-    the cache just a little larger that the maximum expected need.
+def memoize(max_cache_size=1000, ttl=None):
+    """a memoize decorator with a least recently used cache.  It is safe to
+    use from several threads.  The lock is not held while the decorated
+    function runs, so two threads that miss on the same arguments at the
+    same time may both call it.
+
+    Calls with arguments that cannot be hashed are passed straight through
+    to the decorated function.
+
+    The cache is shared by all callers and holds strong references to the
+    arguments.  To cache a method without keeping its instances alive, use
+    'memoize_method' instead.
+
+    The decorated function gains two methods:
+        cache_info() - returns a CacheInfo namedtuple of the counts of hits,
+                       misses, the maximum size, the current size and the
+                       number of entries dropped because they expired
+        cache_clear() - empties the cache and resets the counts
 
     Parameters:
-      max_cache_size - the size to which a cache can grow
+      max_cache_size - the number of entries the cache can hold, None for no
+                       limit
+      ttl - if not None, the number of seconds an entry stays valid
     """
 
     def wrapper(f):
+        cache = LRUCache(max_cache_size, ttl)
+
         @wraps(f)
         def fn(*args, **kwargs):
-            if kwargs:
-                key = (args, tuple(kwargs.items()))
-            else:
-                key = args
+            key = _cache_key(args, kwargs)
             try:
-                return fn.cache[key]
+                return cache.get(key)
             except KeyError:
-                if fn.count >= max_cache_size:
-                    fn.cache = {}
-                    fn.count = 0
-                result = f(*args, **kwargs)
-                fn.cache[key] = result
-                fn.count += 1
-                return result
+                pass
             except TypeError:
+                # unhashable arguments can't be cached
                 return f(*args, **kwargs)
+            result = f(*args, **kwargs)
+            cache.put(key, result)
+            return result
+
+        fn.cache = cache
+        fn.cache_info = cache.info
+        fn.cache_clear = cache.clear
+        return fn
+
+    return wrapper
+
+
+# ------------------------------------------------------------------------------
+def memoize_method(max_cache_size=1000, ttl=None):
+    """a memoize decorator for methods that keeps a separate least recently
+    used cache in each instance.  The instance is not part of the cache keys,
+    and the cache is dropped along with the instance.  Nothing at the module
+    level refers to the instance or the arguments, so neither is kept alive
+    by the cache.  The instance must have a '__dict__'.
+
+    The decorated method gains two functions that take an instance:
+        cache_info(instance) - the CacheInfo for that instance's cache
+        cache_clear(instance) - empties that instance's cache
+
+    Parameters:
+      max_cache_size - the number of entries each cache can hold, None for
+                       no limit
+      ttl - if not None, the number of seconds an entry stays valid
+    """
+
+    def wrapper(f):
+        cache_name = "_memoized_%s" % f.__name__
+
+        # ----------------------------------------------------------------------
+        def cache_for(an_instance):
+            instance_dict = an_instance.__dict__
+            try:
+                return instance_dict[cache_name]
+            except KeyError:
+                # two threads may race to create the cache, setdefault makes
+                # them both use the same one
+                return instance_dict.setdefault(
+                    cache_name, LRUCache(max_cache_size, ttl)
+                )
+
+        @wraps(f)
+        def fn(self, *args, **kwargs):
+            cache = cache_for(self)
+            key = _cache_key(args, kwargs)
+            try:
+                return cache.get(key)
+            except KeyError:
+                pass
+            except TypeError:
+                # unhashable arguments can't be cached
+                return f(self, *args, **kwargs)
+            result = f(self, *args, **kwargs)
+            cache.put(key, result)
+            return result
 
-        fn.cache = {}
-        fn.count = 0
+        fn.cache_info = lambda an_instance: cache_for(an_instance).info()
+        fn.cache_clear = lambda an_instance: cache_for(an_instance).clear()
         return fn
 
     return wrapper
@@ -18,6 +18,7 @@ class Namespace(DotDict):
 
     # --------------------------------------------------------------------------
     def __setattr__(self, name, value):
+        self._unshare(name)
         if isinstance(value, (Option, Namespace, Aggregation)):
             # then they know what they're doing already
             o = value
@@ -25,6 +26,50 @@ class Namespace(DotDict):
             o = Option(name=name, default=value, value=value)
         super(Namespace, self).__setattr__(name, o)
 
+    # --------------------------------------------------------------------------
+    def __delattr__(self, name):
+        self._unshare(name)
+        super(Namespace, self).__delattr__(name)
+
+    # --------------------------------------------------------------------------
+    def __getattr__(self, name):
+        """a nested Namespace still shared with the original of a copy on
+        write copy is copied on first use"""
+        if name in self.__dict__.get("_shared_namespaces", ()):
+            return self._unshare(name)
+        return super(Namespace, self).__getattr__(name)
+
+    # --------------------------------------------------------------------------
+    def __getstate__(self):
+        for name in list(self.__dict__.get("_shared_namespaces", ())):
+            self._unshare(name)
+        return super(Namespace, self).__getstate__()
+
+    # --------------------------------------------------------------------------
+    def _unshare(self, name):
+        """if the named key is a Namespace shared with the original of a copy
+        on write copy, give this Namespace its own copy of it"""
+        shared_namespaces = self.__dict__.get("_shared_namespaces")
+        if not shared_namespaces or name not in shared_namespaces:
+            return None
+        a_copy = shared_namespaces.pop(name).safe_copy(copy_on_write=True)
+        self.__dict__[name] = a_copy
+        a_copy._add_container(self)
+        # a saved listing of this Namespace was made through the shared one.
+        # The copy has nothing saved, so a change to it would stop climbing
+        # before reaching this Namespace: drop the listing now instead.
+        self._drop_breadth_first_keys()
+        return a_copy
+
+    # --------------------------------------------------------------------------
+    def _value_for_listing(self, key):
+        # a shared Namespace has the same keys as the copy that would replace
+        # it, there is no need to make that copy just to list them
+        try:
+            return self.__dict__["_shared_namespaces"][key]
+        except KeyError:
+            return super(Namespace, self)._value_for_listing(key)
+
     # --------------------------------------------------------------------------
     def add_option(self, name, *args, **kwargs):
         """add an option to the namespace.   This can take two forms:
@@ -80,11 +125,33 @@ class Namespace(DotDict):
             candidate.set_value(value)
 
     # --------------------------------------------------------------------------
-    def safe_copy(self, reference_value_from=None):
+    def safe_copy(self, reference_value_from=None, copy_on_write=False):
+        """return a copy of this Namespace with copies of its Options.
+
+        parameters:
+            reference_value_from - a reference_value_from to give to the
+                                   copied Options at the top level that
+                                   don't already have one
+            copy_on_write - if True, the copy shares the Options and nested
+                            Namespaces of this one.  A nested Namespace is
+                            copied when it is first used through the copy,
+                            so changes to the structure of the copy don't
+                            affect the original.  The Options themselves
+                            remain shared: replace an Option in the copy
+                            (with a copy of it, perhaps) rather than change
+                            it.  Since parts of the copy that have not been
+                            used are still shared, changes made to the
+                            original after copying may show through.
+        """
+        if copy_on_write:
+            return self._copy_on_write(reference_value_from)
         new_namespace = Namespace()
         if self._reference_value_from:
             new_namespace.ref_value_namespace()
-        for key, opt in self.items():
+        for key in self:
+            # a Namespace still shared with the original of a copy on write
+            # copy is about to be copied anyway, it needn't be unshared first
+            opt = self._value_for_listing(key)
             if isinstance(opt, Option):
                 new_namespace[key] = opt.copy()
                 # assign a new reference_value if one has not been defined
@@ -96,6 +163,37 @@ class Namespace(DotDict):
                 new_namespace[key] = opt.safe_copy()
         return new_namespace
 
+    # --------------------------------------------------------------------------
+    def _copy_on_write(self, reference_value_from):
+        new_namespace = Namespace()
+        if self._reference_value_from:
+            new_namespace.ref_value_namespace()
+        new_dict = new_namespace.__dict__
+        self_dict = self.__dict__
+        shared_namespaces = {}
+        for key in self._key_order:
+            # take the values without copying anything still shared by this
+            # Namespace, if it is a copy on write copy itself
+            try:
+                opt = self_dict[key]
+            except KeyError:
+                opt = self_dict["_shared_namespaces"][key]
+            if isinstance(opt, Option):
+                if reference_value_from and not opt.reference_value_from:
+                    # the Option must be changed, so it can't be shared
+                    opt = opt.copy()
+                    opt.reference_value_from = reference_value_from
+                new_dict[key] = opt
+            elif isinstance(opt, Aggregation):
+                new_dict[key] = Aggregation(opt.name, opt.function)
+            elif isinstance(opt, Namespace):
+                shared_namespaces[key] = opt
+            else:
+                continue
+            new_namespace._key_order.add(key)
+        new_dict["_shared_namespaces"] = shared_namespaces
+        return new_namespace
+
     # --------------------------------------------------------------------------
     def ref_value_namespace(self):
         """tag this namespace as having been created by the referenced value
@@ -3,7 +3,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 
-import collections
+import collections.abc
 
 from configmanners.converters import (
     str_to_python_object,
@@ -13,6 +13,27 @@ from configmanners.converters import (
 from configmanners.config_exceptions import CannotConvertError, OptionError
 
 
+# the attributes that Option.copy carries over to the new Option
+_copied_attributes = (
+    "name",
+    "short_form",
+    "default",
+    "doc",
+    "from_string_converter",
+    "to_string_converter",
+    "value",
+    "is_argument",
+    "exclude_from_print_conf",
+    "exclude_from_dump_conf",
+    "likely_to_be_changed",
+    "not_for_definition",
+    "reference_value_from",
+    "secret",
+    "has_changed",
+    "foreign_data",
+)
+
+
 # ==============================================================================
 class Option(object):
     # --------------------------------------------------------------------------
@@ -174,25 +195,24 @@ class Option(object):
 
     # --------------------------------------------------------------------------
     def copy(self):
-        """return a copy"""
-        o = Option(
-            name=self.name,
-            default=self.default,
-            doc=self.doc,
-            from_string_converter=self.from_string_converter,
-            to_string_converter=self.to_string_converter,
-            value=self.value,
-            short_form=self.short_form,
-            exclude_from_print_conf=self.exclude_from_print_conf,
-            exclude_from_dump_conf=self.exclude_from_dump_conf,
-            is_argument=self.is_argument,
-            likely_to_be_changed=self.likely_to_be_changed,
-            not_for_definition=self.not_for_definition,
-            reference_value_from=self.reference_value_from,
-            secret=self.secret,
-            has_changed=self.has_changed,
-            foreign_data=self.foreign_data,
-        )
+        """return a copy.  The result is the same as passing all of this
+        Option's attributes, except 'sourced_from', to the constructor, but
+        it is made without the cost of running the constructor."""
+        o = Option.__new__(Option)
+        o_dict = o.__dict__
+        for an_attribute in _copied_attributes:
+            o_dict[an_attribute] = getattr(self, an_attribute)
+        # the constructor's normalizations, in case these attributes were
+        # changed after this Option was made
+        if isinstance(o.doc, (bytes, str)):
+            o.doc = to_str(o.doc).strip()
+        if o.from_string_converter is None and o.default is not None:
+            o.from_string_converter = o._deduce_converter(o.default)
+        if isinstance(o.from_string_converter, (bytes, str)):
+            o.from_string_converter = str_to_python_object(o.from_string_converter)
+        if o.value is None:
+            o.value = o.default
+        o.sourced_from = "default value"
         return o
 
 
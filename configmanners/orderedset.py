@@ -20,7 +20,7 @@
 # SOFTWARE.
 
 
-import collections
+import collections.abc
 
 
 class OrderedSet(collections.abc.MutableSet):
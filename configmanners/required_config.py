@@ -2,21 +2,70 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import weakref
+
 from configmanners.namespace import Namespace
 
+# the merged requirements of each class that has been asked for them.  The
+# values are tuples: the signature of what was merged and the merged Namespace
+_merged_required_configs = weakref.WeakKeyDictionary()
+
+
+# ------------------------------------------------------------------------------
+def _required_config_signature(cls):
+    """return a list of tuples, one for each 'required_config' in the MRO in
+    the order that they are merged: the 'required_config' and a tuple of the
+    values at its top level."""
+    signature = []
+    for a_class in reversed(cls.__mro__):
+        try:
+            a_required_config = a_class.required_config
+        except AttributeError:
+            continue
+        signature.append((a_required_config, tuple(a_required_config.values())))
+    return signature
+
+
+# ------------------------------------------------------------------------------
+def _same_signature(signature, other_signature):
+    """two signatures are the same if they are made of the same objects"""
+    if len(signature) != len(other_signature):
+        return False
+    for (a_required_config, values), (other_required_config, other_values) in zip(
+        signature, other_signature
+    ):
+        if a_required_config is not other_required_config or len(values) != len(
+            other_values
+        ):
+            return False
+        if any(x is not y for x, y in zip(values, other_values)):
+            return False
+    return True
+
 
 # ==============================================================================
 class RequiredConfig(object):
     # --------------------------------------------------------------------------
     @classmethod
     def get_required_config(cls):
-        result = Namespace()
-        for a_class in reversed(cls.__mro__):
-            try:
-                result.update(a_class.required_config)
-            except AttributeError:
-                pass
-        return result
+        """return the 'required_config' of this class merged with that of the
+        classes that it derives from.  The merge is cached for each class.
+        It is done again if the 'required_config' of any class in the MRO is
+        replaced or has a key at its top level added, replaced or removed.
+        The Namespace returned is a copy on write copy of the cached one, so
+        adding to it or removing from it leaves the cache alone.  As before,
+        the Options within it are the ones in the classes."""
+        signature = _required_config_signature(cls)
+        try:
+            cached_signature, result = _merged_required_configs[cls]
+            if not _same_signature(cached_signature, signature):
+                raise KeyError(cls)
+        except KeyError:
+            result = Namespace()
+            for a_required_config, values in signature:
+                result.update(a_required_config)
+            _merged_required_configs[cls] = (signature, result)
+        return result.safe_copy(copy_on_write=True)
 
     # --------------------------------------------------------------------------
     def config_assert(self, config):
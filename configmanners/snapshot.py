@@ -0,0 +1,257 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""an immutable, compiled form of a configuration.
+
+A DotDictWithAcquisition resolves every read through '__getattr__' and, when
+acquisition is needed, by walking up a chain of weakref proxies.  A snapshot
+does that work once, ahead of time.  Each namespace in the configuration gets
+its own generated class.  The namespace's own values live in '__slots__', so
+reading them is a plain slot load.  Values that would be acquired from
+enclosing namespaces are class attributes on a chain of base classes that
+parallels the nesting of the namespaces, so Python's own attribute lookup does
+the acquisition.
+
+Keys that name something the snapshot classes already have, like 'keys',
+'items', 'get' or '_own_keys', can't be attributes.  Their values are kept
+apart and are only found through item access: 'snapshot["keys"]' is the
+value while 'snapshot.keys' remains the method.
+
+Snapshots cannot be changed after they are made, which makes them safe to
+share between threads.  They are hashable if all the values within them are
+hashable."""
+
+import collections.abc
+import keyword
+
+
+# ==============================================================================
+class FrozenNamespace(collections.abc.Mapping):
+    """the base class of all the generated snapshot classes.  Iteration and
+    len see only the keys that belong to the namespace itself, while item and
+    attribute access also see the values acquired from enclosing namespaces,
+    just as they would with a DotDictWithAcquisition."""
+
+    # the cached hash value
+    __slots__ = ("_hash",)
+
+    # the keys of the namespace in their original order, each generated class
+    # sets its own
+    _own_keys = ()
+    # each generated class has its own cache of the results of item lookups
+    _lookups = {}
+    # the values of the keys that can't be attributes, both the namespace's
+    # own and those acquired from enclosing namespaces
+    _reserved_values = {}
+
+    # --------------------------------------------------------------------------
+    def __getitem__(self, key):
+        """accepts keys in the form X.Y.Z.  Since nothing can change, each
+        successful lookup is saved for next time."""
+        lookups = type(self)._lookups
+        try:
+            return lookups[key]
+        except KeyError:
+            pass
+        current = self
+        try:
+            for a_key in key.split("."):
+                if isinstance(current, FrozenNamespace):
+                    current = current._get(a_key)
+                else:
+                    current = getattr(current, a_key)
+        except AttributeError:
+            raise KeyError(key)
+        lookups[key] = current
+        return current
+
+    # --------------------------------------------------------------------------
+    def __iter__(self):
+        return iter(type(self)._own_keys)
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return len(type(self)._own_keys)
+
+    # --------------------------------------------------------------------------
+    def _get(self, key):
+        """the value of a single key of this namespace or one acquired from
+        an enclosing namespace.  An AttributeError is raised if there is
+        none."""
+        if _is_reserved(key):
+            try:
+                return type(self)._reserved_values[key]
+            except KeyError:
+                raise AttributeError(key)
+        return getattr(self, key)
+
+    # --------------------------------------------------------------------------
+    def _own_values(self):
+        return tuple(self._get(key) for key in type(self)._own_keys)
+
+    # --------------------------------------------------------------------------
+    def __eq__(self, other):
+        if isinstance(other, FrozenNamespace):
+            return type(self)._own_keys == type(other)._own_keys and (
+                self._own_values() == other._own_values()
+            )
+        if isinstance(other, collections.abc.Mapping):
+            return dict(zip(type(self)._own_keys, self._own_values())) == {
+                key: other[key] for key in other
+            }
+        return NotImplemented
+
+    # --------------------------------------------------------------------------
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    # --------------------------------------------------------------------------
+    def __hash__(self):
+        """the hash is computed on first use and then saved.  A TypeError is
+        raised if any value in the namespace or below is unhashable."""
+        try:
+            return object.__getattribute__(self, "_hash")
+        except AttributeError:
+            a_hash = hash((type(self)._own_keys, self._own_values()))
+            object.__setattr__(self, "_hash", a_hash)
+            return a_hash
+
+    # --------------------------------------------------------------------------
+    def __setattr__(self, key, value):
+        raise TypeError("a configuration snapshot cannot be changed")
+
+    # --------------------------------------------------------------------------
+    def __delattr__(self, key):
+        raise TypeError("a configuration snapshot cannot be changed")
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return "%s(%s)" % (
+            type(self).__name__,
+            ", ".join(
+                "%s=%r" % (key, value)
+                for key, value in zip(type(self)._own_keys, self._own_values())
+            ),
+        )
+
+    # --------------------------------------------------------------------------
+    def __reduce__(self):
+        # the generated classes can't be found by name, so neither pickle nor
+        # the copy module can recreate them.  Since snapshots are immutable,
+        # copies aren't needed
+        raise TypeError("a configuration snapshot cannot be pickled")
+
+    # --------------------------------------------------------------------------
+    def __copy__(self):
+        return self
+
+    # --------------------------------------------------------------------------
+    def __deepcopy__(self, memo):
+        return self
+
+
+# ==============================================================================
+class _AcquiredValues(object):
+    """the root of the chain of classes that hold the values available for
+    acquisition by nested namespaces"""
+
+    __slots__ = ()
+
+
+# the names used by the snapshot classes themselves
+_reserved_names = frozenset(dir(FrozenNamespace))
+
+
+# ------------------------------------------------------------------------------
+def _is_reserved(key):
+    """True if the key can't be an attribute of a snapshot because the
+    snapshot classes use the name themselves"""
+    return key in _reserved_names or (key.startswith("__") and key.endswith("__"))
+
+
+# ------------------------------------------------------------------------------
+def _can_be_a_slot(key):
+    return (
+        key.isidentifier()
+        and not keyword.iskeyword(key)
+        and not key.startswith("__")
+    )
+
+
+# ------------------------------------------------------------------------------
+def freeze(a_mapping, class_name="Snapshot"):
+    """create an immutable snapshot from a mapping.  Nested mappings become
+    nested snapshots.  Values are not copied.
+
+    parameters:
+        a_mapping - any mapping, typically the result of the 'get_config'
+                    method of a ConfigurationManager.  Its own keys are used,
+                    nothing that it would only find by acquisition.
+        class_name - the name given to the generated class of the top level
+                     snapshot; nested snapshots have the names of their keys
+                     appended to it
+    """
+    return _freeze(a_mapping, class_name, _AcquiredValues, {})
+
+
+# ------------------------------------------------------------------------------
+def _freeze(a_mapping, class_name, acquired_base, acquired_reserved_values):
+    # not 'keys()', a mapping may have a key called 'keys'
+    own_keys = tuple(a_mapping)
+    # the values of the reserved keys, as seen from this namespace and the
+    # namespaces nested within it
+    reserved_values = dict(acquired_reserved_values)
+
+    # the values of this namespace, as seen from namespaces nested within it
+    acquired_values = type(
+        "%sAcquired" % class_name,
+        (acquired_base,),
+        {"__slots__": (), "__module__": __name__},
+    )
+    values = []
+    for key in own_keys:
+        value = a_mapping[key]
+        if _is_reserved(key):
+            reserved_values[key] = value
+        values.append(value)
+    for index, (key, value) in enumerate(zip(own_keys, values)):
+        if isinstance(value, collections.abc.Mapping):
+            value = values[index] = _freeze(
+                value,
+                "%s_%s" % (class_name, key),
+                acquired_values,
+                reserved_values,
+            )
+            if _is_reserved(key):
+                reserved_values[key] = value
+        if not _is_reserved(key):
+            setattr(acquired_values, key, value)
+
+    # keys that cannot be slots, like those that are not python identifiers,
+    # become attributes of the generated class.  There is only ever one
+    # instance of each generated class, so that is just as good.  Reserved
+    # keys are neither, they are only in '_reserved_values'.
+    class_attributes = {
+        key: value
+        for key, value in zip(own_keys, values)
+        if not _is_reserved(key) and not _can_be_a_slot(key)
+    }
+    class_attributes["__slots__"] = tuple(
+        key for key in own_keys if not _is_reserved(key) and _can_be_a_slot(key)
+    )
+    class_attributes["_own_keys"] = own_keys
+    class_attributes["_lookups"] = {}
+    class_attributes["_reserved_values"] = reserved_values
+    class_attributes["__module__"] = __name__
+    snapshot_class = type(
+        class_name, (FrozenNamespace, acquired_base), class_attributes
+    )
+    snapshot = snapshot_class.__new__(snapshot_class)
+    for key, value in zip(own_keys, values):
+        if key in snapshot_class.__slots__:
+            object.__setattr__(snapshot, key, value)
+    return snapshot
@@ -2,10 +2,12 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import gc
 import sys
 import os
 import os.path
 import unittest
+import weakref
 from contextlib import contextmanager
 import io
 import getopt
@@ -602,6 +604,25 @@ c.string =   from ini
             c.option_definitions.c.a.sourced_from, "reference_value - 'xxx.yyy.a'"
         )
 
+    # --------------------------------------------------------------------------
+    def test_overlay_reference_value_from_existing_options(self):
+        """reference values may refer to ordinary Options, even ones that are
+        themselves reference values, forming a chain"""
+        n = config_manager.Namespace()
+        for link in range(4):
+            n.namespace("r%d" % link)
+            if link:
+                n["r%d" % link].add_option(
+                    "a", default=0, reference_value_from="r%d" % (link - 1)
+                )
+            else:
+                n["r%d" % link].add_option("a", default=0)
+        c = config_manager.ConfigurationManager(
+            [n], [{"r0": {"a": "42"}}], use_admin_controls=False, argv_source=[]
+        )
+        for link in range(4):
+            self.assertEqual(c.option_definitions["r%d.a" % link].value, 42)
+
     # --------------------------------------------------------------------------
     def test_overlay_config_12(self):
         """test overlay dict w/deep source dict and reference value links
@@ -1013,6 +1034,57 @@ c.string =   from ini
 
         self.assertRaises(AssertionError, c.config_assert, ({},))
 
+    # --------------------------------------------------------------------------
+    def test_RequiredConfig_get_required_config_is_cached(self):
+        class Base(config_manager.RequiredConfig):
+            required_config = config_manager.Namespace()
+            required_config.add_option("host", "localhost")
+            required_config.namespace("db")
+            required_config.db.add_option("port", 5432)
+
+        class Derived(Base):
+            required_config = config_manager.Namespace()
+            required_config.add_option("user", "fred")
+
+        first = Derived.get_required_config()
+        second = Derived.get_required_config()
+        self.assertTrue(first is not second)
+        self.assertTrue(first.host is second.host)
+        self.assertEqual(list(first.keys_breadth_first()), ["host", "user", "db.port"])
+
+        # changing the structure of what was handed out changes nothing else
+        first.add_option("password", "secret")
+        first.db.add_option("name", "test")
+        del first["user"]
+        self.assertEqual(
+            list(Derived.get_required_config().keys_breadth_first()),
+            ["host", "user", "db.port"],
+        )
+        self.assertEqual(list(Base.required_config.db.keys()), ["port"])
+
+        # a change to a nested Namespace after listing is seen in the listing
+        third = Derived.get_required_config()
+        self.assertEqual(list(third.keys_breadth_first()), ["host", "user", "db.port"])
+        third.db.add_option("name", "test")
+        self.assertEqual(
+            list(third.keys_breadth_first()),
+            ["host", "user", "db.port", "db.name"],
+        )
+        self.assertEqual(list(Base.required_config.db.keys()), ["port"])
+
+        # changes to the classes are seen
+        Base.required_config.add_option("timeout", 30)
+        self.assertEqual(Derived.get_required_config().timeout.default, 30)
+        Derived.required_config.add_option("host", "otherhost")
+        self.assertEqual(Derived.get_required_config().host.default, "otherhost")
+        Base.required_config = config_manager.Namespace()
+        self.assertEqual(
+            list(Derived.get_required_config().keys_breadth_first()),
+            ["user", "host"],
+        )
+        Derived.required_config = {"user": "wilma"}
+        self.assertEqual(Derived.get_required_config().user.default, "wilma")
+
     # --------------------------------------------------------------------------
     def test_app_name_from_app_obj(self):
         class MyApp(config_manager.RequiredConfig):
@@ -1514,6 +1586,47 @@ c.string =   from ini
         self.assertTrue("salary" in printed)
         self.assertTrue("*" * 16 not in printed)
 
+    # --------------------------------------------------------------------------
+    def test_write_conf_leaves_option_definitions_alone(self):
+        n = config_manager.Namespace()
+        n.add_option("gender", default="Male")
+        n.add_option("salary", default=10000, secret=True)
+        n.namespace("a")
+        n.a.add_option("b", default=1)
+        n.namespace("c")
+        n.c.add_option("password", default="xyzzy", secret=True)
+        n.c.namespace("d")
+        n.c.d.add_option("e", default=2)
+        cm = config_manager.ConfigurationManager(
+            n,
+            [],
+            use_admin_controls=True,
+            use_auto_help=False,
+            argv_source=[],
+        )
+        keys_before = list(cm.option_definitions.keys_breadth_first())
+
+        for skip_keys in (None, ["a.b", "c.d.e"]):
+            s = StringIO()
+
+            @contextmanager
+            def s_opener():
+                yield s
+
+            cm.write_conf("ini", s_opener, skip_keys=skip_keys)
+            written = s.getvalue()
+            self.assertTrue("*" * 16 in written)
+            self.assertFalse("xyzzy" in written)
+            self.assertEqual(cm.option_definitions.salary.value, 10000)
+            self.assertEqual(cm.option_definitions["c.password"].value, "xyzzy")
+            self.assertEqual(
+                list(cm.option_definitions.keys_breadth_first()), keys_before
+            )
+        # the emptied namespaces were left out, the one with a secret stays
+        self.assertFalse("[a]" in written)
+        self.assertFalse("[[d]]" in written)
+        self.assertTrue("[c]" in written)
+
     # --------------------------------------------------------------------------
     def test_dump_conf_some_options_excluded(self):
         n = config_manager.Namespace()
@@ -2020,6 +2133,22 @@ c.string =   from ini
         finally:
             os.remove("x.ini")
 
+    # --------------------------------------------------------------------------
+    @mock.patch("configmanners.config_manager.warnings")
+    def test_acquired_keys_are_not_excess_options(self, mocked_warnings):
+        n = Namespace()
+        n.namespace("x")
+        n.x.namespace("y")
+        n.x.y.add_option("zed")
+        n.add_option("food")
+        # 'y.zed' and 'zed' are acquisition suffixes of 'x.y.zed', while 'od'
+        # is only the tail end of the string 'food'
+        value_source = {"y.zed": 1, "zed": 2, "od": 3}
+        config_manager.ConfigurationManager(
+            (n,), [value_source], argv_source=[]
+        )
+        mocked_warnings.warn.assert_called_once_with("Invalid options: od")
+
     # --------------------------------------------------------------------------
     def test_overlay_bug(self):
         # for Options that already exist and have been seen by the overlay
@@ -2138,6 +2267,169 @@ c.string =   from ini
         self.assertTrue(cn.beta)
         self.assertEqual(cn.gamma, "hello")
 
+    # --------------------------------------------------------------------------
+    def test_overlay_expand_visits_each_option_once(self):
+        # three levels of class expansion take several passes of the overlay
+        # expansion loop.  Options finished in an early pass must not be
+        # expanded again in the later passes.
+        class C(RequiredConfig):
+            required_config = Namespace()
+            required_config.add_option("c_value", default=3)
+
+        class B(RequiredConfig):
+            required_config = Namespace()
+            required_config.add_option("b_value", default=2)
+            required_config.namespace("inner")
+            required_config.inner.add_option(
+                "c_class", default=C, from_string_converter=class_converter
+            )
+
+        class A(RequiredConfig):
+            required_config = Namespace()
+            required_config.add_option("a_value", default=1)
+            required_config.namespace("middle")
+            required_config.middle.add_option(
+                "b_class", default=B, from_string_converter=class_converter
+            )
+
+        r = Namespace()
+        r.add_option("top_value", default=0)
+        r.namespace("outer")
+        r.outer.add_option("a_class", default=A, from_string_converter=class_converter)
+
+        set_value_calls = []
+        original_set_value = Option.set_value
+
+        def counting_set_value(self, val=None):
+            set_value_calls.append(self.name)
+            return original_set_value(self, val)
+
+        with mock.patch.object(Option, "set_value", counting_set_value):
+            cm = config_manager.ConfigurationManager(
+                [r],
+                [{"outer.middle.inner.c_value": "33", "top_value": "10"}],
+                use_admin_controls=False,
+                use_auto_help=False,
+                argv_source=[],
+            )
+        cn = cm.get_config()
+
+        self.assertEqual(cn.top_value, 10)
+        self.assertEqual(cn.outer.a_value, 1)
+        self.assertEqual(cn.outer.middle.b_value, 2)
+        self.assertEqual(cn.outer.middle.inner.c_value, 33)
+        self.assertTrue(cn.outer.middle.inner.c_class is C)
+        # the Options of the definition source itself have already had
+        # set_value called by setup_definitions, so only the Options brought
+        # in by expansion are counted here
+        for name in ("a_value", "b_class", "b_value", "c_class", "c_value"):
+            self.assertEqual(set_value_calls.count(name), 1, name)
+
+    # --------------------------------------------------------------------------
+    def test_overlay_expand_work_grows_with_new_keys(self):
+        # each link of a chain of classes brings in the next link, so the
+        # overlay expansion loop takes a pass per link.  A pass must not go
+        # through all the keys found so far: doubling the length of the chain
+        # should no more than double the number of keys listed.
+        def chain_definitions(length):
+            a_class = None
+            for index in range(length):
+                required_config = Namespace()
+                required_config.add_option("value_%d" % index, default=index)
+                if a_class is not None:
+                    required_config.add_option(
+                        "class_%d" % index,
+                        default=a_class,
+                        from_string_converter=class_converter,
+                    )
+                a_class = type(
+                    "Link%d" % index,
+                    (RequiredConfig,),
+                    {"required_config": required_config},
+                )
+            n = Namespace()
+            n.add_option(
+                "first_class", default=a_class, from_string_converter=class_converter
+            )
+            return n
+
+        def keys_listed(length):
+            listed_keys = []
+            original_keys_breadth_first = DotDict.keys_breadth_first
+
+            def counting_keys_breadth_first(self, *args, **kwargs):
+                for key in original_keys_breadth_first(self, *args, **kwargs):
+                    listed_keys.append(key)
+                    yield key
+
+            with mock.patch.object(
+                DotDict, "keys_breadth_first", counting_keys_breadth_first
+            ):
+                cm = config_manager.ConfigurationManager(
+                    [chain_definitions(length)],
+                    [{"value_0": "17"}],
+                    use_admin_controls=False,
+                    use_auto_help=False,
+                    argv_source=[],
+                )
+            cn = cm.get_config()
+            self.assertEqual(cn.value_0, 17)
+            self.assertEqual(cn["value_%d" % (length - 1)], length - 1)
+            return len(listed_keys)
+
+        self.assertTrue(keys_listed(40) <= 2 * keys_listed(20))
+
+    # --------------------------------------------------------------------------
+    def test_overlay_again(self):
+        class A(RequiredConfig):
+            required_config = Namespace()
+            required_config.add_option("a_value", default=1)
+
+        class B(RequiredConfig):
+            required_config = Namespace()
+            required_config.add_option("b_value", default=2)
+
+        n = Namespace()
+        n.add_option("number", default=0)
+        n.add_option("a_class", default=A, from_string_converter=class_converter)
+
+        def values(argv):
+            return config_manager.ConfigurationManager(
+                [n], [getopt], use_admin_controls=False, argv_source=argv
+            ).get_config()
+
+        # the classes may be given on the command line by name
+        this_module = sys.modules[__name__]
+        with mock.patch.multiple(this_module, A=A, B=B, create=True):
+            tests = (
+                [],
+                ["--a_value=5", "--number=4"],
+                ["--a_class=%s.A" % __name__],
+                ["--number=5"],
+            )
+            expected = [dict(values(argv)) for argv in tests]
+            cm = config_manager._ReusableConfigurationManager(
+                [n], [getopt], use_admin_controls=False, argv_source=["--number=3"]
+            )
+            self.assertEqual(dict(cm.get_config()), dict(values(["--number=3"])))
+            a_value = cm.option_definitions.a_value
+            with mock.patch.object(
+                A, "get_required_config", wraps=A.get_required_config
+            ) as get_required_config:
+                for argv, expected_values in zip(tests, expected):
+                    self.assertTrue(cm._overlay_again(argv))
+                    self.assertEqual(dict(cm.get_config()), expected_values)
+                self.assertEqual(get_required_config.call_count, 0)
+            self.assertTrue(cm.option_definitions.a_value is a_value)
+
+            # another class would bring in other Options
+            argv = ["--a_class=%s.B" % __name__]
+            self.assertTrue("b_value" in values(argv))
+            self.assertFalse(cm._overlay_again(argv))
+            self.assertFalse("b_value" in cm.option_definitions)
+            self.assertTrue(cm._overlay_again(tests[-1]))
+            self.assertEqual(dict(cm.get_config()), expected[-1])
+
     # --------------------------------------------------------------------------
     def test_value_source_object_hook_1(self):
         """the definition source defines only keys with underscores.
@@ -2249,6 +2541,35 @@ c.string =   from ini
         self.assertTrue(cn.other_class is B)
         self.assertTrue(cn.some_class is A)
 
+    # --------------------------------------------------------------------------
+    def test_value_source_object_hook_without_lazy(self):
+        """an object hook that doesn't take the 'lazy' parameter of DotDict
+        is given just the initializer"""
+
+        class MyHook(DotDict):
+            made = 0
+
+            def __init__(self, initializer=None):
+                MyHook.made += 1
+                super(MyHook, self).__init__(initializer=initializer)
+
+        r = Namespace()
+        r.add_option("a", default=1)
+        r.namespace("b")
+        r.b.add_option("c", default="x")
+        cm = config_manager.ConfigurationManager(
+            [r],
+            [{"a": 2}, {"b.c": "y"}, {"b": {"c": "z"}}],
+            use_admin_controls=False,
+            use_auto_help=False,
+            argv_source=[],
+            value_source_object_hook=MyHook,
+        )
+        self.assertTrue(MyHook.made > 0)
+        cn = cm.get_config()
+        self.assertEqual(cn.a, 2)
+        self.assertEqual(cn.b.c, "z")
+
     # --------------------------------------------------------------------------
     def test_bare_configuration_call(self):
         from configmanners import configuration
@@ -2357,3 +2678,27 @@ c.string =   from ini
         self.assertFalse(config.option_definitions.wilma.has_changed)
         self.assertFalse(config.option_definitions.sarita.has_changed)
         self.assertTrue(config.option_definitions.robert.has_changed)
+
+    # --------------------------------------------------------------------------
+    def test_value_source_caches_do_not_keep_managers_alive(self):
+        n = config_manager.Namespace()
+        n.add_option("a", default=1)
+        n.namespace("b")
+        n.b.add_option("c", default="x")
+        references = []
+        for i in range(10000):
+            cm = config_manager.ConfigurationManager(
+                (n,),
+                [{"a": "2"}, {"b": {"c": "y"}}],
+                use_admin_controls=False,
+                use_auto_help=False,
+                argv_source=[],
+            )
+            references.append(weakref.ref(cm))
+        self.assertEqual(cm.get_config().b.c, "y")
+        del cm
+        gc.collect()
+        self.assertEqual(
+            [a_reference for a_reference in references if a_reference() is not None],
+            [],
+        )
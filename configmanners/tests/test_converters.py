@@ -3,11 +3,15 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import sys
+import types
 import unittest
+from unittest import mock
 import datetime
 
 from configmanners import converters
 from configmanners import RequiredConfig, Namespace, ConfigurationManager
+from configmanners.config_exceptions import CannotConvertError
 from configmanners.dotdict import DotDict
 
 
@@ -141,6 +145,44 @@ class TestCase(unittest.TestCase):
     def test_str_to_python_object_nothing(self):
         self.assertEqual(converters.str_to_python_object(""), None)
 
+    # --------------------------------------------------------------------------
+    def test_str_to_python_object_is_cached(self):
+        function = converters.str_to_python_object
+        function.cache_clear()
+        a_module = types.ModuleType("configmanners_cache_test")
+        a_module.Foo = Foo
+        self.addCleanup(sys.modules.pop, "configmanners_cache_test", None)
+        self.addCleanup(function.cache_clear)
+
+        # not found is remembered until sys.modules changes
+        self.assertRaises(CannotConvertError, function, "configmanners_cache_test.Foo")
+        with mock.patch("builtins.__import__") as an_import:
+            self.assertRaises(
+                CannotConvertError, function, "configmanners_cache_test.Foo"
+            )
+            self.assertEqual(an_import.call_count, 0)
+        sys.modules["configmanners_cache_test"] = a_module
+        self.assertTrue(function("configmanners_cache_test.Foo") is Foo)
+
+        # found is not imported again
+        with mock.patch("builtins.__import__") as an_import:
+            self.assertTrue(function("configmanners_cache_test.Foo") is Foo)
+            self.assertEqual(an_import.call_count, 0)
+        # but the object itself is looked up every time
+        a_module.Foo = Bar
+        self.assertTrue(function("configmanners_cache_test.Foo") is Bar)
+        self.assertRaises(CannotConvertError, function, "configmanners_cache_test.Baz")
+        another_module = types.ModuleType("configmanners_cache_test")
+        another_module.Foo = Foo
+        sys.modules["configmanners_cache_test"] = another_module
+        self.assertTrue(function("configmanners_cache_test.Foo") is Foo)
+
+        info = function.cache_info()
+        self.assertEqual(info.hits, 3)
+        self.assertEqual(info.misses, 4)
+        # the entries dropped because sys.modules changed
+        self.assertEqual(info.expired, 2)
+
     # --------------------------------------------------------------------------
     def test_str_to_python_object_with_whitespace(self):
         """either side whitespace doesn't matter"""
@@ -253,6 +295,87 @@ class TestCase(unittest.TestCase):
             self.assertTrue("kls_instance" in config[x])
             self.assertTrue(isinstance(config[x].kls_instance, config[x].kls))
 
+    # --------------------------------------------------------------------------
+    def test_classes_in_namespaces_converter_is_cached(self):
+        converter_fn = converters.classes_in_namespaces_converter("kls%d")
+        result = converter_fn(
+            "configmanners.tests.test_converters.Foo,"
+            "configmanners.tests.test_converters.Bar"
+        )
+        self.assertTrue(
+            result
+            is converter_fn(
+                "configmanners.tests.test_converters.Foo, "
+                "configmanners.tests.test_converters.Bar"
+            )
+        )
+        self.assertTrue(
+            result
+            is converters.classes_in_namespaces_converter("kls%d")(
+                "configmanners.tests.test_converters.Foo,"
+                "configmanners.tests.test_converters.Bar"
+            )
+        )
+        for another_converter_fn in (
+            converters.classes_in_namespaces_converter("HH%d"),
+            converters.classes_in_namespaces_converter("kls%d", "kls"),
+            converters.classes_in_namespaces_converter(
+                "kls%d", instantiate_classes=True
+            ),
+        ):
+            self.assertTrue(
+                result
+                is not another_converter_fn(
+                    "configmanners.tests.test_converters.Foo,"
+                    "configmanners.tests.test_converters.Bar"
+                )
+            )
+
+        converter_fn = converters.str_to_namespaces_and_classes()
+        result = converter_fn("a, configmanners.tests.test_converters.Foo")
+        self.assertTrue(
+            result is converter_fn("a,configmanners.tests.test_converters.Foo")
+        )
+        self.assertTrue(
+            result
+            is not converters.str_to_namespaces_and_classes("cls")(
+                "a, configmanners.tests.test_converters.Foo"
+            )
+        )
+
+    # --------------------------------------------------------------------------
+    def test_classes_in_namespaces_converter_is_not_expanded_again(self):
+        converter_fn = converters.classes_in_namespaces_converter("kls%d")
+
+        class Other(RequiredConfig):
+            required_config = Namespace()
+            required_config.add_option(
+                "kls_list",
+                default="configmanners.tests.test_converters.Alpha",
+                from_string_converter=converter_fn,
+            )
+
+        n = Namespace()
+        n.namespace("ns")
+        n.ns.add_option(
+            "kls_list",
+            default="configmanners.tests.test_converters.Alpha",
+            from_string_converter=converter_fn,
+        )
+        # expanding 'other' brings in 'kls_list', which has already been
+        # expanded, so it is overlaid again.  Its value is the same class
+        # as before, so its requirements are not brought in again
+        n.ns.add_option("other", default=Other)
+        class_list = converter_fn("configmanners.tests.test_converters.Alpha")
+        with mock.patch.object(
+            class_list, "get_required_config", wraps=class_list.get_required_config
+        ) as get_required_config:
+            cm = ConfigurationManager(n, [], argv_source=[])
+            self.assertEqual(get_required_config.call_count, 1)
+        config = cm.get_config()
+        self.assertTrue(config.ns.kls_list is class_list)
+        self.assertEqual(config.ns.kls0.cls, Alpha)
+
     # --------------------------------------------------------------------------
     def test_to_str_to_regular_expression(self):
         import re
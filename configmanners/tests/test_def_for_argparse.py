@@ -17,7 +17,8 @@ except ImportError:
         from nose.plugins.skip import SkipTest
     raise SkipTest
 
-from configmanners import ArgumentParser
+from configmanners import ArgumentParser, Namespace
+from configmanners.def_sources import setup_definitions
 from configmanners.dotdict import DotDict
 
 expected_value = {
@@ -522,3 +523,81 @@ class TestCaseForDefSourceArgparse(TestCase):
         for args, expected in tests:
             result = parser.parse_args(args=args)
             self.assertEqual(dict(result), dict(expected), "%s failed" % args)
+
+    # --------------------------------------------------------------------------
+    def test_compile_saves_definitions(self):
+        tests = (
+            (
+                ["a", "16"],
+                expected_value["test_expansion_subparsers_defaults_values_1"],
+            ),
+            (
+                ["a", "16", "--fff=9"],
+                expected_value["test_expansion_subparsers_defaults_values_2"],
+            ),
+            (
+                ["b", "--fff", "X"],
+                expected_value["test_expansion_subparsers_defaults_values_3"],
+            ),
+        )
+        parser = self.setup_subparser()
+        self.assertTrue(parser.compile() is parser)
+        with patch.object(
+            parser, "get_required_config", wraps=parser.get_required_config
+        ) as get_required_config:
+            for i in range(2):
+                for args, expected in tests:
+                    result = parser.parse_args(args=args)
+                    self.assertEqual(dict(result), dict(expected), "%s failed" % args)
+            result = parser.parse_known_args(args=["a", "16"])
+            self.assertEqual(result.bar, 16)
+            self.assertEqual(get_required_config.call_count, 0)
+
+            # adding an argument drops the saved definitions
+            parser.add_argument("--ham", default="spam")
+            self.assertEqual(parser.parse_args(args=["a", "16"]).ham, "spam")
+            self.assertEqual(get_required_config.call_count, 1)
+            parser.compile()
+            self.assertEqual(parser.parse_args(args=["a", "16"]).ham, "spam")
+            self.assertEqual(get_required_config.call_count, 2)
+
+    # --------------------------------------------------------------------------
+    def test_compile_keeps_configuration_managers(self):
+        tests = (
+            ["a", "16"],
+            ["a", "17", "--fff", "3"],
+            ["b", "--fff", "X"],
+            ["--foo", "a", "18"],
+            ["b"],
+        )
+        expected = [dict(self.setup_subparser().parse_args(args=x)) for x in tests]
+        parser = self.setup_subparser().compile()
+        with patch(
+            "configmanners.config_manager.setup_definitions",
+            wraps=setup_definitions,
+        ) as counted_setup_definitions:
+            with patch.object(
+                Namespace, "safe_copy", autospec=True, side_effect=Namespace.safe_copy
+            ) as counted_safe_copy:
+                self.assertEqual(dict(parser.parse_args(args=tests[0])), expected[0])
+                # the definitions and the admin options
+                self.assertEqual(counted_setup_definitions.call_count, 2)
+                expansions = counted_safe_copy.call_count
+                self.assertTrue(expansions > 0)
+                for args, expected_result in zip(tests[1:], expected[1:]):
+                    result = parser.parse_args(args=args)
+                    self.assertEqual(dict(result), expected_result, args)
+                # only choosing the other subcommand for the first time made
+                # and expanded another set of definitions
+                self.assertEqual(counted_setup_definitions.call_count, 4)
+                self.assertEqual(counted_safe_copy.call_count, 2 * expansions)
+                self.assertEqual(len(parser._compiled_managers), 2)
+
+                # a bad command line leaves nothing behind
+                with patch("sys.stderr", new_callable=StringIO):
+                    self.assertRaises(SystemExit, parser.parse_args, ["a", "-fff"])
+                for args, expected_result in zip(tests, expected):
+                    result = parser.parse_args(args=args)
+                    self.assertEqual(dict(result), expected_result, args)
+                self.assertEqual(counted_setup_definitions.call_count, 4)
+                self.assertEqual(counted_safe_copy.call_count, 2 * expansions)
@@ -4,7 +4,7 @@
 
 
 import unittest
-import collections
+import collections.abc
 
 from configmanners.namespace import Namespace
 
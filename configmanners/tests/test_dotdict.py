@@ -4,10 +4,12 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 
+import pickle
 import unittest
 from configmanners.dotdict import (
     DotDict,
     DotDictWithAcquisition,
+    DottedKeySuffixIndex,
     iteritems_breadth_first,
     stylize_keys,
     create_key_translating_dot_dict,
@@ -587,3 +589,270 @@ class TestCase(unittest.TestCase):
             ]
         )
         self.assertEqual(output, expected_output)
+
+    # --------------------------------------------------------------------------
+    def test_dotted_key_index(self):
+        d = DotDict()
+        d.a = DotDict()
+        d.a.b = DotDict()
+        d.a.b.c = 17
+        self.assertEqual(d["a.b.c"], 17)
+        self.assertEqual(d._dotted_key_index["a.b.c"], 17)
+        # keys without a dot are not indexed
+        self.assertTrue(d["a"] is d.a)
+        self.assertEqual(list(d._dotted_key_index), ["a.b.c"])
+        # adding keys leaves the index alone
+        d.a.x = 3
+        d.a.b.y = 4
+        self.assertEqual(d._dotted_key_index["a.b.c"], 17)
+        self.assertEqual(d["a.b.y"], 4)
+        # replacing a value deep in the path drops the stale entries
+        d.a.b.c = 23
+        self.assertEqual(d._dotted_key_index, {})
+        self.assertEqual(d["a.b.c"], 23)
+        # replacing an intermediate DotDict
+        d.a.b = DotDict()
+        d.a.b.c = 29
+        self.assertEqual(d["a.b.c"], 29)
+        # deleting a key
+        del d.a.b.c
+        self.assertRaises(KeyError, d.__getitem__, "a.b.c")
+        # the old replaced DotDict no longer affects the index
+        d.a.b.c = 31
+        self.assertEqual(d["a.b.c"], 31)
+
+    # --------------------------------------------------------------------------
+    def test_dotted_key_index_shared_child(self):
+        shared = DotDict()
+        shared.c = 1
+        d1 = DotDict()
+        d1.a = shared
+        d2 = DotDict()
+        d2.b = shared
+        self.assertEqual(d1["a.c"], 1)
+        self.assertEqual(d2["b.c"], 1)
+        shared.c = 2
+        self.assertEqual(d1["a.c"], 2)
+        self.assertEqual(d2["b.c"], 2)
+
+    # --------------------------------------------------------------------------
+    def test_dotted_key_index_copies(self):
+        import copy
+
+        d = DotDict()
+        d.a = DotDict()
+        d.a.b = 1
+        self.assertEqual(d["a.b"], 1)
+        d2 = copy.deepcopy(d)
+        self.assertEqual(d2._dotted_key_index, {})
+        self.assertEqual(d2["a.b"], 1)
+        d2.a.b = 2
+        self.assertEqual(d2["a.b"], 2)
+        self.assertEqual(d["a.b"], 1)
+
+    # --------------------------------------------------------------------------
+    def test_dotted_key_index_with_acquisition(self):
+        d = DotDictWithAcquisition()
+        d.x = 10
+        d.a = DotDictWithAcquisition()
+        d.a.b = DotDictWithAcquisition()
+        # acquired values are found, but not put into the index
+        self.assertEqual(d["a.b.x"], 10)
+        self.assertTrue("a.b.x" not in d._dotted_key_index)
+        d.a.b.x = 20
+        self.assertEqual(d["a.b.x"], 20)
+        d.a.b.x = 30
+        self.assertEqual(d["a.b.x"], 30)
+
+    # --------------------------------------------------------------------------
+    def test_keys_breadth_first_is_saved_and_invalidated(self):
+        d = DotDict()
+        d.a = 1
+        d.b = DotDict()
+        d.b.c = 2
+        self.assertEqual(list(d.keys_breadth_first()), ["a", "b.c"])
+        self.assertEqual(list(d.keys_breadth_first(True)), ["a", "b", "b.c"])
+        # each call returns a fresh iterator
+        self.assertTrue(d.keys_breadth_first() is not d.keys_breadth_first())
+        # replacing a plain value doesn't change the keys
+        saved = d._breadth_first_keys[False]
+        d.b.c = 3
+        self.assertTrue(d._breadth_first_keys[False] is saved)
+        # adding a key deep in the tree is seen from the top
+        d.b.d = DotDict()
+        d.b.d.e = 4
+        self.assertEqual(list(d.keys_breadth_first()), ["a", "b.c", "b.d.e"])
+        self.assertEqual(
+            list(d.keys_breadth_first(True)), ["a", "b", "b.c", "b.d", "b.d.e"]
+        )
+        # replacing a nested DotDict with a plain value
+        d.b.d = 5
+        self.assertEqual(list(d.keys_breadth_first()), ["a", "b.c", "b.d"])
+        # deleting
+        del d.b.c
+        self.assertEqual(list(d.keys_breadth_first()), ["a", "b.d"])
+        del d["b"]
+        self.assertEqual(list(d.keys_breadth_first(True)), ["a"])
+
+    # --------------------------------------------------------------------------
+    def test_keys_breadth_first_iteration_with_mutation(self):
+        d = DotDict()
+        d.a = 1
+        d.b = 2
+        keys = []
+        for key in d.keys_breadth_first():
+            keys.append(key)
+            d["x%s" % key] = 0
+        self.assertEqual(keys, ["a", "b"])
+        self.assertEqual(list(d.keys_breadth_first()), ["a", "b", "xa", "xb"])
+
+    # --------------------------------------------------------------------------
+    def test_dotted_key_suffix_index(self):
+        index = DottedKeySuffixIndex(["x.y.z", "a.b", "c"])
+        for a_key in ("x.y.z", "y.z", "z", "a.b", "b", "c"):
+            self.assertTrue(index.has_suffix(a_key), a_key)
+        for a_key in ("x.y", "x", "w.x.y.z", "yz", "a.c", "y.b"):
+            self.assertFalse(index.has_suffix(a_key), a_key)
+        index.add("q.xyz")
+        self.assertTrue(index.has_suffix("xyz"))
+        self.assertFalse(index.has_suffix("yz"))
+        self.assertFalse(DottedKeySuffixIndex().has_suffix("anything"))
+
+    # --------------------------------------------------------------------------
+    def _deep_acquisition_tree(self, depth):
+        d = DotDictWithAcquisition()
+        d.shared = "root"
+        current = d
+        nodes = [d]
+        for i in range(depth):
+            current["n%d" % i] = DotDictWithAcquisition()
+            current = current["n%d" % i]
+            nodes.append(current)
+        return d, nodes
+
+    # --------------------------------------------------------------------------
+    def test_acquisition_cache(self):
+        d, nodes = self._deep_acquisition_tree(5)
+        leaf = nodes[-1]
+        self.assertEqual(leaf.shared, "root")
+        # every DotDict walked through remembers the owner
+        for a_node in nodes[1:]:
+            self.assertTrue("shared" in a_node._acquisition_cache)
+        self.assertEqual(leaf.shared, "root")
+        # replacing the value at the owner needs no invalidation
+        d.shared = "new root"
+        self.assertEqual(leaf.shared, "new root")
+        self.assertEqual(nodes[3].shared, "new root")
+        # a new key part way down hides the one at the root
+        nodes[2].shared = "middle"
+        self.assertEqual(leaf.shared, "middle")
+        self.assertEqual(nodes[3].shared, "middle")
+        self.assertEqual(nodes[1].shared, "new root")
+        self.assertFalse("shared" in nodes[2]._acquisition_cache)
+        # deleting it uncovers the root again
+        del nodes[2].shared
+        self.assertEqual(leaf.shared, "new root")
+        self.assertEqual(nodes[2].shared, "new root")
+        # deleting at the root leaves nothing to acquire
+        del d.shared
+        self.assertRaises(KeyError, getattr, leaf, "shared")
+        self.assertRaises(KeyError, leaf.__getitem__, "shared")
+
+    # --------------------------------------------------------------------------
+    def test_acquisition_cache_with_reparenting(self):
+        d1, nodes1 = self._deep_acquisition_tree(3)
+        d2 = DotDictWithAcquisition()
+        d2.shared = "other root"
+        leaf = nodes1[-1]
+        self.assertEqual(leaf.shared, "root")
+        # move a subtree to a new parent
+        d2.moved = nodes1[1]
+        self.assertEqual(leaf.shared, "other root")
+        self.assertEqual(nodes1[1].shared, "other root")
+
+    # --------------------------------------------------------------------------
+    def test_acquisition_cache_with_dotted_keys(self):
+        d, nodes = self._deep_acquisition_tree(3)
+        self.assertEqual(d["n0.n1.n2.shared"], "root")
+        self.assertEqual(d["n0.n1.n2.missing.shared"], "root")
+        d.n0.n1.shared = "n1"
+        self.assertEqual(d["n0.n1.n2.shared"], "n1")
+        self.assertEqual(d["n0.n1.n2.missing.shared"], "n1")
+
+    # --------------------------------------------------------------------------
+    def test_initializer_nesting(self):
+        source = {"a": 1, "b.c": 2, "d": {"e": {"f": 3, "g.h": 4}, "i": 5}}
+        for a_class in (DotDict, DotDictWithAcquisition):
+            d = a_class(source)
+            self.assertEqual(
+                list(d.keys_breadth_first(include_dicts=True)),
+                ["a", "b", "d", "b.c", "d.e", "d.i", "d.e.f", "d.e.g", "d.e.g.h"],
+            )
+            self.assertTrue(isinstance(d.d.e, a_class))
+        n = Namespace(initializer=source)
+        self.assertTrue(isinstance(n.d.e, Namespace))
+        self.assertEqual(n["d.e.f"].default, 3)
+
+    # --------------------------------------------------------------------------
+    def test_lazy_initializer(self):
+        source = {"a": 1, "b.c": 2, "d": {"e": {"f": 3}, "i": 5}, "j": {"k": 6}}
+        eager = DotDictWithAcquisition(source)
+        d = DotDictWithAcquisition(source, lazy=True)
+        # nothing is copied until the DotDict is used
+        self.assertTrue(d.__dict__["_lazy_initializer"] is source)
+        self.assertEqual(d.d.e.f, 3)
+        # only the parts that were used have been copied
+        self.assertTrue("_lazy_initializer" in d.j.__dict__)
+        self.assertFalse("_lazy_initializer" in d.d.e.__dict__)
+        self.assertTrue(isinstance(d.j, DotDictWithAcquisition))
+        self.assertEqual(
+            list(d.keys_breadth_first(include_dicts=True)),
+            list(eager.keys_breadth_first(include_dicts=True)),
+        )
+        self.assertEqual(list(d.j), ["k"])
+        self.assertEqual(len(DotDict(source, lazy=True)), 4)
+        # acquisition works through lazily copied levels
+        self.assertEqual(d["d.e.i"], 5)
+        d = DotDictWithAcquisition(source, lazy=True)
+        self.assertEqual(d.d.e.a, 1)
+        self.assertRaises(KeyError, getattr, DotDict(source, lazy=True), "x")
+        # changes before first use show through, later ones don't
+        source = {"a": {"b": 1}}
+        d = DotDict(source, lazy=True)
+        source["a"]["b"] = 2
+        self.assertEqual(d.a.b, 2)
+        source["a"]["b"] = 3
+        self.assertEqual(d.a.b, 2)
+
+    # --------------------------------------------------------------------------
+    def test_lazy_initializer_with_subclasses(self):
+        TranslatingDotDict = create_key_translating_dot_dict(
+            "TranslatingDotDict", (("-", "_"),)
+        )
+        d = TranslatingDotDict({"a-b": {"c-d": 1}}, lazy=True)
+        self.assertEqual(d.a_b.c_d, 1)
+        self.assertEqual(d["a-b.c-d"], 1)
+        self.assertEqual(list(d.keys_breadth_first()), ["a_b.c_d"])
+        d = DotDict({"a": {"b": 1}}, lazy=True)
+        d.c = 2
+        self.assertEqual(list(d.keys_breadth_first()), ["c", "a.b"])
+        self.assertEqual(pickle.loads(pickle.dumps(DotDict(d, lazy=True))), d)
+
+    # --------------------------------------------------------------------------
+    def test_keys_named_like_methods(self):
+        d = DotDict()
+        d.a = DotDict()
+        self.assertRaises(KeyError, d.__getitem__, "keys")
+        self.assertRaises(KeyError, d.__getitem__, "a.items")
+        self.assertFalse("values" in d)
+        d["a.keys"] = 1
+        self.assertEqual(d["a.keys"], 1)
+
+        d = DotDictWithAcquisition()
+        d["keys"] = 1
+        d.a = DotDictWithAcquisition()
+        d.a.b = DotDictWithAcquisition()
+        self.assertEqual(d["a.keys"], 1)
+        self.assertEqual(d["a.b.keys"], 1)
+        self.assertEqual(d.a["keys"], 1)
+        self.assertRaises(KeyError, d.__getitem__, "a.items")
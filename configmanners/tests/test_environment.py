@@ -0,0 +1,252 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+import unittest
+
+from configmanners import Namespace, ConfigurationManager
+from configmanners.config_exceptions import NotAnOptionError
+from configmanners.dotdict import DotDict, DotDictWithAcquisition, stylize_keys
+from configmanners.environment import (
+    Environment,
+    PrefixedEnvironment,
+    stylize_key,
+)
+from configmanners.value_sources import for_mapping
+
+
+# ==============================================================================
+class CountingMapping(dict):
+    """a dict that counts how many times its keys or items have been gone
+    through"""
+
+    iterations = 0
+
+    # --------------------------------------------------------------------------
+    def __iter__(self):
+        self.iterations += 1
+        return super(CountingMapping, self).__iter__()
+
+    # --------------------------------------------------------------------------
+    def keys(self):
+        return list(iter(self))
+
+    # --------------------------------------------------------------------------
+    def items(self):
+        self.iterations += 1
+        return super(CountingMapping, self).items()
+
+
+# ==============================================================================
+class TestCase(unittest.TestCase):
+
+    variables = {
+        "HELLO": "howdy",
+        "JELL__O": "gelatin",
+        "database_hostname": "localhost",
+        "resources__postgres__database_hostname": "more-localhost",
+        "a.b": "dotted",
+    }
+
+    # --------------------------------------------------------------------------
+    def test_stylize_key(self):
+        self.assertEqual(stylize_key("HELLO"), "HELLO")
+        self.assertEqual(stylize_key("JELL__O"), "JELL__O")
+        self.assertEqual(stylize_key("a__b__c"), "a.b.c")
+        self.assertEqual(stylize_key("a.b"), "a.b")
+
+    # --------------------------------------------------------------------------
+    def test_lookups_match_stylize_keys(self):
+        e = Environment(self.variables)
+        stylized = stylize_keys(self.variables)
+        for key in stylized.keys_breadth_first():
+            self.assertEqual(e[key], stylized[key])
+        self.assertEqual(
+            sorted(e),
+            sorted(
+                ["__identity", "always_ignore_mismatches"]
+                + list(stylized.keys_breadth_first())
+            ),
+        )
+        self.assertEqual(len(e), len(list(e)))
+        self.assertEqual(e["__identity"], "environment")
+        self.assertTrue(e["always_ignore_mismatches"])
+        for key in ("resources__postgres__database_hostname", "HELLO.x", "J.O", 17):
+            self.assertFalse(key in e)
+            self.assertRaises(KeyError, e.__getitem__, key)
+
+    # --------------------------------------------------------------------------
+    def test_lookups_do_not_iterate(self):
+        variables = CountingMapping(self.variables)
+        e = Environment(variables, refresh=True)
+        self.assertEqual(e["resources.postgres.database_hostname"], "more-localhost")
+        self.assertEqual(e["HELLO"], "howdy")
+        self.assertEqual(variables.iterations, 0)
+        list(iter(e))
+        self.assertEqual(variables.iterations, 1)
+
+    # --------------------------------------------------------------------------
+    def test_len(self):
+        e = Environment(self.variables)
+        self.assertEqual(len(e), 7)
+        self.assertEqual(len(e), len(list(e)))
+        # two variables with the same key are one key
+        variables = dict(self.variables)
+        variables["a__b"] = "doubled underscore"
+        for e in (Environment(variables), Environment(variables, refresh=True)):
+            self.assertEqual(len(e), 7)
+            self.assertEqual(len(e), len(list(e)))
+            self.assertEqual(len(e), len(set(e)))
+
+    # --------------------------------------------------------------------------
+    def test_refresh(self):
+        variables = dict(self.variables)
+        e = Environment(variables)
+        self.assertEqual(e["HELLO"], "howdy")
+        variables["HELLO"] = "hi"
+        variables["x__y"] = "new"
+        self.assertEqual(e["HELLO"], "howdy")
+        self.assertFalse("x.y" in list(e))
+        e.refresh()
+        self.assertEqual(e["HELLO"], "hi")
+        self.assertTrue("x.y" in list(e))
+
+        live = Environment(variables, refresh=True)
+        self.assertTrue("x.y" in list(live))
+        del variables["x__y"]
+        self.assertFalse("x.y" in live)
+        self.assertFalse("x.y" in list(live))
+
+    # --------------------------------------------------------------------------
+    def test_values_for(self):
+        e = Environment(self.variables)
+        self.assertTrue(e.values_for(DotDict) is e)
+        acquiring = e.values_for(DotDictWithAcquisition)
+        self.assertEqual(acquiring["x.y.HELLO"], "howdy")
+        self.assertEqual(
+            acquiring["resources.postgres.database_hostname"], "more-localhost"
+        )
+        self.assertEqual(acquiring["resources.database_hostname"], "localhost")
+        self.assertRaises(KeyError, acquiring.__getitem__, "x.y.z")
+        self.assertEqual(sorted(acquiring), sorted(e))
+
+        # the same answers as a DotDictWithAcquisition made of the variables
+        variables = {"b__c": "b.c", "a__x": "a.x", "c": "c", "d__e__f": "d.e.f"}
+        acquiring = Environment(variables).values_for(DotDictWithAcquisition)
+        d = DotDictWithAcquisition()
+        d.b = DotDictWithAcquisition()
+        d.b.c = "b.c"
+        d.a = DotDictWithAcquisition()
+        d.a.x = "a.x"
+        d.c = "c"
+        d.d = DotDictWithAcquisition()
+        d.d.e = DotDictWithAcquisition()
+        d.d.e.f = "d.e.f"
+        for key in ("a.b.c", "d.e.c", "d.b.c", "a.c", "a.d.e.f"):
+            self.assertEqual(acquiring[key], d[key])
+        self.assertEqual(acquiring["a.b.c"], "b.c")
+        for key in ("a.d.e", "a.b.x", "a.x.c", "c.x"):
+            self.assertRaises(KeyError, acquiring.__getitem__, key)
+
+        class MyDotDict(DotDict):
+            pass
+
+        values = e.values_for(MyDotDict)
+        self.assertTrue(isinstance(values, MyDotDict))
+        self.assertEqual(values.resources.postgres.database_hostname, "more-localhost")
+
+    # --------------------------------------------------------------------------
+    def test_as_value_source(self):
+        variables = CountingMapping(self.variables)
+        variables["resources__postgres__port"] = "5433"
+        e = Environment(variables, refresh=True)
+        value_source = for_mapping.ValueSource(e)
+        self.assertEqual(value_source.identity, "environment")
+        self.assertTrue(value_source.always_ignore_mismatches)
+
+        n = Namespace()
+        n.namespace("resources")
+        n.resources.namespace("postgres")
+        n.resources.postgres.add_option("port", default=5432)
+        n.resources.postgres.add_option("database_hostname", default="")
+        config = ConfigurationManager(
+            [n], [e], use_admin_controls=False, use_auto_help=False, argv_source=[]
+        ).get_config()
+        self.assertEqual(config.resources.postgres.port, 5433)
+        self.assertEqual(
+            config.resources.postgres.database_hostname, "more-localhost"
+        )
+        self.assertEqual(variables.iterations, 0)
+
+    # --------------------------------------------------------------------------
+    def test_prefixed(self):
+        variables = CountingMapping(self.variables)
+        variables["MYAPP__resources__port"] = "5433"
+        variables["MYAPP__HOST"] = "db"
+        variables["MYAPP__"] = "nothing"
+        variables["OTHERAPP__resources__port"] = "1"
+        e = PrefixedEnvironment("MYAPP", variables)
+        self.assertEqual(e.prefix, "MYAPP__")
+        self.assertEqual(e["__identity"], "environment MYAPP__*")
+        self.assertEqual(e["resources.port"], "5433")
+        self.assertEqual(e["HOST"], "db")
+        self.assertEqual(sorted(e), ["HOST", "__identity", "resources.port"])
+        self.assertEqual(len(e), 3)
+        for key in ("HELLO", "MYAPP__HOST", "always_ignore_mismatches", [], ""):
+            self.assertFalse(key in e)
+        self.assertEqual(variables.iterations, 1)
+        self.assertEqual(
+            e.values_for(DotDictWithAcquisition)["resources.x.HOST"], "db"
+        )
+        self.assertFalse(for_mapping.ValueSource(e).always_ignore_mismatches)
+        self.assertTrue(
+            for_mapping.ValueSource(
+                PrefixedEnvironment("MYAPP__", variables, strict=False)
+            ).always_ignore_mismatches
+        )
+
+        # the index is made again only when asked
+        variables["MYAPP__resources__port"] = "5434"
+        self.assertEqual(e["resources.port"], "5433")
+        e.refresh()
+        self.assertEqual(e["resources.port"], "5434")
+        self.assertEqual(variables.iterations, 2)
+
+    # --------------------------------------------------------------------------
+    def test_prefixed_mismatches(self):
+        n = Namespace()
+        n.namespace("resources")
+        n.resources.add_option("port", default=5432)
+        n.add_option("host", default="localhost")
+        variables = {
+            "MYAPP__resources__port": "5433",
+            "MYAPP__host": "db",
+            "HELLO": "howdy",
+        }
+
+        def configuration(*value_sources):
+            return ConfigurationManager(
+                [n],
+                [{"admin": {"strict": True}}] + list(value_sources),
+                use_admin_controls=True,
+                use_auto_help=False,
+                argv_source=[],
+            ).get_config()
+
+        config = configuration(PrefixedEnvironment("MYAPP", variables))
+        self.assertEqual(config.resources.port, 5433)
+        self.assertEqual(config.host, "db")
+
+        # a misspelled variable with the prefix is caught
+        variables["MYAPP__resources__prot"] = "5434"
+        self.assertRaises(
+            NotAnOptionError, configuration, PrefixedEnvironment("MYAPP", variables)
+        )
+        config = configuration(PrefixedEnvironment("MYAPP", variables, strict=False))
+        self.assertEqual(config.resources.port, 5433)
+        # a key used through acquisition is not a mismatch
+        del variables["MYAPP__resources__prot"]
+        variables["MYAPP__port"] = "5435"
+        config = configuration(PrefixedEnvironment("MYAPP", variables))
+        self.assertEqual(config.resources.port, 5433)
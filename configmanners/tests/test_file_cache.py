@@ -0,0 +1,180 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+import glob
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from configmanners.value_sources import for_configobj, for_conf, for_json
+from configmanners.value_sources.file_cache import (
+    GlobDependency,
+    ParsedFileCache,
+    parsed_file_cache,
+)
+
+
+# ==============================================================================
+class TestCase(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.parsed = []
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+        parsed_file_cache.invalidate()
+
+    # --------------------------------------------------------------------------
+    def _write(self, name, contents, age=60):
+        """write a file that looks like it was last changed 'age' seconds ago"""
+        file_name = os.path.join(self.tempdir, name)
+        with open(file_name, "w") as f:
+            f.write(contents)
+        then = time.time() - age
+        os.utime(file_name, (then, then))
+        return file_name
+
+    # --------------------------------------------------------------------------
+    def _parse(self, path):
+        self.parsed.append(path)
+        with open(path) as f:
+            return f.read(), ()
+
+    # --------------------------------------------------------------------------
+    def test_get(self):
+        cache = ParsedFileCache()
+        file_name = self._write("a.txt", "alpha")
+        self.assertEqual(cache.get(file_name, "test", self._parse), "alpha")
+        self.assertEqual(cache.get(file_name, "test", self._parse), "alpha")
+        self.assertEqual(len(self.parsed), 1)
+        # a different handler parses the file for itself
+        cache.get(file_name, "other", self._parse)
+        self.assertEqual(len(self.parsed), 2)
+        # so does a change to the file
+        self._write("a.txt", "alpha, again", age=30)
+        self.assertEqual(cache.get(file_name, "test", self._parse), "alpha, again")
+        self.assertEqual(len(self.parsed), 3)
+        # the old version was dropped
+        self.assertEqual(len(cache), 2)
+        # the same file by another name is the same file
+        os.symlink(file_name, os.path.join(self.tempdir, "b.txt"))
+        cache.get(os.path.join(self.tempdir, "b.txt"), "test", self._parse)
+        self.assertEqual(len(self.parsed), 3)
+
+        self.assertRaises(
+            OSError, cache.get, os.path.join(self.tempdir, "x"), "test", self._parse
+        )
+
+    # --------------------------------------------------------------------------
+    def test_recently_changed_files_are_not_cached(self):
+        cache = ParsedFileCache()
+        file_name = self._write("a.txt", "alpha", age=0)
+        cache.get(file_name, "test", self._parse)
+        cache.get(file_name, "test", self._parse)
+        self.assertEqual(len(self.parsed), 2)
+        self.assertEqual(len(cache), 0)
+
+    # --------------------------------------------------------------------------
+    def test_invalidate_and_size(self):
+        cache = ParsedFileCache(max_size=2)
+        a = self._write("a.txt", "alpha")
+        b = self._write("b.txt", "beta")
+        c = self._write("c.txt", "gamma")
+        for file_name in (a, b, c):
+            cache.get(file_name, "test", self._parse)
+        self.assertEqual(len(cache), 2)
+        cache.get(a, "test", self._parse)
+        self.assertEqual(len(self.parsed), 4)
+        cache.invalidate(a)
+        self.assertEqual(len(cache), 1)
+        cache.get(c, "test", self._parse)
+        self.assertEqual(len(self.parsed), 4)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    # --------------------------------------------------------------------------
+    def test_dependencies(self):
+        cache = ParsedFileCache()
+        a = self._write("a.txt", "alpha")
+        b = self._write("b.txt", "beta")
+
+        def parse(path):
+            self.parsed.append(path)
+            return "parsed", [path, b]
+
+        cache.get(a, "test", parse)
+        cache.get(a, "test", parse)
+        self.assertEqual(len(self.parsed), 1)
+        self._write("b.txt", "beta, again", age=30)
+        cache.get(a, "test", parse)
+        self.assertEqual(len(self.parsed), 2)
+        os.unlink(b)
+        self.assertRaises(OSError, cache.get, a, "test", parse)
+
+    # --------------------------------------------------------------------------
+    def test_dependencies_that_are_not_files(self):
+        cache = ParsedFileCache()
+        a = self._write("a.txt", "alpha")
+        os.mkdir(os.path.join(self.tempdir, "d"))
+        self._write("d/b.txt", "beta")
+        pattern = os.path.join(self.tempdir, "d", "*.txt")
+
+        def parse(path):
+            self.parsed.append(path)
+            file_names = sorted(glob.glob(pattern))
+            return "parsed", [GlobDependency(pattern, file_names)] + file_names
+
+        cache.get(a, "test", parse)
+        cache.get(a, "test", parse)
+        self.assertEqual(len(self.parsed), 1)
+        # no file that was read changes, but another one matches
+        self._write("d/c.txt", "gamma")
+        cache.get(a, "test", parse)
+        self.assertEqual(len(self.parsed), 2)
+        cache.get(a, "test", parse)
+        self.assertEqual(len(self.parsed), 2)
+
+        # a dependency that changed while parsing is not cached
+        def parse_while_changing(path):
+            self.parsed.append(path)
+            return "parsed", [GlobDependency(pattern, [])]
+
+        cache.get(a, "other", parse_while_changing)
+        cache.get(a, "other", parse_while_changing)
+        self.assertEqual(len(self.parsed), 4)
+
+    # --------------------------------------------------------------------------
+    def test_value_sources(self):
+        json_file = self._write("a.json", '{"a": 1, "b": {"c": 2}}')
+        with mock.patch(
+            "configmanners.value_sources.for_json._load", side_effect=for_json._load
+        ) as load:
+            for i in range(3):
+                vs = for_json.ValueSource(json_file)
+                self.assertEqual(vs.get_values(None, True).b.c, 2)
+            self.assertEqual(load.call_count, 1)
+
+        conf_file = self._write("a.conf", "a=1\nb.c=2\n")
+        self.assertTrue(
+            for_conf.ValueSource(conf_file).values
+            is for_conf.ValueSource(conf_file).values
+        )
+
+        ini_file = self._write("a.ini", "a=1\n[b]\n+include ./c.ini\n")
+        self._write("c.ini", "c=2\n")
+        first = for_configobj.ValueSource(ini_file).values
+        self.assertTrue(first is for_configobj.ValueSource(ini_file).values)
+        self.assertEqual(first["b"]["c"], "2")
+        # a change to an included file is seen
+        self._write("c.ini", "c=three\n", age=30)
+        second = for_configobj.ValueSource(ini_file).values
+        self.assertEqual(second["b"]["c"], "three")
+        self.assertTrue(first is not second)
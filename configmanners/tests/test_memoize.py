@@ -3,9 +3,13 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 
+import gc
+import threading
+import time
 import unittest
+import weakref
 
-from configmanners.memoize import memoize
+from configmanners.memoize import CacheInfo, LRUCache, memoize, memoize_method
 
 
 # ==============================================================================
@@ -88,3 +92,154 @@ class TestCase(unittest.TestCase):
             expected = [(x, x, x) for x in range(10)]
             self.assertEqual(results, expected)
             self.assertEqual(A.counter, 10)
+
+    # --------------------------------------------------------------------------
+    def test_memoize_least_recently_used(self):
+        calls = []
+
+        @memoize(max_cache_size=3)
+        def foo(a):
+            calls.append(a)
+            return a * 2
+
+        for x in (1, 2, 3):
+            foo(x)
+        # using 1 again makes 2 the least recently used
+        self.assertEqual(foo(1), 2)
+        foo(4)
+        self.assertEqual(list(foo.cache), [(3,), (1,), (4,)])
+        calls[:] = []
+        self.assertEqual([foo(x) for x in (1, 3, 4, 2)], [2, 6, 8, 4])
+        self.assertEqual(calls, [2])
+        info = foo.cache_info()
+        self.assertEqual((info.hits, info.misses), (4, 5))
+        self.assertEqual((info.maxsize, info.currsize), (3, 3))
+        foo.cache_clear()
+        self.assertEqual(tuple(foo.cache_info()), (0, 0, 3, 0, 0))
+
+    # --------------------------------------------------------------------------
+    def test_lru_cache_discard(self):
+        cache = LRUCache(3)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.discard("a")
+        cache.discard("not there")
+        self.assertRaises(KeyError, cache.get, "a")
+        self.assertEqual(cache.get("b"), 2)
+        self.assertEqual(list(cache), ["b"])
+
+    # --------------------------------------------------------------------------
+    def test_lru_cache_is_valid(self):
+        cache = LRUCache(3)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a", lambda value: value == 1), 1)
+        self.assertRaises(KeyError, cache.get, "a", lambda value: value == 2)
+        self.assertRaises(KeyError, cache.get, "a")
+        self.assertEqual(cache.info(), CacheInfo(1, 1, 3, 0, 1))
+
+    # --------------------------------------------------------------------------
+    def test_memoize_unhashable_and_keyword_arguments(self):
+        @memoize()
+        def foo(a, b=1):
+            foo.counter += 1
+            return a, b
+
+        foo.counter = 0
+        self.assertEqual(foo([1], b=2), ([1], 2))
+        self.assertEqual(foo([1], b=2), ([1], 2))
+        self.assertEqual(foo.counter, 2)
+        self.assertEqual(foo(1, b=2), (1, 2))
+        self.assertEqual(foo(1, b=2), (1, 2))
+        self.assertEqual(foo.counter, 3)
+        self.assertEqual(foo.cache_info().currsize, 1)
+
+    # --------------------------------------------------------------------------
+    def test_memoize_ttl(self):
+        @memoize(ttl=0.05)
+        def foo(a):
+            foo.counter += 1
+            return a
+
+        foo.counter = 0
+        foo(1)
+        foo(1)
+        self.assertEqual(foo.counter, 1)
+        time.sleep(0.1)
+        foo(1)
+        self.assertEqual(foo.counter, 2)
+        self.assertEqual(foo.cache_info().expired, 1)
+
+    # --------------------------------------------------------------------------
+    def test_memoize_threads(self):
+        @memoize(max_cache_size=50)
+        def foo(a):
+            return a * 2
+
+        errors = []
+
+        def work(offset):
+            try:
+                for i in range(2000):
+                    x = (i * 7 + offset) % 100
+                    if foo(x) != x * 2:
+                        errors.append(x)
+            except Exception as x:
+                errors.append(x)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for a_thread in threads:
+            a_thread.start()
+        for a_thread in threads:
+            a_thread.join()
+        self.assertEqual(errors, [])
+        info = foo.cache_info()
+        self.assertEqual(info.hits + info.misses, 16000)
+        self.assertTrue(info.currsize <= 50)
+
+    # --------------------------------------------------------------------------
+    def test_memoize_method(self):
+        class A(object):
+            def __init__(self):
+                self.counter = 0
+
+            @memoize_method(max_cache_size=5)
+            def foo(self, a, b=0):
+                self.counter += 1
+                return (a, b)
+
+        a = A()
+        b = A()
+        for i in range(5):
+            self.assertEqual(
+                [a.foo(x, b=x) for x in range(5)], [(x, x) for x in range(5)]
+            )
+            self.assertEqual(
+                [b.foo(x) for x in range(3)], [(x, 0) for x in range(3)]
+            )
+        self.assertEqual((a.counter, b.counter), (5, 3))
+        self.assertEqual(A.foo.cache_info(a).hits, 20)
+        self.assertEqual(A.foo.cache_info(b).currsize, 3)
+        A.foo.cache_clear(a)
+        a.foo(0, b=0)
+        self.assertEqual(a.counter, 6)
+        self.assertEqual(b.foo([1]), ([1], 0))
+
+    # --------------------------------------------------------------------------
+    def test_memoize_method_does_not_keep_instances_alive(self):
+        class A(object):
+            @memoize_method()
+            def foo(self, other):
+                return other
+
+        references = []
+        for i in range(100):
+            a = A()
+            # the argument refers back to the instance, a cycle through the
+            # cache that only the garbage collector can break
+            a.foo(a)
+            a.foo([a])
+            references.append(weakref.ref(a))
+        del a
+        gc.collect()
+        self.assertEqual([r for r in references if r() is not None], [])
+
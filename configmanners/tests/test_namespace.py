@@ -3,6 +3,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 
+import copy
 import unittest
 import datetime
 import functools
@@ -264,3 +265,103 @@ class TestCase(unittest.TestCase):
         namespace = n.namespace("deeper", "My doc")
         self.assertEqual(namespace, n.deeper)
         self.assertEqual(namespace._doc, "My doc")
+
+    # --------------------------------------------------------------------------
+    def _copy_on_write_sample(self):
+        n = config_manager.Namespace()
+        n.add_option("a", default=1)
+        n.add_aggregation("agg", lambda *args: 17)
+        n.namespace("b")
+        n.b.add_option("c", default=2)
+        n.b.namespace("d")
+        n.b.d.add_option("e", default=3)
+        n.namespace("f")
+        n.f.add_option("g", default=4)
+        return n
+
+    # --------------------------------------------------------------------------
+    def test_copy_on_write_shares(self):
+        n = self._copy_on_write_sample()
+        c = n.safe_copy(copy_on_write=True)
+        self.assertEqual(
+            list(c.keys_breadth_first(include_dicts=True)),
+            list(n.keys_breadth_first(include_dicts=True)),
+        )
+        # listing the keys doesn't copy the nested Namespaces
+        self.assertEqual(sorted(c.__dict__["_shared_namespaces"]), ["b", "f"])
+        # Options are shared, Aggregations are not
+        self.assertTrue(c.a is n.a)
+        self.assertTrue(c.agg is not n.agg)
+        # a nested Namespace is copied on first use, its Options still shared
+        self.assertTrue(isinstance(c.b, config_manager.Namespace))
+        self.assertTrue(c.b is not n.b)
+        self.assertTrue(c["b.c"] is n.b.c)
+        self.assertTrue(c.b.d is not n.b.d)
+        self.assertEqual(sorted(c.__dict__["_shared_namespaces"]), ["f"])
+
+    # --------------------------------------------------------------------------
+    def test_copy_on_write_changes_are_private(self):
+        n = self._copy_on_write_sample()
+        c = n.safe_copy(copy_on_write=True)
+        del c["b.d.e"]
+        del c.f
+        c["b.c"] = Option("c", default=20)
+        c.b.add_option("h", default=5)
+        self.assertEqual(
+            list(c.keys_breadth_first()), ["a", "agg", "b.c", "b.h"]
+        )
+        self.assertEqual(c.b.c.default, 20)
+        # the original is untouched
+        self.assertEqual(
+            list(n.keys_breadth_first()), ["a", "agg", "b.c", "b.d.e", "f.g"]
+        )
+        self.assertEqual(n.b.c.default, 2)
+        # a copy of a copy
+        c2 = c.safe_copy(copy_on_write=True)
+        self.assertEqual(list(c2.keys_breadth_first()), list(c.keys_breadth_first()))
+        self.assertTrue(c2.b.h is c.b.h)
+
+    # --------------------------------------------------------------------------
+    def test_copy_on_write_changes_after_listing(self):
+        n = config_manager.Namespace()
+        n.namespace("a")
+        n.a.add_option("x")
+        c = n.safe_copy(copy_on_write=True)
+        self.assertEqual(list(c.keys_breadth_first()), ["a.x"])
+        c.a.add_option("y")
+        self.assertEqual(list(c.keys_breadth_first()), ["a.x", "a.y"])
+        self.assertEqual(list(n.keys_breadth_first()), ["a.x"])
+        # deeper down, listed again after the first copy
+        n = self._copy_on_write_sample()
+        c = n.safe_copy(copy_on_write=True)
+        list(c.keys_breadth_first())
+        c.b.add_option("h")
+        list(c.keys_breadth_first())
+        c.b.d.add_option("i")
+        self.assertEqual(
+            list(c.keys_breadth_first()),
+            ["a", "agg", "b.c", "b.h", "b.d.e", "b.d.i", "f.g"],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_copy_on_write_reference_value_from(self):
+        n = self._copy_on_write_sample()
+        n.b.c.reference_value_from = "x"
+        c = n.safe_copy(reference_value_from="y", copy_on_write=True)
+        # the top level Option had to change, so it was copied
+        self.assertTrue(c.a is not n.a)
+        self.assertEqual(c.a.reference_value_from, "y")
+        self.assertEqual(n.a.reference_value_from, None)
+        self.assertEqual(c.b.c.reference_value_from, "x")
+
+    # --------------------------------------------------------------------------
+    def test_copy_on_write_deepcopy(self):
+        n = self._copy_on_write_sample()
+        c = n.safe_copy(copy_on_write=True)
+        c2 = copy.deepcopy(c)
+        self.assertEqual(
+            list(c2.keys_breadth_first()), list(n.keys_breadth_first())
+        )
+        self.assertTrue(c2.b.d.e is not n.b.d.e)
+        self.assertEqual(c2.b.d.e.default, 3)
+
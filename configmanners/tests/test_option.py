@@ -397,3 +397,22 @@ class TestCase(unittest.TestCase):
         )
         o2 = o.copy()
         self.assertEqual(o, o2)
+
+    # --------------------------------------------------------------------------
+    def test_copy_matches_constructor(self):
+        o = Option(name="dwight", default=17, doc="the doc", value=0)
+        o.has_changed = True
+        o.foreign_data = {"a": 1}
+        o.sourced_from = "somewhere"
+        o.doc = "  changed doc  "
+        o.from_string_converter = "int"
+        o2 = o.copy()
+        self.assertTrue(o2 is not o)
+        self.assertEqual(o2.value, 0)
+        self.assertEqual(o2.doc, "changed doc")
+        self.assertEqual(o2.from_string_converter, int)
+        self.assertTrue(o2.has_changed)
+        self.assertTrue(o2.foreign_data is o.foreign_data)
+        self.assertEqual(o2.sourced_from, "default value")
+        o.value = None
+        self.assertEqual(o.copy().value, 17)
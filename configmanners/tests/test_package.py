@@ -0,0 +1,55 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+import os
+import subprocess
+import sys
+import unittest
+
+import configmanners
+from configmanners.config_manager import ConfigurationManager
+from configmanners.converters import class_converter
+from configmanners.environment import Environment
+from configmanners.namespace import Namespace
+
+
+# ==============================================================================
+class TestCase(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_lazy_names(self):
+        self.assertTrue(configmanners.ConfigurationManager is ConfigurationManager)
+        self.assertTrue(configmanners.Namespace is Namespace)
+        self.assertTrue(configmanners.class_converter is class_converter)
+        self.assertTrue(isinstance(configmanners.environment, Environment))
+        self.assertTrue("RequiredConfig" in dir(configmanners))
+        self.assertRaises(AttributeError, getattr, configmanners, "nothing_here")
+        namespace = {}
+        exec("from configmanners import *", namespace)
+        for a_name in configmanners.__all__:
+            self.assertTrue(namespace[a_name] is getattr(configmanners, a_name))
+
+    # --------------------------------------------------------------------------
+    def test_import_is_lazy(self):
+        program = "\n".join(
+            [
+                "import sys",
+                "import configmanners",
+                "print(sorted(",
+                "    name for name in ('argparse', 'inspect',",
+                "        'configmanners.config_manager', 'configmanners.converters')",
+                "    if name in sys.modules",
+                "))",
+                "configmanners.Namespace",
+                "print('configmanners.converters' in sys.modules)",
+            ]
+        )
+        # a fresh interpreter, run where it can import this configmanners
+        output = subprocess.check_output(
+            [sys.executable, "-c", program],
+            cwd=os.path.dirname(os.path.dirname(configmanners.__file__)),
+            universal_newlines=True,
+        )
+        self.assertEqual(output.splitlines(), ["[]", "True"])
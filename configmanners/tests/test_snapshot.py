@@ -0,0 +1,207 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+import copy
+import pickle
+import unittest
+
+from configmanners import Namespace, RequiredConfig
+from configmanners.config_manager import ConfigurationManager
+from configmanners.dotdict import DotDict, DotDictWithAcquisition
+from configmanners.snapshot import freeze, FrozenNamespace
+
+
+# ==============================================================================
+class TestCase(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def _sample(self):
+        d = DotDictWithAcquisition()
+        d.a = 1
+        d.b = "two"
+        d.database = DotDictWithAcquisition()
+        d.database.host = "localhost"
+        d.database.pool = DotDictWithAcquisition()
+        d.database.pool.size = 10
+        d.database.pool.a = 100
+        return d
+
+    # --------------------------------------------------------------------------
+    def test_own_values(self):
+        s = freeze(self._sample())
+        self.assertTrue(isinstance(s, FrozenNamespace))
+        self.assertEqual(s.a, 1)
+        self.assertEqual(s.b, "two")
+        self.assertEqual(s.database.host, "localhost")
+        self.assertEqual(s.database.pool.size, 10)
+        self.assertEqual(s["database.pool.size"], 10)
+        self.assertEqual(s.database["pool.size"], 10)
+        # values are kept in slots, there is no instance dict
+        self.assertFalse(hasattr(s.database.pool, "__dict__"))
+        self.assertTrue("size" in type(s.database.pool).__slots__)
+
+    # --------------------------------------------------------------------------
+    def test_acquisition(self):
+        d = self._sample()
+        s = freeze(d)
+        # the same answers as from the original
+        self.assertEqual(s.database.pool.host, d.database.pool.host)
+        self.assertEqual(s.database.pool.b, d.database.pool.b)
+        self.assertEqual(s.database.b, "two")
+        self.assertEqual(s["database.pool.b"], "two")
+        # an inner value shadows an outer one
+        self.assertEqual(s.database.pool.a, 100)
+        self.assertEqual(s.database.a, 1)
+        # namespaces may be acquired too, just like DotDictWithAcquisition
+        self.assertTrue(s.database.pool.database is s.database)
+        # missing keys
+        self.assertRaises(AttributeError, getattr, s.database.pool, "nope")
+        self.assertRaises(KeyError, s.__getitem__, "database.nope")
+        self.assertFalse("nope" in s.database)
+        self.assertTrue("b" in s.database)
+
+    # --------------------------------------------------------------------------
+    def test_mapping_interface(self):
+        s = freeze(self._sample())
+        # iteration sees only the namespace's own keys
+        self.assertEqual(list(s), ["a", "b", "database"])
+        self.assertEqual(list(s.database), ["host", "pool"])
+        self.assertEqual(len(s.database.pool), 2)
+        self.assertEqual(dict(s.database.pool.items()), {"size": 10, "a": 100})
+        self.assertEqual(s.get("nope", 17), 17)
+        self.assertEqual(s.database.pool, {"size": 10, "a": 100})
+        self.assertEqual(s, freeze(self._sample()))
+        self.assertNotEqual(s.database, s.database.pool)
+
+    # --------------------------------------------------------------------------
+    def test_keys_that_are_not_identifiers(self):
+        d = DotDict()
+        d["a-b"] = 1
+        d["class"] = 2
+        d.n = DotDict()
+        d.n.x = 3
+        s = freeze(d)
+        self.assertEqual(s["a-b"], 1)
+        self.assertEqual(getattr(s, "class"), 2)
+        self.assertEqual(s["n.a-b"], 1)
+        self.assertEqual(list(s), ["a-b", "class", "n"])
+
+    # --------------------------------------------------------------------------
+    def test_keys_that_are_reserved(self):
+        s = freeze({"_own_keys": 1, "x": 2})
+        self.assertEqual(s["_own_keys"], 1)
+        self.assertEqual(s.x, 2)
+        self.assertEqual(dict(s), {"_own_keys": 1, "x": 2})
+
+        d = {"keys": 1, "__init__": 2, "n": {"get": 3, "m": {}}}
+        s = freeze(d)
+        # the methods are still there, the values are found as items
+        self.assertEqual(list(s.keys()), ["keys", "__init__", "n"])
+        self.assertEqual(s["keys"], 1)
+        self.assertEqual(s["__init__"], 2)
+        self.assertEqual(s.n.get("get"), 3)
+        self.assertEqual(s["n.get"], 3)
+        # and acquired, like any other value
+        self.assertEqual(s["n.keys"], 1)
+        self.assertEqual(s["n.m.get"], 3)
+        self.assertFalse("get" in s)
+        self.assertEqual(s, freeze(d))
+        self.assertEqual(hash(s), hash(freeze(d)))
+
+    # --------------------------------------------------------------------------
+    def test_get_snapshot_with_options_named_like_methods(self):
+        n = Namespace()
+        for name in ("keys", "items", "values"):
+            n.add_option(name, default=1)
+        n.namespace("inner")
+        n.inner.add_option("keys", default=2)
+        n.inner.add_option("x", default=3)
+        cm = ConfigurationManager(
+            (n,),
+            [{"inner.keys": "5", "values": "7"}],
+            use_admin_controls=False,
+            argv_source=[],
+        )
+        s = cm.get_snapshot()
+        self.assertEqual(list(s), ["keys", "items", "values", "inner"])
+        self.assertEqual(s["keys"], 1)
+        self.assertEqual(s["items"], 1)
+        self.assertEqual(s["values"], 7)
+        self.assertEqual(s["inner.keys"], 5)
+        self.assertEqual(s["inner.items"], 1)
+        self.assertEqual(s.inner.x, 3)
+        self.assertEqual(list(s.inner.keys()), ["keys", "x"])
+        config = cm.get_config()
+        self.assertEqual(config["inner.items"], 1)
+        self.assertEqual(s, config)
+
+    # --------------------------------------------------------------------------
+    def test_immutable_and_hashable(self):
+        s = freeze(self._sample())
+
+        def assign():
+            s.database.pool.size = 20
+
+        self.assertRaises(TypeError, assign)
+        self.assertRaises(TypeError, delattr, s, "a")
+        self.assertEqual(s.database.pool.size, 10)
+        self.assertEqual(hash(s), hash(freeze(self._sample())))
+        self.assertEqual(len(set([s, freeze(self._sample())])), 1)
+        self.assertTrue(copy.copy(s) is s)
+        self.assertTrue(copy.deepcopy(s) is s)
+        self.assertRaises(TypeError, pickle.dumps, s)
+
+    # --------------------------------------------------------------------------
+    def test_unhashable_values(self):
+        s = freeze({"a": [1, 2]})
+        self.assertRaises(TypeError, hash, s)
+
+    # --------------------------------------------------------------------------
+    def test_get_snapshot(self):
+        class Pool(RequiredConfig):
+            required_config = Namespace()
+            required_config.add_option("size", default=5)
+
+        n = Namespace()
+        n.add_option("host", default="localhost")
+        n.namespace("database")
+        n.database.add_option(
+            "pool_class", default=Pool, from_string_converter=lambda x: x
+        )
+        cm = ConfigurationManager(
+            (n,),
+            [{"database.size": "20"}],
+            use_admin_controls=False,
+            argv_source=[],
+        )
+        s = cm.get_snapshot()
+        config = cm.get_config()
+        self.assertEqual(s.database.size, 20)
+        self.assertEqual(s.database.pool_class, Pool)
+        self.assertEqual(s.database.host, config.database.host)
+        self.assertEqual(type(s).__name__, "Snapshot")
+        self.assertEqual(s, config)
+
+    # --------------------------------------------------------------------------
+    def test_get_snapshot_with_acquiring_aggregation(self):
+        def url(config, local_config, args):
+            # 'host' is only found by acquisition from the level above
+            return "%s:%s" % (local_config.host, local_config.port)
+
+        n = Namespace()
+        n.add_option("host", default="localhost")
+        n.namespace("db")
+        n.db.add_option("port", default=5432)
+        n.db.add_aggregation("url", url)
+        cm = ConfigurationManager(
+            (n,),
+            [{"db.port": "6543"}],
+            use_admin_controls=False,
+            argv_source=[],
+        )
+        self.assertEqual(cm.get_config().db.url, "localhost:6543")
+        s = cm.get_snapshot()
+        self.assertEqual(s.db.url, "localhost:6543")
+        self.assertEqual(s.db.host, "localhost")
@@ -0,0 +1,191 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+import json
+import unittest
+
+from configmanners import Namespace, RequiredConfig
+from configmanners.config_manager import ConfigurationManager
+from configmanners.dotdict import DotDict
+from configmanners.timings import Timings, NoTimings
+
+
+# ------------------------------------------------------------------------------
+def fake_clock(step):
+    """a clock that advances by 'step' every time that it is read"""
+    state = {"now": 0.0}
+
+    def clock():
+        state["now"] += step
+        return state["now"]
+
+    return clock
+
+
+# ==============================================================================
+class TestCase(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_phases(self):
+        timings = Timings(wall_clock=fake_clock(1.0), cpu_clock=fake_clock(0.5))
+        with timings.phase("alpha") as record:
+            record["items"] = 3
+        with timings.phase("beta"):
+            pass
+        with timings.phase("alpha") as record:
+            record["items"] = 4
+        result = timings.as_dict()
+        self.assertEqual(
+            result["phases"],
+            [
+                {"name": "alpha", "wall": 1.0, "cpu": 0.5, "items": 3},
+                {"name": "beta", "wall": 1.0, "cpu": 0.5, "items": 0},
+                {"name": "alpha", "wall": 1.0, "cpu": 0.5, "items": 4},
+            ],
+        )
+        self.assertEqual(
+            result["totals"]["alpha"],
+            {"calls": 2, "wall": 2.0, "cpu": 1.0, "items": 7},
+        )
+        self.assertEqual(result["totals"]["beta"]["calls"], 1)
+        self.assertEqual(result["value_sources"], [])
+
+    # --------------------------------------------------------------------------
+    def test_value_sources(self):
+        timings = Timings(wall_clock=fake_clock(2.0), cpu_clock=fake_clock(1.0))
+        for i in range(2):
+            with timings.value_source(1, "os.environ") as record:
+                record["items"] = 10
+            with timings.value_source(0, "a mapping") as record:
+                record["items"] = 1
+        self.assertEqual(
+            timings.as_dict()["value_sources"],
+            [
+                {
+                    "identity": "a mapping",
+                    "calls": 2,
+                    "wall": 4.0,
+                    "cpu": 2.0,
+                    "items": 2,
+                },
+                {
+                    "identity": "os.environ",
+                    "calls": 2,
+                    "wall": 4.0,
+                    "cpu": 2.0,
+                    "items": 20,
+                },
+            ],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_a_failing_phase_is_still_recorded(self):
+        timings = Timings(wall_clock=fake_clock(1.0), cpu_clock=fake_clock(1.0))
+        try:
+            with timings.phase("broken"):
+                raise ValueError("oops")
+        except ValueError:
+            pass
+        self.assertEqual(timings.as_dict()["phases"][0]["wall"], 1.0)
+
+    # --------------------------------------------------------------------------
+    def test_no_timings(self):
+        timings = NoTimings()
+        self.assertFalse(timings.enabled)
+        self.assertTrue(Timings().enabled)
+        with timings.phase("alpha") as record:
+            record["items"] = 3
+        with timings.value_source(0, "a mapping") as record:
+            record["items"] = 3
+        self.assertEqual(timings.as_dict(), {})
+
+    # --------------------------------------------------------------------------
+    def test_items_are_counted_only_when_timed(self):
+        # a value source that is a DotDict is used as it is
+        class SizedDict(DotDict):
+            sized = 0
+
+            def __len__(self):
+                SizedDict.sized += 1
+                return super(SizedDict, self).__len__()
+
+        n = Namespace()
+        n.add_option("name", default="fred")
+        for timings, sized in ((None, 0), (True, 2)):
+            SizedDict.sized = 0
+            cm = ConfigurationManager(
+                (n,),
+                [SizedDict({"name": "wilma"})],
+                use_admin_controls=False,
+                argv_source=[],
+                timings=timings,
+            )
+            self.assertEqual(cm.get_config().name, "wilma")
+            # once for the overlay and once for the check for mismatches
+            self.assertEqual(SizedDict.sized, sized)
+
+    # --------------------------------------------------------------------------
+    def test_configuration_manager_timings(self):
+        class Inner(RequiredConfig):
+            required_config = Namespace()
+            required_config.add_option("size", default=3)
+
+        n = Namespace()
+        n.add_option("cls", default=Inner, from_string_converter=lambda x: x)
+        n.add_option("name", default="fred")
+        cm = ConfigurationManager(
+            (n,),
+            [{"name": "wilma"}],
+            use_admin_controls=False,
+            argv_source=[],
+            timings=True,
+        )
+        config = cm.get_config()
+        self.assertEqual(config.name, "wilma")
+        result = cm.get_timings()
+        # it must be serializable for shipping off to a metrics system
+        json.dumps(result)
+        totals = result["totals"]
+        for a_phase in (
+            "safe_copy",
+            "setup_definitions",
+            "wrap_with_value_source_api",
+            "overlay_expand",
+            "check_for_mismatches",
+            "get_config",
+            "generate_config",
+            "aggregate",
+        ):
+            self.assertTrue(a_phase in totals, a_phase)
+        # the class option brings in 'size' and requires a second pass
+        self.assertEqual(totals["overlay_expand.pass"]["calls"], 2)
+        self.assertEqual(
+            [x["items"] for x in result["phases"] if x["name"] == "overlay_expand.pass"],
+            [2, 1],
+        )
+        self.assertEqual(totals["overlay_expand"]["items"], 3)
+        self.assertEqual(len(result["value_sources"]), 1)
+        self.assertEqual(result["value_sources"][0]["identity"], "a mapping")
+        # once per pass and once for the mismatch check
+        self.assertEqual(result["value_sources"][0]["calls"], 3)
+
+    # --------------------------------------------------------------------------
+    def test_configuration_manager_supplied_recorder(self):
+        timings = Timings()
+        n = Namespace()
+        n.add_option("name", default="fred")
+        cm = ConfigurationManager(
+            (n,), [], use_admin_controls=False, argv_source=[], timings=timings
+        )
+        self.assertTrue(timings.phases)
+        self.assertEqual(cm.get_timings(), timings.as_dict())
+
+    # --------------------------------------------------------------------------
+    def test_configuration_manager_without_timings(self):
+        n = Namespace()
+        n.add_option("name", default="fred")
+        cm = ConfigurationManager((n,), [], use_admin_controls=False, argv_source=[])
+        cm.get_config()
+        self.assertEqual(cm.get_timings(), {})
@@ -3,6 +3,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 
+import collections
 from unittest import TestCase
 
 try:
@@ -16,7 +17,7 @@ except ImportError:
         from nose.plugins.skip import SkipTest
     raise SkipTest
 
-from mock import Mock
+from mock import Mock, patch
 
 from functools import partial
 
@@ -319,3 +320,125 @@ class TestCaseForValSourceArgparse(TestCase):
 
         for k in config.keys_breadth_first():
             self.assertEqual(config[k], expected[k])
+
+    # --------------------------------------------------------------------------
+    def test_basic_08_parser_is_reused_between_passes(self):
+        option_definitions = self.setup_configmanners_namespace()
+        other_definition_source = Namespace()
+        other_definition_source.add_option(
+            "a_class",
+            default="configmanners.tests.test_val_for_modules.Alpha",
+            from_string_converter=class_converter,
+        )
+        builds = []
+        original_build = ValueSource._build_intermediate_parser
+
+        def counting_build(self, config_manager):
+            builds.append(config_manager)
+            return original_build(self, config_manager)
+
+        with patch.object(ValueSource, "_build_intermediate_parser", counting_build):
+            cm = ConfigurationManager(
+                definition_source=[option_definitions, other_definition_source],
+                values_source_list=[command_line],
+                argv_source=[
+                    "0",
+                    "--a_class=configmanners.tests.test_val_for_modules.Delta",
+                    "--messy=34",
+                    "--dd=configmanners.tests.test_val_for_modules.Alpha",
+                    "--a=99",
+                ],
+                use_auto_help=False,
+            )
+        # the class expansion takes several passes, each adding options
+        self.assertEqual(len(builds), 1)
+        config = cm.get_config()
+        self.assertEqual(config.alpha, 0)
+        self.assertEqual(config.messy, 34)
+        self.assertEqual(
+            config.dd, class_converter("configmanners.tests.test_val_for_modules.Alpha")
+        )
+        self.assertEqual(config.a, 99)
+
+        # with nothing new defined, the last parse is used again
+        value_source = cm.values_source_list[0]
+        intermediate = value_source._intermediate
+        value_source.get_values(cm, True)
+        self.assertTrue(value_source._intermediate is intermediate)
+        parsed = intermediate.parsed
+        self.assertEqual(value_source.get_values(cm, True).messy, "34")
+        self.assertTrue(intermediate.parsed is parsed)
+
+        # a replaced option makes a new parser
+        cm.option_definitions["messy"] = cm.option_definitions["messy"].copy()
+        value_source.get_values(cm, True)
+        self.assertTrue(value_source._intermediate is not intermediate)
+
+        # so does an option whose argument changes shape
+        intermediate = value_source._intermediate
+        cm.option_definitions.messy.default = [1, 2]
+        value_source.argv_source = ("0", "--messy", "3", "4")
+        self.assertEqual(value_source.get_values(cm, True).messy, ["3", "4"])
+        self.assertTrue(value_source._intermediate is not intermediate)
+        intermediate = value_source._intermediate
+        self.assertEqual(value_source.get_values(cm, True).messy, ["3", "4"])
+        self.assertTrue(value_source._intermediate is intermediate)
+
+    # --------------------------------------------------------------------------
+    def test_basic_09_only_changed_options_are_checked(self):
+        option_definitions = self.setup_configmanners_namespace()
+        other_definition_source = Namespace()
+        other_definition_source.add_option(
+            "a_class",
+            default="configmanners.tests.test_val_for_modules.Alpha",
+            from_string_converter=class_converter,
+        )
+        original_argument_shape = ValueSource._argument_shape
+        original_get_values = ValueSource.get_values
+        shapes = collections.Counter()
+        passes = []
+
+        def counting_argument_shape(an_option):
+            shapes[an_option.name] += 1
+            return original_argument_shape(an_option)
+
+        def counting_get_values(self, config_manager, ignore_mismatches, hook=None):
+            passes.append(ignore_mismatches)
+            return original_get_values(self, config_manager, ignore_mismatches, hook)
+
+        with patch.object(
+            ValueSource, "_argument_shape", staticmethod(counting_argument_shape)
+        ), patch.object(ValueSource, "get_values", counting_get_values):
+            cm = ConfigurationManager(
+                definition_source=[option_definitions, other_definition_source],
+                values_source_list=[command_line],
+                argv_source=[
+                    "0",
+                    "--a_class=configmanners.tests.test_val_for_modules.Delta",
+                    "--messy=34",
+                    "--dd=configmanners.tests.test_val_for_modules.Alpha",
+                    "--a=99",
+                ],
+                use_auto_help=False,
+            )
+        self.assertEqual(passes, [True, True, True, False])
+        # the shape of each Option is found when it is added to the parser,
+        # and checked once more after its default has been overlaid.  It is
+        # not checked again in the passes that follow
+        self.assertEqual(shapes["alpha"], 2)
+        self.assertEqual(max(shapes.values()), 2)
+        self.assertEqual(cm.get_config().a, 99)
+
+        # outside of the overlay, every Option is checked.  During it, only
+        # those that the configuration manager lists as changed
+        value_source = cm.values_source_list[0]
+        cm._changed_keys = []
+        value_source.get_values(cm, True)
+        intermediate = value_source._intermediate
+        cm.option_definitions.messy.default = [1, 2]
+        value_source.get_values(cm, True)
+        self.assertTrue(value_source._intermediate is intermediate)
+        cm._changed_keys.append("messy")
+        value_source.argv_source = ("0", "--messy", "3", "4")
+        self.assertEqual(value_source.get_values(cm, True).messy, ["3", "4"])
+        self.assertTrue(value_source._intermediate is not intermediate)
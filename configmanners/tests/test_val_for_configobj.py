@@ -5,7 +5,9 @@
 
 import unittest
 import os
+import shutil
 import tempfile
+import time
 from io import StringIO
 import contextlib
 
@@ -14,6 +16,7 @@ from configmanners.namespace import Namespace
 from configmanners.config_manager import ConfigurationManager
 from configmanners.config_exceptions import NotAnOptionError
 from configmanners.dotdict import DotDict, DotDictWithAcquisition
+from configmanners.value_sources.file_cache import parsed_file_cache
 
 try:
     # from ..value_sources.for_configobj import ValueSource
@@ -517,3 +520,142 @@ bad_option=bar  # other comment
                     os.rmdir(db_creds_dir)
                 if os.path.isdir(ini_repo_dir):
                     os.rmdir(ini_repo_dir)
+
+        # ----------------------------------------------------------------------
+        def _write_files(self, directory, files):
+            for a_name, contents in files.items():
+                file_name = os.path.join(directory, a_name)
+                if not os.path.isdir(os.path.dirname(file_name)):
+                    os.makedirs(os.path.dirname(file_name))
+                with open(file_name, "w") as f:
+                    f.write(contents)
+
+        # ----------------------------------------------------------------------
+        def test_include_graph(self):
+            directory = tempfile.mkdtemp()
+            try:
+                self._write_files(
+                    directory,
+                    {
+                        "app.ini": (
+                            "[source]\n"
+                            "  +include db.ini\n"
+                            "[destination]\n"
+                            "  +include db.ini\n"
+                            "[plugins]\n"
+                            "  +include conf.d/*.ini\n"
+                        ),
+                        "db.ini": "+include common/host.ini\ndbname=some_database\n",
+                        "common/host.ini": "dbhostname=myserver\n",
+                        "conf.d/b.ini": "[[b]]\n+include ../db.ini\n",
+                        "conf.d/a.ini": "[[a]]\nx=1\n",
+                        "conf.d/readme.txt": "not included\n",
+                    },
+                )
+                app_ini = os.path.join(directory, "app.ini")
+                graph = for_configobj.IncludeGraph()
+                lines = graph.expand(app_ini)
+                # each file is read once
+                self.assertEqual(len(graph.expanded), 5)
+                self.assertEqual(lines.count("  dbhostname=myserver"), 3)
+                real = os.path.realpath
+                self.assertEqual(
+                    graph.includes[real(app_ini)],
+                    [
+                        real(os.path.join(directory, "db.ini")),
+                        real(os.path.join(directory, "db.ini")),
+                        real(os.path.join(directory, "conf.d", "a.ini")),
+                        real(os.path.join(directory, "conf.d", "b.ini")),
+                    ],
+                )
+
+                config = for_configobj.ConfigObjWithIncludes(app_ini)
+                self.assertEqual(
+                    config["source"],
+                    {"dbhostname": "myserver", "dbname": "some_database"},
+                )
+                self.assertEqual(config["destination"], config["source"])
+                self.assertEqual(config["plugins"]["a"], {"x": "1"})
+                self.assertEqual(config["plugins"]["b"], config["source"])
+                self.assertEqual(len(config.included_files), 5)
+                self.assertEqual(
+                    config.included_globs,
+                    [
+                        (
+                            os.path.join(directory, "conf.d/*.ini"),
+                            [
+                                os.path.join(directory, "conf.d", "a.ini"),
+                                os.path.join(directory, "conf.d", "b.ini"),
+                            ],
+                        )
+                    ],
+                )
+            finally:
+                shutil.rmtree(directory)
+
+        # ----------------------------------------------------------------------
+        def test_include_glob_sees_new_files(self):
+            directory = tempfile.mkdtemp()
+            then = time.time() - 60
+            try:
+                self._write_files(
+                    directory,
+                    {
+                        "top.ini": "top=1\n+include conf.d/*.ini\n",
+                        "conf.d/a.ini": "a=1\n",
+                    },
+                )
+                for a_name in ("top.ini", "conf.d/a.ini", "conf.d"):
+                    os.utime(os.path.join(directory, a_name), (then, then))
+                top_ini = os.path.join(directory, "top.ini")
+                first = for_configobj.ValueSource(top_ini).values
+                self.assertEqual(first, {"top": "1", "a": "1"})
+                # the parsed file is cached
+                self.assertTrue(first is for_configobj.ValueSource(top_ini).values)
+                # a new file that the include matches is seen, though none of
+                # the files read before has changed
+                self._write_files(directory, {"conf.d/b.ini": "b=1\n"})
+                b_ini = os.path.join(directory, "conf.d", "b.ini")
+                os.utime(b_ini, (then, then))
+                self.assertEqual(
+                    for_configobj.ValueSource(top_ini).values,
+                    {"top": "1", "a": "1", "b": "1"},
+                )
+                os.remove(b_ini)
+                self.assertEqual(
+                    for_configobj.ValueSource(top_ini).values,
+                    {"top": "1", "a": "1"},
+                )
+            finally:
+                shutil.rmtree(directory)
+                parsed_file_cache.invalidate()
+
+        # ----------------------------------------------------------------------
+        def test_include_cycle(self):
+            directory = tempfile.mkdtemp()
+            try:
+                self._write_files(
+                    directory,
+                    {
+                        "app.ini": "+include a.ini\n",
+                        "a.ini": "a=1\n+include b.ini\n",
+                        "b.ini": "b=1\n+include a.ini\n",
+                        "self.ini": "+include *.ini\n",
+                    },
+                )
+                app_ini = os.path.join(directory, "app.ini")
+                a_ini = os.path.realpath(os.path.join(directory, "a.ini"))
+                b_ini = os.path.realpath(os.path.join(directory, "b.ini"))
+                with self.assertRaises(for_configobj.IncludeCycleException) as cm:
+                    for_configobj.ValueSource(app_ini)
+                self.assertEqual(
+                    str(cm.exception),
+                    "include cycle: %s -> %s -> %s" % (a_ini, b_ini, a_ini),
+                )
+                self.assertRaises(
+                    for_configobj.IncludeCycleException,
+                    for_configobj.ConfigObjWithIncludes,
+                    os.path.join(directory, "self.ini"),
+                )
+            finally:
+                shutil.rmtree(directory)
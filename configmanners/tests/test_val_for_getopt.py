@@ -6,6 +6,8 @@
 import unittest
 import getopt
 
+from mock import call, patch
+
 import configmanners.config_manager as config_manager
 from configmanners.config_exceptions import NotAnOptionError
 from configmanners.value_sources.for_getopt import ValueSource
@@ -58,6 +60,94 @@ class TestCase(unittest.TestCase):
         self.assertEqual(o.get_values(c, False), {"limit": "10"})
         self.assertEqual(o.get_values(c, True), {"limit": "10"})
 
+    # --------------------------------------------------------------------------
+    def test_for_getopt_spec_is_cached(self):
+        c = config_manager.ConfigurationManager(
+            use_admin_controls=True,
+            use_auto_help=False,
+            argv_source=[],
+        )
+        c.option_definitions.namespace("a")
+        c.option_definitions.a.namespace("b")
+        c.option_definitions.a.b.add_option("limit", default=0, short_form="l")
+        c.option_definitions.add_option("file", default="", is_argument=True)
+
+        o = ValueSource(["-l", "10", "f.txt"])
+        self.assertEqual(
+            o.get_values(c, False), {"a": {"b": {"limit": "10"}}, "file": "f.txt"}
+        )
+        spec = o._get_getopt_spec(c.option_definitions)
+        self.assertEqual(spec[2]["l"], "a.b.limit")
+        self.assertEqual(spec[3], ["file"])
+        o.get_values(c, True)
+        self.assertTrue(o._get_getopt_spec(c.option_definitions) is spec)
+
+        # a change to the keys makes a new spec
+        c.option_definitions.add_option("verbose", default=False, short_form="v")
+        o.argv_source = ["-v", "-l", "10"]
+        self.assertEqual(
+            o.get_values(c, False), {"a": {"b": {"limit": "10"}}, "verbose": True}
+        )
+        self.assertTrue(o._get_getopt_spec(c.option_definitions) is not spec)
+        self.assertTrue("v" in o._get_getopt_spec(c.option_definitions)[0])
+
+        # so does a change to how an Option appears in it
+        spec = o._get_getopt_spec(c.option_definitions)
+        c.option_definitions.verbose.short_form = "V"
+        o.argv_source = ["-V"]
+        self.assertEqual(o.get_values(c, False), {"verbose": True})
+        c.option_definitions.verbose.default = 0
+        spec = o._get_getopt_spec(c.option_definitions)
+        self.assertTrue("V:" in spec[0])
+        self.assertTrue("verbose=" in spec[1])
+        self.assertEqual(spec[3], ["file"])
+        c.option_definitions.verbose.is_argument = True
+        o.argv_source = ["f.txt", "3"]
+        self.assertEqual(o.get_values(c, False), {"file": "f.txt", "verbose": "3"})
+
+    # --------------------------------------------------------------------------
+    def test_for_getopt_spec_checks_only_changed_keys(self):
+        c = config_manager.ConfigurationManager(
+            use_admin_controls=True,
+            use_auto_help=False,
+            argv_source=[],
+        )
+        c.option_definitions.add_option("limit", default=0, short_form="l")
+        c.option_definitions.add_option("verbose", default=False, short_form="v")
+        o = ValueSource(["-l", "10"])
+
+        # during the overlay, only the keys that the configuration manager
+        # has listed as changed since the last pass are looked at
+        c._changed_keys = []
+        self.assertEqual(o.get_values(c, True), {"limit": "10"})
+        spec = o._get_getopt_spec(c.option_definitions, c._changed_keys)
+        with patch.object(
+            ValueSource, "_signature_entry", side_effect=ValueSource._signature_entry
+        ) as signature_entry:
+            self.assertEqual(o.get_values(c, True), {"limit": "10"})
+            self.assertEqual(signature_entry.call_count, 0)
+            c.option_definitions.verbose.short_form = "V"
+            c._changed_keys.append("verbose")
+            o.argv_source = ["-V"]
+            self.assertEqual(o.get_values(c, True), {"verbose": True})
+            self.assertEqual(
+                signature_entry.call_args_list[0],
+                call(c.option_definitions, "verbose"),
+            )
+        self.assertTrue(
+            o._get_getopt_spec(c.option_definitions, c._changed_keys) is not spec
+        )
+
+        # a change that is not listed is not seen until the overlay is over
+        spec = o._get_getopt_spec(c.option_definitions, c._changed_keys)
+        c.option_definitions.limit.short_form = "m"
+        self.assertTrue(
+            o._get_getopt_spec(c.option_definitions, c._changed_keys) is spec
+        )
+        c._changed_keys = None
+        o.argv_source = ["-m", "3"]
+        self.assertEqual(o.get_values(c, True), {"limit": "3"})
+
     # --------------------------------------------------------------------------
     def test_for_getopt_get_values_with_aggregates(self):
         c = config_manager.ConfigurationManager(
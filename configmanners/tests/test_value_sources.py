@@ -0,0 +1,223 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+import collections.abc
+import getopt
+import json
+import importlib
+import os
+import subprocess
+import sys
+import types
+import unittest
+
+import configmanners.value_sources as value_sources
+from configmanners.value_sources import (
+    DispatchByType,
+    for_getopt,
+    for_json,
+    for_mapping,
+    for_modules,
+)
+from configmanners.value_sources.source_exceptions import (
+    ModuleHandlesNothingException,
+    NoHandlerForType,
+)
+
+
+# ==============================================================================
+class TestCase(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_get_handlers(self):
+        get_handlers = value_sources.type_handler_dispatch.get_handlers
+        # handlers for the object itself come before those for its type
+        self.assertEqual(list(get_handlers(json))[:2], [for_json, for_modules])
+        self.assertEqual(list(get_handlers(getopt))[0], for_getopt)
+        self.assertEqual(list(get_handlers(types))[0], for_modules)
+        self.assertEqual(list(get_handlers(os.environ)), [for_mapping])
+        self.assertEqual(list(get_handlers({})), [for_mapping])
+        self.assertEqual(list(get_handlers([])), [for_getopt])
+        self.assertRaises(NoHandlerForType, get_handlers, 17)
+        # the cached answers are the same and can't be changed by the caller
+        handlers = get_handlers(json)
+        handlers.discard(for_json)
+        self.assertEqual(list(get_handlers(json))[:2], [for_json, for_modules])
+
+    # --------------------------------------------------------------------------
+    def test_register(self):
+        dispatch = DispatchByType(list)
+        dispatch.register(collections.abc.Mapping, for_mapping)
+        dispatch.register(collections.abc.Mapping, for_mapping)
+        self.assertEqual(list(dispatch.get_handlers({})), [for_mapping])
+        self.assertRaises(NoHandlerForType, dispatch.get_handlers, 17)
+        # registering clears the cached answers
+        dispatch.register(int, for_json)
+        self.assertEqual(list(dispatch.get_handlers(17)), [for_json])
+        dispatch.register(dict, for_json)
+        self.assertEqual(list(dispatch.get_handlers({})), [for_mapping, for_json])
+        # an unhashable object is registered by its type
+        dispatch.register([], for_getopt)
+        self.assertEqual(list(dispatch.get_handlers([1])), [for_getopt])
+        # so are direct changes to the keys
+        del dispatch[int]
+        self.assertRaises(NoHandlerForType, dispatch.get_handlers, 17)
+        dispatch[int] = [for_getopt]
+        self.assertEqual(list(dispatch.get_handlers(17)), [for_getopt])
+        # changes to the lists in place need an explicit clear
+        dispatch[int].append(for_json)
+        dispatch.clear_cache()
+        self.assertEqual(list(dispatch.get_handlers(17)), [for_getopt, for_json])
+
+    # --------------------------------------------------------------------------
+    def test_register_name(self):
+        dispatch = DispatchByType(list)
+        # a module that has been imported is registered at once
+        dispatch.register_name("json", for_json)
+        self.assertEqual(list(dispatch[json]), [for_json])
+        # the others wait for a candidate that is, or is an instance of, them
+        dispatch.register_name("for_testing", for_modules)
+        dispatch.register_name("for_testing.Thing", for_mapping)
+        self.assertRaises(NoHandlerForType, dispatch.get_handlers, 17)
+        self.assertEqual(
+            sorted(dispatch._unresolved), ["for_testing", "for_testing.Thing"]
+        )
+        a_module = types.ModuleType("for_testing")
+
+        class Thing(object):
+            __module__ = "for_testing"
+            __qualname__ = "Thing"
+
+        class SubThing(Thing):
+            pass
+
+        a_module.Thing = Thing
+        self.assertEqual(list(dispatch.get_handlers(SubThing())), [for_mapping])
+        self.assertEqual(list(dispatch.get_handlers(Thing())), [for_mapping])
+        self.assertEqual(list(dispatch.get_handlers(a_module)), [for_modules])
+        self.assertEqual(dispatch._unresolved, {})
+
+    # --------------------------------------------------------------------------
+    def test_register_handler(self):
+        a_handler = types.ModuleType("for_testing")
+        a_handler.can_handle = (complex,)
+        a_handler.file_name_extension = "testing"
+
+        class ValueSource(object):
+            @staticmethod
+            def write(source_mapping, output_stream):
+                pass
+
+        a_handler.ValueSource = ValueSource
+        saved_types = value_sources.type_handler_dispatch.copy()
+        saved_extensions = value_sources.file_extension_dispatch.copy()
+        saved_handlers = list(value_sources.for_handlers)
+        try:
+            value_sources.register_handler(a_handler)
+            self.assertEqual(
+                list(value_sources.type_handler_dispatch.get_handlers(1j)),
+                [a_handler],
+            )
+            self.assertTrue(value_sources.has_registration_for("testing"))
+            self.assertTrue(a_handler in value_sources.for_handlers)
+            # the handlers are modules, each there once
+            value_sources.register_handler(for_json)
+            handlers = value_sources.for_handlers
+            self.assertTrue(all(isinstance(x, types.ModuleType) for x in handlers))
+            self.assertEqual(handlers.count(for_json), 1)
+            self.assertRaises(
+                ModuleHandlesNothingException,
+                value_sources.register_handler,
+                types.ModuleType("for_nothing"),
+            )
+        finally:
+            value_sources.type_handler_dispatch.clear()
+            value_sources.type_handler_dispatch.update(saved_types)
+            value_sources.type_handler_dispatch.clear_cache()
+            value_sources.file_extension_dispatch.clear()
+            value_sources.file_extension_dispatch.update(saved_extensions)
+            value_sources.for_handlers[:] = saved_handlers
+        self.assertRaises(
+            NoHandlerForType, value_sources.type_handler_dispatch.get_handlers, 1j
+        )
+
+    # --------------------------------------------------------------------------
+    def test_handler_declarations_match_handlers(self):
+        declared_names = [x[0] for x in value_sources._handler_declarations]
+        # every handler module in the package is declared, in the order that
+        # they are registered.  They are found without importing them: a
+        # handler module is one that says what it can handle
+        handler_names = set()
+        for a_file_name in os.listdir(value_sources.__path__[0]):
+            if not (a_file_name.startswith("for_") and a_file_name.endswith(".py")):
+                continue
+            with open(os.path.join(value_sources.__path__[0], a_file_name)) as f:
+                if "\ncan_handle = " in f.read():
+                    handler_names.add(a_file_name[:-3])
+        self.assertEqual(sorted(declared_names), sorted(handler_names))
+        self.assertEqual(
+            [
+                x.__name__.rpartition(".")[2]
+                for x in value_sources.for_handlers[: len(declared_names)]
+            ],
+            declared_names,
+        )
+        for a_name, can_handle, file_name_extension in (
+            value_sources._handler_declarations
+        ):
+            with self.subTest(a_name):
+                try:
+                    a_handler = importlib.import_module(
+                        "configmanners.value_sources.%s" % a_name
+                    )
+                except ImportError as x:
+                    # an optional dependency, like yaml, is not installed
+                    self.skipTest(str(x))
+                self.assertEqual(
+                    [
+                        value_sources._resolve_name(x) if isinstance(x, str) else x
+                        for x in can_handle
+                    ],
+                    list(a_handler.can_handle),
+                )
+                self.assertEqual(
+                    getattr(a_handler, "file_name_extension", None),
+                    file_name_extension,
+                )
+
+    # --------------------------------------------------------------------------
+    def test_handlers_are_imported_when_needed(self):
+        program = "\n".join(
+            [
+                "import sys",
+                "from configmanners import value_sources",
+                "def loaded():",
+                "    return set(",
+                "        name.rpartition('.')[2] for name in sys.modules",
+                "        if name.startswith('configmanners.value_sources.for_')",
+                "    )",
+                "print(sorted(loaded()), 'yaml' in sys.modules)",
+                "value_sources.type_handler_dispatch.get_handlers({})",
+                "print(sorted(loaded()))",
+                "import yaml",
+                "handlers = value_sources.type_handler_dispatch.get_handlers(yaml)",
+                "print([x.__name__.rpartition('.')[2] for x in handlers])",
+            ]
+        )
+        # a fresh interpreter, run where it can import this configmanners
+        output = subprocess.check_output(
+            [sys.executable, "-c", program],
+            cwd=os.path.dirname(os.path.dirname(value_sources.__path__[0])),
+            universal_newlines=True,
+        )
+        self.assertEqual(
+            output.splitlines(),
+            [
+                "[] False",
+                "['for_mapping']",
+                "['for_yaml', 'for_modules']",
+            ],
+        )
+
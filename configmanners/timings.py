@@ -0,0 +1,140 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""instrumentation for the phases of ConfigurationManager startup.  A
+ConfigurationManager created with the 'timings' parameter records the wall
+clock time, cpu time and item counts of each phase of its work and of each
+call to a value source.  The results are available as a dict from the
+'get_timings' method of the ConfigurationManager."""
+
+import contextlib
+import time
+
+
+# ==============================================================================
+class Timings(object):
+    """a recorder of named phases and of value source calls.  Each use of a
+    phase is kept in the order that it happened, along with running totals
+    for each phase name.  A record is a dict with the keys 'wall', 'cpu' and
+    'items'.  The code being timed may set 'items' to the number of things
+    it processed."""
+
+    # counting the items may cost something of its own, so it is only to be
+    # done when this is true
+    enabled = True
+
+    # --------------------------------------------------------------------------
+    def __init__(self, wall_clock=time.perf_counter, cpu_clock=time.process_time):
+        """parameters:
+        wall_clock - a function returning the elapsed wall clock time in
+                     seconds
+        cpu_clock - a function returning the cpu time of the process in
+                    seconds"""
+        self.wall_clock = wall_clock
+        self.cpu_clock = cpu_clock
+        self.phases = []
+        self.phase_totals = {}
+        self.value_sources = {}
+
+    # --------------------------------------------------------------------------
+    @contextlib.contextmanager
+    def _timed(self, record):
+        start_wall = self.wall_clock()
+        start_cpu = self.cpu_clock()
+        try:
+            yield record
+        finally:
+            record["wall"] = self.wall_clock() - start_wall
+            record["cpu"] = self.cpu_clock() - start_cpu
+
+    # --------------------------------------------------------------------------
+    @contextlib.contextmanager
+    def phase(self, name):
+        """a context manager that times a named phase of work.
+
+        parameters:
+            name - the name of the phase, phases used more than once, like
+                   the passes of the overlay expansion loop, accumulate in
+                   the totals"""
+        record = {"name": name, "wall": 0.0, "cpu": 0.0, "items": 0}
+        self.phases.append(record)
+        with self._timed(record):
+            yield record
+        totals = self.phase_totals.setdefault(
+            name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "items": 0}
+        )
+        self._accumulate(totals, record)
+
+    # --------------------------------------------------------------------------
+    @contextlib.contextmanager
+    def value_source(self, index, identity):
+        """a context manager that times a single call to a value source.
+
+        parameters:
+            index - the position of the value source in the values source
+                    list.  Identities are not unique, so this serves as the key
+            identity - the value source's description of itself"""
+        record = {"wall": 0.0, "cpu": 0.0, "items": 0}
+        with self._timed(record):
+            yield record
+        totals = self.value_sources.setdefault(
+            index,
+            {
+                "identity": str(identity),
+                "calls": 0,
+                "wall": 0.0,
+                "cpu": 0.0,
+                "items": 0,
+            },
+        )
+        self._accumulate(totals, record)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _accumulate(totals, record):
+        totals["calls"] += 1
+        totals["wall"] += record["wall"]
+        totals["cpu"] += record["cpu"]
+        totals["items"] += record["items"]
+
+    # --------------------------------------------------------------------------
+    def as_dict(self):
+        """return the recorded timings as a structure of plain dicts and lists
+        suitable for serialization:
+
+            {
+                'phases': [{'name': ..., 'wall': ..., 'cpu': ..., 'items': ...}],
+                'totals': {name: {'calls': ..., 'wall': ..., ...}},
+                'value_sources': [{'identity': ..., 'calls': ..., ...}],
+            }
+        """
+        return {
+            "phases": [dict(a_record) for a_record in self.phases],
+            "totals": {
+                name: dict(totals) for name, totals in self.phase_totals.items()
+            },
+            "value_sources": [
+                dict(self.value_sources[index])
+                for index in sorted(self.value_sources)
+            ],
+        }
+
+
+# ==============================================================================
+class NoTimings(object):
+    """the recorder used when timings are not wanted.  It does nothing."""
+
+    enabled = False
+
+    # --------------------------------------------------------------------------
+    def phase(self, name):
+        return contextlib.nullcontext({})
+
+    # --------------------------------------------------------------------------
+    def value_source(self, index, identity):
+        return contextlib.nullcontext({})
+
+    # --------------------------------------------------------------------------
+    def as_dict(self):
+        return {}
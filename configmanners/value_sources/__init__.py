@@ -3,8 +3,11 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 
-import collections
+import collections.abc
+import importlib
 import os
+import sys
+import types
 
 from configmanners.value_sources.source_exceptions import (
     NoHandlerForType,
@@ -19,37 +22,182 @@ from configmanners.converters import str_to_python_object, to_str
 from configmanners.config_file_future_proxy import ConfigFileFutureProxy
 from configmanners.config_exceptions import CannotConvertError
 
-# replace with dynamic discovery and loading
-from configmanners.value_sources import for_argparse
-
-# from configmanners.value_sources import or_xml
-from configmanners.value_sources import for_getopt
-from configmanners.value_sources import for_json
-from configmanners.value_sources import for_yaml
-from configmanners.value_sources import for_conf
-from configmanners.value_sources import for_mapping
-from configmanners.value_sources import for_configobj
-from configmanners.value_sources import for_modules
-
-# please replace with dynamic discovery
-for_handlers = [
-    for_argparse,
-    for_mapping,
-    for_getopt,
-    for_json,
-    for_yaml,
-    for_conf,
-    for_configobj,
-    for_modules,
-]
+# the handler modules of this package are not imported until they are needed.
+# Each is declared here with copies of its 'can_handle' and
+# 'file_name_extension' attributes.  Within 'can_handle', strings are the
+# names of objects, "module" or "module.attribute", that are not imported
+# just for the sake of the declaration.  The handlers are tried in this order.
+_handler_declarations = (
+    ("for_argparse", ("argparse",), None),
+    ("for_mapping", (os.environ, collections.abc.Mapping), "env"),
+    ("for_getopt", ("getopt", list), None),
+    ("for_json", (bytes, str, "json"), "json"),
+    ("for_yaml", (bytes, str, "yaml"), "yml"),
+    ("for_conf", (bytes, str, types.FunctionType), "conf"),
+    ("for_configobj", ("configobj", "configobj.ConfigObj", bytes, str), "ini"),
+    ("for_modules", (types.ModuleType, bytes, str), "py"),
+)
+
+# the handlers, modules or the names of modules, in the order they were
+# registered.  The first use of 'for_handlers' imports them all, and this list
+# then becomes 'for_handlers'
+_handlers = []
+
+
+# ------------------------------------------------------------------------------
+def __getattr__(name):
+    """'for_handlers' is the list of the handler modules, imported when it is
+    first asked for"""
+    if name != "for_handlers":
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    _handlers[:] = [_import_handler(a_handler) for a_handler in _handlers]
+    globals()["for_handlers"] = _handlers
+    return _handlers
+
+
+# ------------------------------------------------------------------------------
+def _import_handler(a_handler):
+    """a handler is either a module or the name of a module"""
+    if isinstance(a_handler, str):
+        return importlib.import_module(a_handler)
+    return a_handler
+
+
+# ------------------------------------------------------------------------------
+def _name_of(an_object):
+    """the "module" or "module.attribute" name of a module or a class"""
+    if isinstance(an_object, types.ModuleType):
+        return an_object.__name__
+    return "%s.%s" % (an_object.__module__, an_object.__qualname__)
+
+
+# ------------------------------------------------------------------------------
+def _resolve_name(a_name):
+    """return the object named "module" or "module.attribute".  A KeyError is
+    raised if the module has not been imported yet."""
+    try:
+        return sys.modules[a_name]
+    except KeyError:
+        module_name, _, attribute = a_name.rpartition(".")
+        return getattr(sys.modules[module_name], attribute)
 
 
 # ==============================================================================
 # create a dispatch table of types/objects to modules.  Each type should have
 # a list of modules that can handle that type.
 class DispatchByType(collections.defaultdict):
+    """the results of 'get_handlers' are cached by the type of the candidate
+    or, for candidates that are keys themselves like the 'json' module, by
+    the candidate.  Setting and deleting items clears the cache.  Handlers
+    should be added with 'register'.  Other changes, like those made to the
+    lists of handlers in place or with 'update', must be followed by a call
+    to 'clear_cache'.
+
+    A handler may be given as the name of its module, which is then imported
+    when 'get_handlers' first returns it."""
+
+    # --------------------------------------------------------------------------
+    def __init__(self, *args, **kwargs):
+        super(DispatchByType, self).__init__(*args, **kwargs)
+        # name -> list of the handlers registered with 'register_name' for
+        # objects that had not been imported yet
+        self._unresolved = {}
+        # the types of candidates already checked against '_unresolved'
+        self._types_seen = set()
+        self.clear_cache()
+
+    # --------------------------------------------------------------------------
+    def __setitem__(self, key, value):
+        super(DispatchByType, self).__setitem__(key, value)
+        self.clear_cache()
+
+    # --------------------------------------------------------------------------
+    def __delitem__(self, key):
+        super(DispatchByType, self).__delitem__(key)
+        self.clear_cache()
+
+    # --------------------------------------------------------------------------
+    def clear_cache(self):
+        # the keys that candidates are compared against by identity
+        self._keys_by_id = None
+        # key -> OrderedSet of handlers, for candidates that are keys
+        self._handlers_by_key = {}
+        # type -> OrderedSet of handlers, for all other candidates
+        self._handlers_by_type = {}
+
+    # --------------------------------------------------------------------------
+    def register(self, a_supported_value_source, a_handler):
+        """add a handler for a type or object.  An object that is not
+        hashable is registered by its type instead."""
+        try:
+            handlers = self[a_supported_value_source]
+        except TypeError:
+            # likely this is an instance of a handleable type that is not
+            # hashable. Replace it with its base type and try to continue.
+            handlers = self[type(a_supported_value_source)]
+        if a_handler not in handlers:
+            handlers.append(a_handler)
+        self.clear_cache()
+
+    # --------------------------------------------------------------------------
+    def register_name(self, a_name, a_handler):
+        """add a handler for the module or class named "module" or
+        "module.attribute" without importing the module.  If something else
+        has imported it, the handler is registered at once.  If not, no
+        candidate can be, or be an instance of, the named object until it is
+        imported.  The handler is registered when 'get_handlers' is first
+        given such a candidate."""
+        try:
+            a_supported_value_source = _resolve_name(a_name)
+        except (KeyError, AttributeError):
+            self._unresolved.setdefault(a_name, []).append(a_handler)
+            self._types_seen.clear()
+        else:
+            self.register(a_supported_value_source, a_handler)
+
+    # --------------------------------------------------------------------------
+    def _resolve_names_for(self, candidate):
+        """register the handlers of the unresolved names of the candidate, if
+        it is a module or a class, and of its types"""
+        named_objects = []
+        if isinstance(candidate, (types.ModuleType, type)):
+            named_objects.append(candidate)
+        a_type = type(candidate)
+        if a_type not in self._types_seen:
+            self._types_seen.add(a_type)
+            named_objects.extend(a_type.__mro__)
+        for an_object in named_objects:
+            for a_handler in self._unresolved.pop(_name_of(an_object), ()):
+                self.register(an_object, a_handler)
+
     # --------------------------------------------------------------------------
     def get_handlers(self, candidate):
+        """return an OrderedSet of the handler modules for the candidate.
+        Handlers registered for the candidate itself come first, followed by
+        those registered for types of which it is an instance."""
+        if self._unresolved:
+            self._resolve_names_for(candidate)
+        keys_by_id = self._keys_by_id
+        if keys_by_id is None:
+            keys_by_id = self._keys_by_id = {id(key): key for key in self}
+        if keys_by_id.get(id(candidate), self) is candidate:
+            cache, cache_key = self._handlers_by_key, candidate
+        else:
+            cache, cache_key = self._handlers_by_type, type(candidate)
+        try:
+            handlers_set = cache[cache_key]
+        except KeyError:
+            handlers_set = cache[cache_key] = OrderedSet(
+                _import_handler(a_handler)
+                for a_handler in self._find_handlers(candidate)
+            )
+        if not handlers_set:
+            raise NoHandlerForType("no hander for %s is available" % candidate)
+        # a copy, so that the cached set can't be changed by the caller
+        return OrderedSet(handlers_set)
+
+    # --------------------------------------------------------------------------
+    def _find_handlers(self, candidate):
         handlers_set = OrderedSet()
         # find exact candidate matches first
         for key, handler_list in self.items():
@@ -61,8 +209,6 @@ class DispatchByType(collections.defaultdict):
             if self._is_instance_of(candidate, key):
                 for a_handler in handler_list:
                     handlers_set.add(a_handler)
-        if not handlers_set:
-            raise NoHandlerForType("no hander for %s is available" % candidate)
         return handlers_set
 
     # --------------------------------------------------------------------------
@@ -74,26 +220,39 @@ class DispatchByType(collections.defaultdict):
             return False
 
 
-# ------------------------------------------------------------------------------
 type_handler_dispatch = DispatchByType(list)
-for a_handler in for_handlers:
+file_extension_dispatch = {}
+
+
+# ------------------------------------------------------------------------------
+def _writer(a_handler_name):
+    """stands in for the 'write' function of the ValueSource of a handler
+    that has not been imported yet"""
+
+    def write(*args, **kwargs):
+        a_handler = _import_handler(a_handler_name)
+        return a_handler.ValueSource.write(*args, **kwargs)
+
+    return write
+
+
+# ------------------------------------------------------------------------------
+def register_handler(a_handler):
+    """add a value source module, like those in this package, to the
+    dispatch tables.  The module must have a 'can_handle' sequence of the
+    types and objects that it can handle.  If it also has a
+    'file_name_extension' and a ValueSource class, it is registered as the
+    writer for that file name extension."""
     try:
-        for a_supported_value_source in a_handler.can_handle:
-            try:
-                type_handler_dispatch[a_supported_value_source].append(a_handler)
-            except TypeError:
-                # likely this is an instance of a handleable type that is not
-                # hashable. Replace it with its base type and try to continue.
-                type_handler_dispatch[type(a_supported_value_source)].append(a_handler)
+        can_handle = a_handler.can_handle
     except AttributeError:
         # this module has no can_handle attribute, therefore cannot really
         # be a handler and an error should be raised
         raise ModuleHandlesNothingException(
             "%s has no 'can_handle' attribute" % str(a_handler)
         )
-
-file_extension_dispatch = {}
-for a_handler in for_handlers:
+    for a_supported_value_source in can_handle:
+        type_handler_dispatch.register(a_supported_value_source, a_handler)
     try:
         file_extension_dispatch[
             a_handler.file_name_extension
@@ -102,6 +261,32 @@ for a_handler in for_handlers:
         # this handler doesn't have a 'file_name_extension' or ValueSource
         # therefore it is not eligible for the write file dispatcher
         pass
+    # the handler may already be there, as a module or by the name of one
+    a_name = getattr(a_handler, "__name__", None)
+    if a_handler not in _handlers and a_name not in _handlers:
+        _handlers.append(a_handler)
+
+
+# ------------------------------------------------------------------------------
+def _declare_handler(a_handler_name, can_handle, file_name_extension):
+    """register a handler by the name of its module, without importing it.
+    Objects in 'can_handle' given as strings are registered by name."""
+    for a_supported_value_source in can_handle:
+        if isinstance(a_supported_value_source, str):
+            type_handler_dispatch.register_name(
+                a_supported_value_source, a_handler_name
+            )
+        else:
+            type_handler_dispatch.register(a_supported_value_source, a_handler_name)
+    if file_name_extension is not None:
+        file_extension_dispatch[file_name_extension] = _writer(a_handler_name)
+    _handlers.append(a_handler_name)
+
+
+for a_module_name, a_can_handle, a_file_name_extension in _handler_declarations:
+    _declare_handler(
+        "%s.%s" % (__name__, a_module_name), a_can_handle, a_file_name_extension
+    )
 
 
 # ------------------------------------------------------------------------------
@@ -179,6 +364,8 @@ def dispatch_request_to_write(config_file_type, options_mapping, opener):
 
 # ------------------------------------------------------------------------------
 def config_filename_from_commandline(config_manager):
+    from configmanners.value_sources import for_getopt
+
     command_line_value_source = for_getopt.ValueSource(
         for_getopt.getopt, config_manager
     )
@@ -0,0 +1,171 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""a process wide cache of parsed config files.  The value sources that read
+files, like json, yaml, conf and ini files, parse each file through this
+cache so that an unchanged file is not parsed again when another
+ConfigurationManager is made.  A file is known by its real path, its
+modification time and its size.  If any of those change, the file is parsed
+again.  So it is if any of the other things that it depends on change, like
+the files it includes or the set of files that an include pattern matches."""
+
+import glob
+import os
+import time
+
+from configmanners.memoize import LRUCache
+
+# a file changed this recently, in nanoseconds, may be changed again without
+# a change to its modification time, so it is not cached.  This is the size
+# of the coarsest timestamps in common file systems.
+RECENT_CHANGE_NS = 2 * 10**9
+
+
+# ------------------------------------------------------------------------------
+def file_signature(file_name):
+    """return the modification time in nanoseconds and the size of a file.
+    An OSError is raised if the file can't be found."""
+    stat = os.stat(file_name)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# ------------------------------------------------------------------------------
+def dependency_signature(a_dependency):
+    """return the current signature of something that a parsed file depends
+    on: that of the file for a file name, otherwise what the 'signature'
+    method of the dependency returns"""
+    if isinstance(a_dependency, str):
+        return file_signature(a_dependency)
+    return a_dependency.signature()
+
+
+# ==============================================================================
+class GlobDependency(object):
+    """a dependency on the set of files that a glob pattern matches.  A file
+    that includes all the files matching a pattern must be parsed again when
+    a matching file is added or removed, even if none of the files that it
+    read has changed."""
+
+    # --------------------------------------------------------------------------
+    def __init__(self, pattern, file_names):
+        """
+        parameters:
+            pattern - the glob pattern
+            file_names - the names that the pattern matched when the files
+                         were read
+        """
+        self.pattern = pattern
+        self.read_signature = tuple(sorted(file_names))
+
+    # --------------------------------------------------------------------------
+    def signature(self):
+        return tuple(sorted(glob.glob(self.pattern)))
+
+
+# ==============================================================================
+class ParsedFileCache(object):
+    """a least recently used cache of the results of parsing files.  The
+    cached results are shared by everything that asks for the same file, so
+    they must not be changed."""
+
+    # --------------------------------------------------------------------------
+    def __init__(self, max_size=128):
+        """
+        parameters:
+            max_size - the number of parsed files the cache can hold
+        """
+        # the keys are (real path, modification time, size, handler).  The
+        # values are (parsed contents, the other things that it depends on
+        # with their signatures when it was made)
+        self._cache = LRUCache(max_size)
+
+    # --------------------------------------------------------------------------
+    def get(self, file_name, handler, parse):
+        """return the parsed contents of a file, parsing it only if it is not
+        in the cache or has changed.
+
+        parameters:
+            file_name - the name of the file
+            handler - the name of what parses the file, the same file may be
+                      parsed differently by different handlers
+            parse - a function that takes the real path of the file and
+                    returns a tuple: the parsed contents and a sequence of
+                    what else they depend on.  That is the names of any
+                    other files, like includes, that were read or objects,
+                    like GlobDependency, with a 'signature' method and the
+                    'read_signature' that it had while parsing.  The parsed
+                    contents are made again if any of those change.
+                    Exceptions are passed on and nothing is cached.
+
+        Files changed within the last RECENT_CHANGE_NS are parsed every time.
+        """
+        path = os.path.realpath(file_name)
+        key = (path,) + file_signature(path) + (handler,)
+        try:
+            parsed, dependencies = self._cache.get(key)
+        except KeyError:
+            pass
+        else:
+            try:
+                if all(
+                    dependency_signature(a_dependency) == signature
+                    for a_dependency, signature in dependencies
+                ):
+                    return parsed
+            except OSError:
+                # one of the other files is gone
+                pass
+        parsed, other_dependencies = parse(path)
+        dependencies = []
+        for a_dependency in other_dependencies:
+            if not isinstance(a_dependency, str):
+                dependencies.append((a_dependency, a_dependency.read_signature))
+            elif a_dependency != path:
+                dependencies.append((a_dependency, file_signature(a_dependency)))
+        recently = time.time_ns() - RECENT_CHANGE_NS
+        if key[1] > recently or any(
+            signature[0] > recently
+            for a_dependency, signature in dependencies
+            if isinstance(a_dependency, str)
+        ):
+            return parsed
+        # a dependency that changed while parsing would never match again
+        if any(
+            dependency_signature(a_dependency) != signature
+            for a_dependency, signature in dependencies
+            if not isinstance(a_dependency, str)
+        ):
+            return parsed
+        # older versions of the same file are of no further use
+        self._discard(lambda a_key: a_key[0] == path and a_key[3] == handler)
+        self._cache.put(key, (parsed, tuple(dependencies)))
+        return parsed
+
+    # --------------------------------------------------------------------------
+    def _discard(self, predicate):
+        for a_key in self._cache:
+            if predicate(a_key):
+                self._cache.discard(a_key)
+
+    # --------------------------------------------------------------------------
+    def invalidate(self, file_name=None):
+        """drop the parsed contents of a file from the cache, or of all files
+        if no name is given"""
+        if file_name is None:
+            self._cache.clear()
+            return
+        path = os.path.realpath(file_name)
+        self._discard(lambda a_key: a_key[0] == path)
+
+    # --------------------------------------------------------------------------
+    def info(self):
+        """return the CacheInfo of the underlying cache"""
+        return self._cache.info()
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._cache)
+
+
+parsed_file_cache = ParsedFileCache()
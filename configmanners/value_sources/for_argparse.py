@@ -33,7 +33,7 @@ classes so that we can use class identity as a differention mechanism.
 import argparse
 import copy
 
-import collections
+import collections.abc
 
 from configmanners.option import Option
 from configmanners.dotdict import DotDict
@@ -42,6 +42,7 @@ from configmanners.converters import (
     to_str,
 )
 from configmanners.namespace import Namespace
+from configmanners.orderedset import OrderedSet
 
 is_command_line_parser = True
 
@@ -273,8 +274,15 @@ class ParserContainer(object):
                 )
                 self.subparsers[subparser_name] = local_subparser
 
-        # add the actual arguments to the appropriate main or subparsers
-        for args_for_an_argparse_argument in self.arguments_for_building_argparse:
+        self.add_arguments(main_parser, self.arguments_for_building_argparse)
+
+        return main_parser
+
+    # --------------------------------------------------------------------------
+    def add_arguments(self, main_parser, arguments):
+        """add the actual arguments to the appropriate main or subparsers of a
+        parser made by 'create_argparse_parser'"""
+        for args_for_an_argparse_argument in arguments:
             args = args_for_an_argparse_argument.args
             kwargs = args_for_an_argparse_argument.kwargs
             owning_subparser_name = args_for_an_argparse_argument.get(
@@ -286,8 +294,6 @@ class ParserContainer(object):
             else:
                 main_parser.add_argument(*args, **kwargs)
 
-        return main_parser
-
     # --------------------------------------------------------------------------
     def _add_argument_from_original_source(self, qualified_name, option):
         argparse_foreign_data = option.foreign_data.argparse
@@ -374,6 +380,29 @@ class ParserContainer(object):
             self._add_argument_from_configmanners_option(qualified_name, option)
 
 
+# ==============================================================================
+class _IntermediateParser(object):
+    """the parser used for the passes of the overlay and what it was made
+    from.  'parsed' is the result of parsing the command line with the parser
+    as it is now, None until that has been done."""
+
+    # --------------------------------------------------------------------------
+    def __init__(self, definitions, app, container, options, parser):
+        self.definitions = definitions
+        self.app = app
+        self.container = container
+        # the Options that have arguments in the parser by their names, each
+        # with the shape of its argument.  See 'ValueSource._argument_shape'
+        self.options = options
+        self.parser = parser
+        self.parsed = None
+        # the '_changed_keys' list of the configuration manager, if the
+        # parser was last brought up to date during an overlay, and how many
+        # of those keys it had then
+        self.changed_keys = None
+        self.number_of_changed_keys = 0
+
+
 # ==============================================================================
 class ValueSource(object):
     """The ValueSource implementation for the argparse module.  This class will
@@ -388,6 +417,9 @@ class ValueSource(object):
         self.argv_source = tuple(conf_manager.argv_source)
 
         self.identity = "argparse"
+        # the parser used for the passes of the overlay, kept from one pass
+        # to the next.  See '_get_intermediate_parser'
+        self._intermediate = None
 
     # frequently, command line data sources must be treated differently.  For
     # example, even when the overall option for configmanners is to allow
@@ -466,24 +498,20 @@ class ValueSource(object):
     # --------------------------------------------------------------------------
     def get_values(self, config_manager, ignore_mismatches, object_hook=None):
         if ignore_mismatches:
-            self.extra_args = []
-            parser = self._create_new_argparse_instance(
-                {
-                    "main_parser_class": HelplessconfigmannersParser,
-                    "subparser_class": HelplessIntermediateconfigmannersSubParser,
-                    "admin_parser_class": HelplessconfigmannersAdminParser,
-                },
-                config_manager,
-                False,  # create auto help
-            )
-            namespace_and_extra_args = parser.parse_known_args(args=self.argv_source)
-
-            try:
-                argparse_namespace, unused_args = namespace_and_extra_args
-                self.extra_args.extend(unused_args)
-            except TypeError:
-                argparse_namespace = argparse.Namespace()
-                self.extra_args.extend(namespace_and_extra_args)
+            intermediate = self._get_intermediate_parser(config_manager)
+            parser = intermediate.parser
+            if intermediate.parsed is None:
+                namespace_and_extra_args = parser.parse_known_args(
+                    args=self.argv_source
+                )
+                try:
+                    argparse_namespace, unused_args = namespace_and_extra_args
+                except TypeError:
+                    argparse_namespace = argparse.Namespace()
+                    unused_args = namespace_and_extra_args
+                intermediate.parsed = (argparse_namespace, list(unused_args))
+            argparse_namespace, unused_args = intermediate.parsed
+            self.extra_args = list(unused_args)
 
         else:
             fake_args = self.create_fake_args(config_manager)
@@ -513,19 +541,202 @@ class ValueSource(object):
         )
 
     # --------------------------------------------------------------------------
-    def _create_new_argparse_instance(
-        self,
-        parser_classes,
-        config_manager,
-        create_auto_help,
-    ):
+    _intermediate_parser_classes = {
+        "main_parser_class": HelplessconfigmannersParser,
+        "subparser_class": HelplessIntermediateconfigmannersSubParser,
+        "admin_parser_class": HelplessconfigmannersAdminParser,
+    }
+
+    # --------------------------------------------------------------------------
+    def _get_intermediate_parser(self, config_manager):
+        """return the _IntermediateParser for a pass of the overlay.
+
+        The parser is kept from one pass to the next and the options that
+        have been defined since the last pass are added to it.  It is built
+        again from scratch if an option went away, was replaced or changed
+        the shape of its argument, like an option whose default changed from
+        a list to a string, or if a new option is an admin option, a
+        subcommand or a positional argument for a parser that already has
+        some or that gets more than one.  The admin parser is a parent
+        parser, which argparse copies when it is used, and the positional
+        arguments of a parser must be added in the order of the option
+        definitions."""
+        definitions = config_manager.option_definitions
+        intermediate = self._intermediate
+        if (
+            intermediate is None
+            or intermediate.definitions is not definitions
+            or intermediate.app
+            != (config_manager.app_name, config_manager.app_description)
+        ):
+            return self._build_intermediate_parser(config_manager)
+        new_keys = self._find_new_keys(intermediate, config_manager)
+        if new_keys is None:
+            return self._build_intermediate_parser(config_manager)
+        self._note_changed_keys(intermediate, config_manager)
+        if not new_keys:
+            return intermediate
+
+        container = intermediate.container
+        number_of_arguments = len(container.arguments_for_building_argparse)
+        number_of_admin_arguments = len(container.admin_arguments)
+        subcommand = container.subcommand
+        for opt_name in new_keys:
+            an_option = definitions[opt_name]
+            container.add_argument_from_option(opt_name, an_option)
+            intermediate.options[opt_name] = (
+                an_option,
+                self._argument_shape(an_option),
+            )
+        arguments = container.arguments_for_building_argparse
+        new_arguments = arguments[number_of_arguments:]
+        parsers_with_positionals = set(
+            self._owning_parser_name(an_argument)
+            for an_argument in arguments[:number_of_arguments]
+            if self._is_positional(an_argument)
+        )
+        if (
+            len(container.admin_arguments) != number_of_admin_arguments
+            or container.subcommand is not subcommand
+        ):
+            return self._build_intermediate_parser(config_manager)
+        for an_argument in new_arguments:
+            if self._is_positional(an_argument):
+                parser_name = self._owning_parser_name(an_argument)
+                if parser_name in parsers_with_positionals:
+                    return self._build_intermediate_parser(config_manager)
+                parsers_with_positionals.add(parser_name)
+        container.add_arguments(intermediate.parser, new_arguments)
+        intermediate.parsed = None
+        return intermediate
+
+    # --------------------------------------------------------------------------
+    def _find_new_keys(self, intermediate, config_manager):
+        """return the names of the Options that the parser does not have yet,
+        or None if an Option that it has went away, was replaced or changed
+        the shape of its argument.  During the overlay, only the Options that
+        the configuration manager has brought in or changed since the parser
+        was last brought up to date are looked at.  Otherwise, all of them
+        are."""
+        definitions = config_manager.option_definitions
+        changed_keys = getattr(config_manager, "_changed_keys", None)
+        if changed_keys is not None and changed_keys is intermediate.changed_keys:
+            keys = OrderedSet(changed_keys[intermediate.number_of_changed_keys :])
+            number_to_find = None
+        else:
+            keys = definitions.keys_breadth_first()
+            number_to_find = len(intermediate.options)
+        new_keys = []
+        number_found = 0
+        for opt_name in keys:
+            try:
+                an_option = definitions[opt_name]
+            except KeyError:
+                an_option = None
+            if not isinstance(an_option, Option):
+                if opt_name in intermediate.options:
+                    return None
+                continue
+            try:
+                known_option, shape = intermediate.options[opt_name]
+            except KeyError:
+                new_keys.append(opt_name)
+                continue
+            if known_option is not an_option or shape != self._argument_shape(
+                an_option
+            ):
+                return None
+            number_found += 1
+        if number_to_find is not None and number_found != number_to_find:
+            return None
+        return new_keys
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _note_changed_keys(intermediate, config_manager):
+        """note how far along the '_changed_keys' of the configuration
+        manager the parser has been brought up to date"""
+        changed_keys = getattr(config_manager, "_changed_keys", None)
+        intermediate.changed_keys = changed_keys
+        if changed_keys is not None:
+            intermediate.number_of_changed_keys = len(changed_keys)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _argument_shape(an_option):
+        """return what decides the argument made for an Option: whether it
+        is positional, its short form, its action and its nargs.  For an
+        Option from argparse, that is the argparse definition it came
+        from."""
+        if an_option.foreign_data is not None and "argparse" in an_option.foreign_data:
+            return (an_option.foreign_data.argparse,)
+        default = an_option.default
+        if isinstance(default, collections.abc.Sequence) and not isinstance(
+            default, (bytes, str)
+        ):
+            nargs = len(default) if an_option.is_argument else "+"
+        else:
+            nargs = None
+        return (
+            an_option.is_argument,
+            an_option.short_form,
+            an_option.from_string_converter in (bool, boolean_converter),
+            nargs,
+        )
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _is_positional(an_argument):
+        return not an_argument.args or not an_argument.args[0].startswith("-")
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _owning_parser_name(an_argument):
+        return an_argument.get("owning_subparser_name", None)
+
+    # --------------------------------------------------------------------------
+    def _build_intermediate_parser(self, config_manager):
+        definitions = config_manager.option_definitions
+        container = self._create_parser_container(
+            config_manager,
+            False,  # create auto help
+        )
+        options = {}
+        for opt_name in definitions.keys_breadth_first():
+            an_option = definitions[opt_name]
+            if isinstance(an_option, Option):
+                options[opt_name] = (an_option, self._argument_shape(an_option))
+        self._intermediate = _IntermediateParser(
+            definitions=definitions,
+            app=(config_manager.app_name, config_manager.app_description),
+            container=container,
+            options=options,
+            parser=container.create_argparse_parser(
+                **self._intermediate_parser_classes
+            ),
+        )
+        self._note_changed_keys(self._intermediate, config_manager)
+        return self._intermediate
+
+    # --------------------------------------------------------------------------
+    def _create_parser_container(self, config_manager, create_auto_help):
         a_parser = ParserContainer(
             prog=config_manager.app_name,
             # version=config_manager.app_version,
             description=config_manager.app_description,
             add_help=create_auto_help,
         )
-        self._setup_argparse(a_parser, parser_classes, config_manager)
+        self._setup_argparse(a_parser, None, config_manager)
+        return a_parser
+
+    # --------------------------------------------------------------------------
+    def _create_new_argparse_instance(
+        self,
+        parser_classes,
+        config_manager,
+        create_auto_help,
+    ):
+        a_parser = self._create_parser_container(config_manager, create_auto_help)
         main_parser = a_parser.create_argparse_parser(**parser_classes)
         return main_parser
 
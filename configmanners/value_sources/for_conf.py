@@ -25,8 +25,9 @@ from configmanners.value_sources.source_exceptions import (
     ValueException,
     CantHandleTypeException,
 )
-from configmanners.dotdict import DotDict
-from configmanners.memoize import memoize
+from configmanners.dotdict import DotDict, create_with_object_hook
+from configmanners.memoize import memoize_method
+from configmanners.value_sources.file_cache import parsed_file_cache
 
 function_type = type(lambda x: x)  # TODO: just how do you express the Fuction
 # type as a constant?
@@ -44,6 +45,38 @@ can_handle = (
 file_name_extension = "conf"
 
 
+# ------------------------------------------------------------------------------
+def _parse(opener):
+    """read the key/value lines from the context manager returned by the
+    opener into a dict"""
+    values = {}
+    with opener() as f:
+        previous_key = None
+        for line in f:
+            line = to_str(line)
+            if line.strip().startswith("#") or not line.strip():
+                continue
+            if line[0] in " \t" and previous_key:
+                line = line[1:]
+                values[previous_key] = "%s%s" % (
+                    values[previous_key],
+                    line.rstrip(),
+                )
+                continue
+            try:
+                key, value = line.split("=", 1)
+                values[key.strip()] = value.strip()
+                previous_key = key
+            except ValueError:
+                values[line] = ""
+    return values
+
+
+# ------------------------------------------------------------------------------
+def _load(path):
+    return _parse(functools.partial(open, path)), ()
+
+
 # ==============================================================================
 class NotAConfigFileError(ValueException):
     pass
@@ -57,35 +90,17 @@ class ValueSource(object):
         if isinstance(candidate, (bytes, str)):
             candidate = to_str(candidate)
         if isinstance(candidate, str) and candidate.endswith(file_name_extension):
-            # we're trusting the string represents a filename
-            opener = functools.partial(open, candidate)
+            # we're trusting the string represents a filename.  Files that
+            # haven't changed since they were last read are not parsed again
+            parse = functools.partial(parsed_file_cache.get, candidate, __name__, _load)
         elif isinstance(candidate, function_type):
             # we're trusting that the function when called with no parameters
             # will return a Context Manager Type.
-            opener = candidate
+            parse = functools.partial(_parse, candidate)
         else:
             raise CantHandleTypeException()
-        self.values = {}
         try:
-            with opener() as f:
-                previous_key = None
-                for line in f:
-                    line = to_str(line)
-                    if line.strip().startswith("#") or not line.strip():
-                        continue
-                    if line[0] in " \t" and previous_key:
-                        line = line[1:]
-                        self.values[previous_key] = "%s%s" % (
-                            self.values[previous_key],
-                            line.rstrip(),
-                        )
-                        continue
-                    try:
-                        key, value = line.split("=", 1)
-                        self.values[key.strip()] = value.strip()
-                        previous_key = key
-                    except ValueError:
-                        self.values[line] = ""
+            self.values = parse()
         except Exception as x:
             raise NotAConfigFileError(
                 "Conf couldn't interpret %s as a config file: %s" % (candidate, str(x))
@@ -94,13 +109,13 @@ class ValueSource(object):
         self.identity = to_str(candidate)
 
     # --------------------------------------------------------------------------
-    @memoize()
+    @memoize_method()
     def get_values(self, config_manager, ignore_mismatches, obj_hook=DotDict):
         """the 'config_manager' and 'ignore_mismatches' are dummy values for
         this implementation of a ValueSource."""
         if isinstance(self.values, obj_hook):
             return self.values
-        return obj_hook(initializer=self.values)
+        return create_with_object_hook(obj_hook, self.values)
 
     # --------------------------------------------------------------------------
     @staticmethod
@@ -3,6 +3,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 
+import glob
 import sys
 import re
 import os.path
@@ -20,8 +21,9 @@ from configmanners.value_sources.source_exceptions import (
 from configmanners.namespace import Namespace
 from configmanners.option import Option
 
-from configmanners.dotdict import DotDict
-from configmanners.memoize import memoize
+from configmanners.dotdict import DotDict, create_with_object_hook
+from configmanners.memoize import memoize_method
+from configmanners.value_sources.file_cache import GlobDependency, parsed_file_cache
 
 file_name_extension = "ini"
 
@@ -65,34 +67,10 @@ class ConfigObjWithIncludes(configobj.ConfigObj):
         dbname=some_database
         dbuser=dwight
         dbpassword=secrets
-    """
-
-    _include_re = re.compile(r"^(\s*)\+include\s+(.*?)\s*$")
 
-    # --------------------------------------------------------------------------
-    def _expand_files(self, file_name, original_path, indent=""):
-        """This recursive function accepts a file name, opens the file and then
-        spools the contents of the file into a list, examining each line as it
-        does so.  If it detects a line beginning with "+include", it assumes
-        the string immediately following is a file name.  Recursing, the file
-        new file is openned and its contents are spooled into the accumulating
-        list."""
-        expanded_file_contents = []
-        with open(file_name) as f:
-            for a_line in f:
-                match = ConfigObjWithIncludes._include_re.match(a_line)
-                if match:
-                    include_file = match.group(2)
-                    include_file = os.path.join(original_path, include_file)
-                    new_lines = self._expand_files(
-                        include_file,
-                        os.path.dirname(include_file),
-                        indent + match.group(1),
-                    )
-                    expanded_file_contents.extend(new_lines)
-                else:
-                    expanded_file_contents.append(indent + a_line.rstrip())
-        return expanded_file_contents
+    'db.ini' is read only once.  See IncludeGraph for glob patterns in
+    includes and for include cycles.
+    """
 
     # --------------------------------------------------------------------------
     def _load(self, infile, configspec):
@@ -100,14 +78,110 @@ class ConfigObjWithIncludes(configobj.ConfigObj):
         runs through the input file collecting lines into a list.  When
         completed, this method submits the list of lines to the super class'
         function of the same name.  ConfigObj proceeds, completely unaware
-        that it's input file has been preprocessed."""
+        that it's input file has been preprocessed.  The IncludeGraph of the
+        files read is saved in 'include_graph', their names in
+        'included_files' and the glob patterns that were expanded, with the
+        names they matched, in 'included_globs'."""
+        self.include_graph = IncludeGraph()
         if isinstance(infile, (bytes, str)):
             infile = to_str(infile)
-            original_path = os.path.dirname(infile)
-            expanded_file_contents = self._expand_files(infile, original_path)
+            expanded_file_contents = self.include_graph.expand(infile)
             super(ConfigObjWithIncludes, self)._load(expanded_file_contents, configspec)
         else:
             super(ConfigObjWithIncludes, self)._load(infile, configspec)
+        self.included_files = list(self.include_graph.expanded)
+        self.included_globs = list(self.include_graph.globs)
+
+
+# ==============================================================================
+class IncludeGraph(object):
+    """the files read while loading an ini file and the '+include' lines that
+    join them.  The name that follows '+include' is relative to the
+    including file and may be a glob pattern, like 'conf.d/*.ini', to
+    include all the matching files in sorted order.
+
+    Each file is read and expanded only once, however many times it is
+    included.  A file that includes itself, directly or through other files,
+    raises an IncludeCycleException.
+    """
+
+    _include_re = re.compile(r"^(\s*)\+include\s+(.*?)\s*$")
+
+    # --------------------------------------------------------------------------
+    def __init__(self):
+        # the real path of each file read mapped to its lines with all of its
+        # includes expanded
+        self.expanded = {}
+        # the real path of each file read mapped to the real paths of the
+        # files that it includes, in order
+        self.includes = {}
+        # the glob patterns expanded, with the names that each one matched
+        self.globs = []
+        # the real paths of the files being expanded, the last one is the
+        # innermost
+        self._being_expanded = []
+
+    # --------------------------------------------------------------------------
+    def _include_file_names(self, directory, include_name):
+        include_name = os.path.join(directory, include_name)
+        if any(c in include_name for c in "*?["):
+            file_names = sorted(glob.glob(include_name))
+            self.globs.append((include_name, file_names))
+            return file_names
+        return [include_name]
+
+    # --------------------------------------------------------------------------
+    def expand(self, file_name):
+        """return the lines of a file with each '+include' line replaced by
+        the lines of the files it names, indented like the '+include'
+        line.  The list returned is shared by every file that includes this
+        one and must not be changed."""
+        path = os.path.realpath(file_name)
+        try:
+            return self.expanded[path]
+        except KeyError:
+            pass
+        if path in self._being_expanded:
+            cycle = self._being_expanded[self._being_expanded.index(path) :]
+            raise IncludeCycleException(
+                "include cycle: %s" % " -> ".join(cycle + [path])
+            )
+        self._being_expanded.append(path)
+        try:
+            directory = os.path.dirname(file_name)
+            included = self.includes[path] = []
+            expanded_file_contents = []
+            with open(file_name) as f:
+                for a_line in f:
+                    match = self._include_re.match(a_line)
+                    if not match:
+                        expanded_file_contents.append(a_line.rstrip())
+                        continue
+                    indent = match.group(1)
+                    for include_file in self._include_file_names(
+                        directory, match.group(2)
+                    ):
+                        new_lines = self.expand(include_file)
+                        included.append(os.path.realpath(include_file))
+                        if indent:
+                            expanded_file_contents.extend(
+                                indent + a_new_line for a_new_line in new_lines
+                            )
+                        else:
+                            expanded_file_contents.extend(new_lines)
+        finally:
+            self._being_expanded.pop()
+        self.expanded[path] = expanded_file_contents
+        return expanded_file_contents
+
+
+# ------------------------------------------------------------------------------
+def _load(path):
+    values = ConfigObjWithIncludes(path)
+    return values, values.included_files + [
+        GlobDependency(pattern, file_names)
+        for pattern, file_names in values.included_globs
+    ]
 
 
 # ==============================================================================
@@ -115,6 +189,11 @@ class LoadingIniFileFailsException(ValueException):
     pass
 
 
+# ==============================================================================
+class IncludeCycleException(LoadingIniFileFailsException):
+    pass
+
+
 # ==============================================================================
 class ValueSource(object):
 
@@ -142,7 +221,9 @@ class ValueSource(object):
             source = to_str(source)
         if isinstance(source, str) and source.endswith(file_name_extension):
             try:
-                self.values = ConfigObjWithIncludes(source)
+                self.values = parsed_file_cache.get(source, __name__, _load)
+            except IncludeCycleException:
+                raise
             except Exception as x:
                 raise LoadingIniFileFailsException(
                     "ConfigObj cannot load ini: %s" % str(x)
@@ -155,7 +236,7 @@ class ValueSource(object):
         self.identity = source
 
     # --------------------------------------------------------------------------
-    @memoize()
+    @memoize_method()
     def get_values(self, config_manager, ignore_mismatches, obj_hook=DotDict):
         """Return a nested dictionary representing the values in the ini file.
         In the case of this ValueSource implementation, both parameters are
@@ -172,7 +253,7 @@ class ValueSource(object):
                 return obj_hook()  # return empty dict of the obj_hook type
         if isinstance(self.values, obj_hook):
             return self.values
-        return obj_hook(initializer=self.values)
+        return create_with_object_hook(obj_hook, self.values)
 
     # --------------------------------------------------------------------------
     @staticmethod
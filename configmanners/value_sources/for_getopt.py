@@ -15,7 +15,7 @@ represents the argv source."""
 
 
 import getopt
-import collections
+import collections.abc
 
 from configmanners import option
 from configmanners import namespace
@@ -56,6 +56,12 @@ class ValueSource(object):
             raise CantHandleTypeException()
 
         self.identity = "getopt"
+        # the getopt spec made from the option definitions and what it was
+        # made from.  See '_get_getopt_spec'
+        self._getopt_spec = None
+        # the '_changed_keys' list of the configuration manager when the spec
+        # was last asked for, and how many keys it had then
+        self._changed_keys_seen = (None, 0)
 
     # frequently, command line data sources must be treated differently.  For
     # example, even when the overall option for configmanners is to allow
@@ -82,8 +88,14 @@ class ValueSource(object):
         'config_manager'.  Any memoize decorator for this method would requrire
         capturing that internal state in the memoize cache key.
         """
-        short_options_str, long_options_list = self.getopt_create_opts(
-            config_manager.option_definitions
+        (
+            short_options_str,
+            long_options_list,
+            short_form_index,
+            argument_names,
+        ) = self._get_getopt_spec(
+            config_manager.option_definitions,
+            getattr(config_manager, "_changed_keys", None),
         )
         try:
             if ignore_mismatches:
@@ -104,9 +116,7 @@ class ValueSource(object):
             if opt_name.startswith("--"):
                 name = opt_name[2:]
             else:
-                name = self.find_name_with_short_form(
-                    opt_name[1:], config_manager.option_definitions, ""
-                )
+                name = short_form_index.get(opt_name[1:])
                 if not name:
                     raise NotAnOptionError(
                         "%s is not a valid short form option" % opt_name[1:]
@@ -117,12 +127,88 @@ class ValueSource(object):
             else:
                 command_line_values[name] = opt_val
         for name, value in zip(
-            self._get_arguments(config_manager.option_definitions, command_line_values),
+            (x for x in argument_names if x not in command_line_values),
             config_manager.args,
         ):
             command_line_values[name] = value
         return command_line_values
 
+    # --------------------------------------------------------------------------
+    def _get_getopt_spec(self, option_definitions, changed_keys=None):
+        """return a tuple of the short options string, the long options list,
+        a dict of the full names of the Options by their short forms and a
+        list of the names of the Options that are arguments.  They are made
+        again only if the keys of the option definitions, or what decides how
+        an Option appears in them, have changed since the last time.
+
+        During the overlay, 'changed_keys' is the '_changed_keys' list of the
+        configuration manager.  Only the keys added to it since the last time
+        are looked at then."""
+        previous_changed_keys, number_seen = self._changed_keys_seen
+        self._changed_keys_seen = (
+            changed_keys,
+            0 if changed_keys is None else len(changed_keys),
+        )
+        if self._getopt_spec is not None:
+            definitions, signature, entries, spec = self._getopt_spec
+            if definitions is option_definitions:
+                if changed_keys is not None and changed_keys is previous_changed_keys:
+                    if all(
+                        entries.get(key) == self._signature_entry(definitions, key)
+                        for key in changed_keys[number_seen:]
+                    ):
+                        return spec
+                elif signature == self._getopt_signature(option_definitions):
+                    return spec
+        signature = self._getopt_signature(option_definitions)
+        short_options_list = []
+        long_options_list = []
+        short_form_index = {}
+        self.getopt_create_opts_recursive(
+            option_definitions,
+            "",
+            short_options_list,
+            long_options_list,
+            short_form_index,
+        )
+        spec = (
+            "".join(short_options_list),
+            long_options_list,
+            short_form_index,
+            list(self._get_arguments(option_definitions, ())),
+        )
+        self._getopt_spec = (option_definitions, signature, dict(signature), spec)
+        return spec
+
+    # --------------------------------------------------------------------------
+    @classmethod
+    def _getopt_signature(cls, option_definitions):
+        """return a tuple of the keys of the option definitions, each paired
+        with its '_signature_entry'"""
+        return tuple(
+            (key, cls._signature_entry(option_definitions, key))
+            for key in option_definitions.keys_breadth_first()
+        )
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _signature_entry(option_definitions, key):
+        """return what decides how the Option of a key appears in the getopt
+        spec: whether it is a switch without a parameter, its short form and
+        whether it is an argument.  That is () for a key that is not an
+        Option and None for one that is not defined"""
+        try:
+            value = option_definitions[key]
+        except KeyError:
+            return None
+        if isinstance(value, option.Option):
+            return (
+                type(value.default) is bool,
+                value.short_form,
+                value.is_argument,
+            )
+        return ()
+
     # --------------------------------------------------------------------------
     def getopt_create_opts(self, option_definitions):
         short_options_list = []
@@ -135,12 +221,24 @@ class ValueSource(object):
 
     # --------------------------------------------------------------------------
     def getopt_create_opts_recursive(
-        self, source, prefix, short_options_list, long_options_list
+        self,
+        source,
+        prefix,
+        short_options_list,
+        long_options_list,
+        short_form_index=None,
     ):
+        """fill in the lists of short and long options for getopt.  If it is
+        given, the dict 'short_form_index' is filled in with the full name of
+        the first Option found with each short form."""
         for key, val in source.items():
             if isinstance(val, option.Option):
                 boolean_option = type(val.default) == bool
                 if val.short_form:
+                    if short_form_index is not None:
+                        short_form_index.setdefault(
+                            val.short_form, "%s%s" % (prefix, val.name)
+                        )
                     try:
                         if boolean_option:
                             if val.short_form not in short_options_list:
@@ -160,7 +258,11 @@ class ValueSource(object):
             else:  # Namespace case
                 new_prefix = "%s%s." % (prefix, key)
                 self.getopt_create_opts_recursive(
-                    val, new_prefix, short_options_list, long_options_list
+                    val,
+                    new_prefix,
+                    short_options_list,
+                    long_options_list,
+                    short_form_index,
                 )
 
     # --------------------------------------------------------------------------
@@ -4,7 +4,7 @@
 
 
 import json
-import collections
+import collections.abc
 import sys
 
 from configmanners.converters import to_string_converters, to_str
@@ -17,8 +17,9 @@ from configmanners.value_sources.source_exceptions import (
     CantHandleTypeException,
 )
 
-from configmanners.dotdict import DotDict
-from configmanners.memoize import memoize
+from configmanners.dotdict import DotDict, create_with_object_hook
+from configmanners.memoize import memoize_method
+from configmanners.value_sources.file_cache import parsed_file_cache
 
 can_handle = (bytes, str, json)
 
@@ -27,6 +28,12 @@ file_name_extension = "json"
 types_not_needing_string_conversion = (int, float, str, bool)
 
 
+# ------------------------------------------------------------------------------
+def _load(path):
+    with open(path) as fp:
+        return json.load(fp), ()
+
+
 # ==============================================================================
 class LoadingJsonFileFailsException(ValueException):
     pass
@@ -50,8 +57,7 @@ class ValueSource(object):
             source = to_str(source)
         if isinstance(source, str) and source.endswith(file_name_extension):
             try:
-                with open(source) as fp:
-                    self.values = json.load(fp)
+                self.values = parsed_file_cache.get(source, __name__, _load)
             except IOError as x:
                 # The file doesn't exist.  That's ok, we'll give warning
                 # but this isn't a fatal error
@@ -67,11 +73,11 @@ class ValueSource(object):
         self.identity = source
 
     # --------------------------------------------------------------------------
-    @memoize()
+    @memoize_method()
     def get_values(self, config_manager, ignore_mismatches, obj_hook=DotDict):
         if isinstance(self.values, obj_hook):
             return self.values
-        return obj_hook(self.values)
+        return create_with_object_hook(obj_hook, self.values)
 
     # --------------------------------------------------------------------------
     @staticmethod
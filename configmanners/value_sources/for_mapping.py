@@ -2,14 +2,15 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-import collections
+import collections.abc
 import os
 import sys
 
 from configmanners.value_sources.source_exceptions import CantHandleTypeException
 from configmanners.option import Option
-from configmanners.dotdict import DotDict
-from configmanners.memoize import memoize
+from configmanners.dotdict import DotDict, create_with_object_hook
+from configmanners.environment import Environment
+from configmanners.memoize import memoize_method
 from configmanners import namespace
 
 can_handle = (
@@ -41,11 +42,14 @@ class ValueSource(object):
         self.source = source
 
     # --------------------------------------------------------------------------
-    @memoize()
+    @memoize_method()
     def get_values(self, config_manager, ignore_mismatches, obj_hook=DotDict):
         if isinstance(self.source, obj_hook):
             return self.source
-        return obj_hook(initializer=self.source)
+        if isinstance(self.source, Environment):
+            # the variables are looked up as they are needed
+            return self.source.values_for(obj_hook)
+        return create_with_object_hook(obj_hook, self.source)
 
     # --------------------------------------------------------------------------
     @staticmethod